@@ -0,0 +1,199 @@
+"""Initial schema
+
+The tables as app.db.init_db creates them before 0002; databases created that way can run
+``alembic stamp 0001`` and then upgrade.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 08:13:00.141198
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('ingredients',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('fndds_code', sa.String(length=8), nullable=True),
+    sa.Column('ndb_number', sa.String(length=5), nullable=True),
+    sa.Column('nutritional_profile', sa.JSON(), nullable=True),
+    sa.Column('allergen_flags', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('recipes',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('category', sa.String(length=100), nullable=True),
+    sa.Column('season', sa.String(length=50), nullable=True),
+    sa.Column('dietary_flags', sa.JSON(), nullable=True),
+    sa.Column('instructions', sa.JSON(), nullable=True),
+    sa.Column('storage_guidelines', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('suppliers',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('contact', sa.JSON(), nullable=True),
+    sa.Column('api_credentials', sa.JSON(), nullable=True),
+    sa.Column('catalog_format', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('ingestion_jobs',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('supplier_id', sa.String(length=36), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('object_key', sa.String(length=512), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('rows_parsed', sa.Integer(), nullable=False),
+    sa.Column('rows_persisted', sa.Integer(), nullable=False),
+    sa.Column('rows_per_second', sa.Float(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['supplier_id'], ['suppliers.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('orders',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('supplier_id', sa.String(length=36), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('scheduled_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('metadata', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['supplier_id'], ['suppliers.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('products',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('supplier_id', sa.String(length=36), nullable=False),
+    sa.Column('sku', sa.String(length=100), nullable=False),
+    sa.Column('upc', sa.String(length=14), nullable=True),
+    sa.Column('gtin', sa.String(length=14), nullable=True),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('unit', sa.String(length=50), nullable=False),
+    sa.Column('package_size', sa.String(length=50), nullable=True),
+    sa.Column('price', sa.Numeric(precision=12, scale=4), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('last_updated', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['supplier_id'], ['suppliers.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('recipe_costs',
+    sa.Column('recipe_id', sa.String(length=36), nullable=False),
+    sa.Column('total_cost', sa.Numeric(precision=12, scale=4), nullable=False),
+    sa.Column('ingredient_costs', sa.JSON(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['recipe_id'], ['recipes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('recipe_id')
+    )
+    op.create_table('recipe_ingredients',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('recipe_id', sa.String(length=36), nullable=False),
+    sa.Column('ingredient_id', sa.String(length=36), nullable=False),
+    sa.Column('quantity', sa.Numeric(precision=12, scale=4), nullable=False),
+    sa.Column('unit', sa.String(length=25), nullable=False),
+    sa.Column('notes', sa.String(length=255), nullable=True),
+    sa.ForeignKeyConstraint(['ingredient_id'], ['ingredients.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['recipe_id'], ['recipes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('recipe_ingredients', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_recipe_ingredients_ingredient_id'), ['ingredient_id'], unique=False)
+
+    op.create_table('order_items',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('order_id', sa.String(length=36), nullable=False),
+    sa.Column('product_id', sa.String(length=36), nullable=True),
+    sa.Column('quantity', sa.Numeric(precision=12, scale=4), nullable=False),
+    sa.Column('unit', sa.String(length=25), nullable=False),
+    sa.Column('price_each', sa.Numeric(precision=12, scale=4), nullable=True),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('price_history',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('product_id', sa.String(length=36), nullable=False),
+    sa.Column('supplier_id', sa.String(length=36), nullable=True),
+    sa.Column('price', sa.Numeric(precision=12, scale=4), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('recorded_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('is_bulk', sa.String(length=10), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['supplier_id'], ['suppliers.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('price_rollups',
+    sa.Column('product_id', sa.String(length=36), nullable=False),
+    sa.Column('granularity', sa.String(length=10), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('supplier_id', sa.String(length=36), nullable=True),
+    sa.Column('open_price', sa.Numeric(precision=12, scale=4), nullable=False),
+    sa.Column('high_price', sa.Numeric(precision=12, scale=4), nullable=False),
+    sa.Column('low_price', sa.Numeric(precision=12, scale=4), nullable=False),
+    sa.Column('close_price', sa.Numeric(precision=12, scale=4), nullable=False),
+    sa.Column('price_sum', sa.Numeric(precision=18, scale=4), nullable=False),
+    sa.Column('observations', sa.Integer(), nullable=False),
+    sa.Column('first_recorded_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_recorded_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['supplier_id'], ['suppliers.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('product_id', 'granularity', 'bucket_start')
+    )
+    with op.batch_alter_table('price_rollups', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_price_rollups_supplier_id'), ['supplier_id'], unique=False)
+
+    op.create_table('product_ingredient_mappings',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('product_id', sa.String(length=36), nullable=False),
+    sa.Column('ingredient_id', sa.String(length=36), nullable=False),
+    sa.Column('confidence_score', sa.Numeric(precision=5, scale=4), nullable=False),
+    sa.Column('notes', sa.String(length=255), nullable=True),
+    sa.ForeignKeyConstraint(['ingredient_id'], ['ingredients.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('product_ingredient_mappings', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_product_ingredient_mappings_product_id'), ['product_id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('product_ingredient_mappings', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_product_ingredient_mappings_product_id'))
+
+    op.drop_table('product_ingredient_mappings')
+    with op.batch_alter_table('price_rollups', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_price_rollups_supplier_id'))
+
+    op.drop_table('price_rollups')
+    op.drop_table('price_history')
+    op.drop_table('order_items')
+    with op.batch_alter_table('recipe_ingredients', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_recipe_ingredients_ingredient_id'))
+
+    op.drop_table('recipe_ingredients')
+    op.drop_table('recipe_costs')
+    op.drop_table('products')
+    op.drop_table('orders')
+    op.drop_table('ingestion_jobs')
+    op.drop_table('suppliers')
+    op.drop_table('recipes')
+    op.drop_table('ingredients')
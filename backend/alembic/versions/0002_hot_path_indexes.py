@@ -0,0 +1,80 @@
+"""Hot path indexes
+
+Composite indexes for price trend and rollup scans, ingredient-side lookups used by costing,
+parent lookups for eager-loaded recipe lines and order items, and a unique (supplier_id, sku)
+key that catalog ingestion upserts against. Fails early if duplicate SKUs already exist.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 08:13:20.620033
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not context.is_offline_mode():
+        duplicates = op.get_bind().execute(
+            sa.text(
+                "SELECT supplier_id, sku FROM products GROUP BY supplier_id, sku HAVING COUNT(*) > 1 LIMIT 5"
+            )
+        ).all()
+        if duplicates:
+            raise RuntimeError(
+                "Cannot add uq_products_supplier_sku: duplicate SKUs exist, e.g. "
+                + ", ".join(f"{supplier_id}/{sku}" for supplier_id, sku in duplicates)
+            )
+
+    with op.batch_alter_table('order_items', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_order_items_order_id'), ['order_id'], unique=False)
+
+    with op.batch_alter_table('price_history', schema=None) as batch_op:
+        batch_op.create_index('ix_price_history_product_recorded', ['product_id', 'recorded_at'], unique=False)
+        batch_op.create_index('ix_price_history_supplier_recorded', ['supplier_id', 'recorded_at'], unique=False)
+
+    with op.batch_alter_table('price_rollups', schema=None) as batch_op:
+        batch_op.create_index('ix_price_rollups_granularity_bucket', ['granularity', 'bucket_start'], unique=False)
+
+    with op.batch_alter_table('product_ingredient_mappings', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_product_ingredient_mappings_ingredient_id'), ['ingredient_id'], unique=False)
+
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_products_gtin'), ['gtin'], unique=False)
+        batch_op.create_index(batch_op.f('ix_products_upc'), ['upc'], unique=False)
+        batch_op.create_unique_constraint('uq_products_supplier_sku', ['supplier_id', 'sku'])
+
+    with op.batch_alter_table('recipe_ingredients', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_recipe_ingredients_recipe_id'), ['recipe_id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('recipe_ingredients', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_recipe_ingredients_recipe_id'))
+
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_products_supplier_sku', type_='unique')
+        batch_op.drop_index(batch_op.f('ix_products_upc'))
+        batch_op.drop_index(batch_op.f('ix_products_gtin'))
+
+    with op.batch_alter_table('product_ingredient_mappings', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_product_ingredient_mappings_ingredient_id'))
+
+    with op.batch_alter_table('price_rollups', schema=None) as batch_op:
+        batch_op.drop_index('ix_price_rollups_granularity_bucket')
+
+    with op.batch_alter_table('price_history', schema=None) as batch_op:
+        batch_op.drop_index('ix_price_history_supplier_recorded')
+        batch_op.drop_index('ix_price_history_product_recorded')
+
+    with op.batch_alter_table('order_items', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_order_items_order_id'))
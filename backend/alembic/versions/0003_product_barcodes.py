@@ -0,0 +1,85 @@
+"""Product barcodes
+
+A normalized GTIN-14 ``barcode`` column on products, indexed so a scanned UPC/EAN/GTIN resolves
+to every supplier's offering in one lookup. Existing rows are backfilled from upc/gtin.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:02:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BACKFILL_BATCH = 10_000
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('barcode', sa.String(length=14), nullable=True))
+        batch_op.create_index(batch_op.f('ix_products_barcode'), ['barcode'], unique=False)
+
+    if not context.is_offline_mode():
+        _backfill_barcodes()
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_products_barcode'))
+        batch_op.drop_column('barcode')
+
+
+def _backfill_barcodes() -> None:
+    products = sa.table(
+        'products', sa.column('id'), sa.column('upc'), sa.column('gtin'), sa.column('barcode')
+    )
+    bind = op.get_bind()
+    last_id = ''
+    while True:
+        rows = bind.execute(
+            sa.select(products.c.id, products.c.upc, products.c.gtin)
+            .where(products.c.id > last_id)
+            .order_by(products.c.id)
+            .limit(_BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        updates = [
+            {'b_id': row.id, 'barcode': key}
+            for row in rows
+            if (key := barcode_key(row.upc) or barcode_key(row.gtin))
+        ]
+        if updates:
+            bind.execute(
+                products.update()
+                .where(products.c.id == sa.bindparam('b_id'))
+                .values(barcode=sa.bindparam('barcode')),
+                updates,
+            )
+
+
+# Frozen copy of app.utils.identifiers.barcode_key as of this revision, so the backfill keeps
+# producing the same keys however the application helper changes later.
+def barcode_key(identifier: Union[str, None]) -> Union[str, None]:
+    """The GTIN-14 lookup key for a valid UPC-12/GTIN-13/GTIN-14, or None for anything else."""
+    if not identifier:
+        return None
+    value = identifier.strip()
+    if len(value) not in {12, 13, 14} or not value.isdigit():
+        return None
+    total = 0
+    for index, digit in enumerate(reversed(value[:-1]), start=1):
+        total += int(digit) * 3 if index % 2 == 1 else int(digit)
+    if (10 - (total % 10)) % 10 != int(value[-1]):
+        return None
+    return value.zfill(14)
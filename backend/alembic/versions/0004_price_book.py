@@ -0,0 +1,56 @@
+"""Price book
+
+``price_book_entries`` holds every mapped supplier offer per ingredient, ranked the way costing
+picks a product and carrying a per-unit normalized price. The table is created empty: ranking is
+application logic, so fill it from the existing mappings after upgrading with
+``python -m app.services.price_book``.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 13:40:12.502917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('price_book_entries',
+    sa.Column('ingredient_id', sa.String(length=36), nullable=False),
+    sa.Column('product_id', sa.String(length=36), nullable=False),
+    sa.Column('supplier_id', sa.String(length=36), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('price', sa.Numeric(precision=12, scale=4), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('unit', sa.String(length=50), nullable=False),
+    sa.Column('package_size', sa.String(length=50), nullable=True),
+    sa.Column('unit_price', sa.Numeric(precision=14, scale=6), nullable=False),
+    sa.Column('base_unit', sa.String(length=50), nullable=False),
+    sa.Column('confidence_score', sa.Numeric(precision=5, scale=4), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['ingredient_id'], ['ingredients.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['supplier_id'], ['suppliers.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ingredient_id', 'product_id')
+    )
+    with op.batch_alter_table('price_book_entries', schema=None) as batch_op:
+        batch_op.create_index('ix_price_book_entries_ingredient_rank', ['ingredient_id', 'rank'], unique=False)
+        batch_op.create_index(batch_op.f('ix_price_book_entries_product_id'), ['product_id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('price_book_entries', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_price_book_entries_product_id'))
+        batch_op.drop_index('ix_price_book_entries_ingredient_rank')
+
+    op.drop_table('price_book_entries')
+
@@ -0,0 +1,35 @@
+"""Unpriced recipe cost lines
+
+``recipe_costs.unpriced_ingredients`` lists the ingredients a stored cost could not price, either
+unmapped or in a unit no offer converts to. Stored costs predate it and counted those lines as
+free, so they are cleared and recomputed on their next read.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 16:21:37.904118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('DELETE FROM recipe_costs')
+    with op.batch_alter_table('recipe_costs', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column('unpriced_ingredients', sa.JSON(), nullable=False, server_default=sa.text("'[]'"))
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('recipe_costs', schema=None) as batch_op:
+        batch_op.drop_column('unpriced_ingredients')
@@ -1,9 +1,11 @@
-from . import ingredients, orders, products, recipes, suppliers
+from . import ingestion_jobs, ingredients, orders, products, recipes, reports, suppliers
 
 __all__ = [
+    "ingestion_jobs",
     "ingredients",
     "orders",
     "products",
     "recipes",
+    "reports",
     "suppliers",
 ]
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db
+from app.models import IngestionJob
+from app.schemas.ingestion import IngestionJobRead
+
+router = APIRouter(prefix="/ingestion-jobs", tags=["ingestion"])
+
+
+@router.get("/{job_id}", response_model=IngestionJobRead)
+async def get_ingestion_job(job_id: str, db: AsyncSession = Depends(get_db)) -> IngestionJob:
+    result = await db.execute(select(IngestionJob).where(IngestionJob.id == job_id))
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ingestion job not found")
+    return job
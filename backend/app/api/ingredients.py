@@ -2,21 +2,33 @@ from __future__ import annotations
 
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db
+from app.api.pagination import PageParams, page_params, paginate, stream_ndjson, wants_ndjson
+from app.core.cache import invalidate_tables
 from app.models import Ingredient
-from app.schemas.common import IngredientCreate, IngredientRead
+from app.schemas.common import IngredientCreate, IngredientRead, PriceBookOfferRead
+from app.services.ingredient_index import index_ingredient
+from app.services.price_book import PriceBook, PriceBookOffer
 
 router = APIRouter(prefix="/ingredients", tags=["ingredients"])
 
 
 @router.get("/", response_model=list[IngredientRead])
-async def list_ingredients(db: AsyncSession = Depends(get_db)) -> list[Ingredient]:
-    result = await db.execute(select(Ingredient))
-    return result.scalars().all()
+async def list_ingredients(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_db),
+) -> list[Ingredient] | StreamingResponse:
+    stmt = select(Ingredient)
+    if wants_ndjson(request):
+        return stream_ndjson(stmt, Ingredient.id, IngredientRead, page.after)
+    return await paginate(db, stmt, Ingredient.id, page, response)
 
 
 @router.post("/", response_model=IngredientRead, status_code=status.HTTP_201_CREATED)
@@ -32,6 +44,8 @@ async def create_ingredient(payload: IngredientCreate, db: AsyncSession = Depend
     )
     db.add(ingredient)
     await db.commit()
+    await invalidate_tables("ingredients")
+    await index_ingredient(ingredient.id, ingredient.name)
     await db.refresh(ingredient)
     return ingredient
 
@@ -43,3 +57,14 @@ async def get_ingredient(ingredient_id: str, db: AsyncSession = Depends(get_db))
     if not ingredient:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ingredient not found")
     return ingredient
+
+
+@router.get("/{ingredient_id}/offers", response_model=list[PriceBookOfferRead])
+async def list_offers(ingredient_id: str, db: AsyncSession = Depends(get_db)) -> list[PriceBookOffer]:
+    """Every mapped supplier offer for the ingredient, best first."""
+    offers = await PriceBook(db).offers(ingredient_id)
+    if not offers:
+        result = await db.execute(select(Ingredient.id).where(Ingredient.id == ingredient_id))
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ingredient not found")
+    return offers
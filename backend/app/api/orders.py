@@ -1,28 +1,54 @@
 from __future__ import annotations
 
 import uuid
+from typing import Any, Iterable
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.api.deps import get_db
-from app.models import Order, OrderItem, Supplier
-from app.schemas.order import OrderCreate, OrderRead
+from app.api.pagination import PageParams, page_params, paginate, stream_ndjson, wants_ndjson
+from app.db.query_budget import query_budget
+from app.models import Order, OrderItem, Product, Supplier
+from app.schemas.order import (
+    BulkOrderError,
+    BulkOrderRequest,
+    BulkOrderResult,
+    OrderCreate,
+    OrderPlanRead,
+    OrderRead,
+    ProductionPlanRequest,
+)
+from app.services.costing import RecipeNotFoundError
+from app.services.ordering import OrderingService, OrderPlan, ProductionLine
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
+_LOOKUP_CHUNK = 500
 
-@router.get("/", response_model=list[OrderRead])
-async def list_orders(db: AsyncSession = Depends(get_db)) -> list[Order]:
-    result = await db.execute(select(Order))
-    orders = result.scalars().all()
-    for order in orders:
-        await db.refresh(order, attribute_names=["items"])
-    return orders
 
+@router.get("/", response_model=list[OrderRead], dependencies=[Depends(query_budget(2))])
+async def list_orders(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_db),
+) -> list[Order] | StreamingResponse:
+    stmt = select(Order).options(selectinload(Order.items))
+    if wants_ndjson(request):
+        return stream_ndjson(stmt, Order.id, OrderRead, page.after)
+    return await paginate(db, stmt, Order.id, page, response)
 
-@router.post("/", response_model=OrderRead, status_code=status.HTTP_201_CREATED)
+
+@router.post(
+    "/",
+    response_model=OrderRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(query_budget(5))],
+)
 async def create_order(payload: OrderCreate, db: AsyncSession = Depends(get_db)) -> Order:
     if payload.supplier_id:
         await _ensure_supplier_exists(db, payload.supplier_id)
@@ -47,21 +73,145 @@ async def create_order(payload: OrderCreate, db: AsyncSession = Depends(get_db))
             )
         )
     await db.commit()
-    await db.refresh(order)
-    await db.refresh(order, attribute_names=["items"])
-    return order
+    return await _load_order(db, order_id)
+
+
+@router.post("/bulk", response_model=BulkOrderResult, status_code=status.HTTP_201_CREATED)
+async def create_orders_bulk(
+    payload: BulkOrderRequest, db: AsyncSession = Depends(get_db)
+) -> BulkOrderResult:
+    """Create many orders in one transaction.
+
+    Referenced suppliers, products and caller-chosen order ids are checked with one ``IN`` query
+    each, then every valid order and item is written with one bulk insert per table. In
+    ``all_or_nothing`` mode any invalid order fails the request with 422 and nothing is written.
+    """
+    supplier_ids = {order.supplier_id for order in payload.orders if order.supplier_id}
+    product_ids = {
+        item.product_id for order in payload.orders for item in order.items if item.product_id
+    }
+    order_ids = [order.id for order in payload.orders if order.id]
+    known_suppliers = await _existing_ids(db, Supplier.id, supplier_ids)
+    known_products = await _existing_ids(db, Product.id, product_ids)
+    taken_ids = await _existing_ids(db, Order.id, order_ids)
+
+    order_rows, item_rows, created, errors = [], [], [], []
+    for index, order in enumerate(payload.orders):
+        detail = _bulk_order_error(order, known_suppliers, known_products, taken_ids)
+        if detail:
+            errors.append(BulkOrderError(index=index, id=order.id, detail=detail))
+            continue
+        order_id = order.id or str(uuid.uuid4())
+        taken_ids.add(order_id)
+        created.append(order_id)
+        order_rows.append(
+            {
+                "id": order_id,
+                "supplier_id": order.supplier_id,
+                "status": order.status,
+                "scheduled_date": order.scheduled_date,
+                "metadata": order.metadata,
+            }
+        )
+        item_rows.extend(
+            {
+                "id": str(uuid.uuid4()),
+                "order_id": order_id,
+                "product_id": item.product_id,
+                "quantity": item.quantity,
+                "unit": item.unit,
+                "price_each": item.price_each,
+            }
+            for item in order.items
+        )
+    if errors and payload.mode == "all_or_nothing":
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=[error.dict() for error in errors]
+        )
+    if order_rows:
+        await db.execute(insert(Order.__table__), order_rows)
+    if item_rows:
+        await db.execute(insert(OrderItem.__table__), item_rows)
+    await db.commit()
+    return BulkOrderResult(created=created, errors=errors)
+
+
+@router.post("/recommendations", response_model=OrderPlanRead, dependencies=[Depends(query_budget(2))])
+async def recommend_orders(
+    payload: ProductionPlanRequest, db: AsyncSession = Depends(get_db)
+) -> OrderPlanRead:
+    """Preview the supplier orders a production plan needs without writing anything."""
+    plan = await _plan(OrderingService(db), payload)
+    return OrderPlanRead.from_orm(plan)
 
 
-@router.get("/{order_id}", response_model=OrderRead)
+@router.post(
+    "/from-plan",
+    response_model=OrderPlanRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(query_budget(4))],
+)
+async def create_orders_from_plan(
+    payload: ProductionPlanRequest, db: AsyncSession = Depends(get_db)
+) -> OrderPlanRead:
+    """Create draft orders, one per kitchen, date and supplier, for a production plan."""
+    service = OrderingService(db)
+    plan = await _plan(service, payload)
+    await service.create_drafts(plan)
+    return OrderPlanRead.from_orm(plan)
+
+
+@router.get("/{order_id}", response_model=OrderRead, dependencies=[Depends(query_budget(2))])
 async def get_order(order_id: str, db: AsyncSession = Depends(get_db)) -> Order:
-    result = await db.execute(select(Order).where(Order.id == order_id))
-    order = result.scalar_one_or_none()
+    order = await _load_order(db, order_id)
     if not order:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
-    await db.refresh(order, attribute_names=["items"])
     return order
 
 
+async def _load_order(db: AsyncSession, order_id: str) -> Order | None:
+    result = await db.execute(
+        select(Order)
+        .where(Order.id == order_id)
+        .options(selectinload(Order.items))
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
+async def _plan(service: OrderingService, payload: ProductionPlanRequest) -> OrderPlan:
+    production = [
+        ProductionLine(recipe_id=line.recipe_id, portions=line.portions, date=line.date, kitchen=line.kitchen)
+        for line in payload.lines
+    ]
+    try:
+        return await service.plan(production)
+    except RecipeNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+
+
+def _bulk_order_error(
+    order: OrderCreate, suppliers: set[str], products: set[str], taken_ids: set[str]
+) -> str | None:
+    if order.id and order.id in taken_ids:
+        return f"Order {order.id} already exists"
+    if order.supplier_id and order.supplier_id not in suppliers:
+        return "Supplier not found"
+    missing = [item.product_id for item in order.items if item.product_id and item.product_id not in products]
+    if missing:
+        return f"Product not found: {', '.join(dict.fromkeys(missing))}"
+    return None
+
+
+async def _existing_ids(db: AsyncSession, column: Any, ids: Iterable[str]) -> set[str]:
+    ordered = list(dict.fromkeys(ids))
+    found: set[str] = set()
+    for offset in range(0, len(ordered), _LOOKUP_CHUNK):
+        result = await db.execute(select(column).where(column.in_(ordered[offset : offset + _LOOKUP_CHUNK])))
+        found.update(result.scalars())
+    return found
+
+
 async def _ensure_supplier_exists(db: AsyncSession, supplier_id: str) -> None:
     result = await db.execute(select(Supplier).where(Supplier.id == supplier_id))
     if not result.scalar_one_or_none():
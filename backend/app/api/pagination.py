@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Sequence, Type
+
+from fastapi import Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.db.session import async_session_factory
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+STREAM_BATCH_SIZE = 500
+
+
+@dataclass
+class PageParams:
+    limit: int
+    after: str | None
+
+
+def page_params(
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of rows to return"),
+    after: str | None = Query(None, description="Return rows after this id (the previous X-Next-Cursor)"),
+) -> PageParams:
+    return PageParams(limit=limit, after=after)
+
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def paginate(
+    db: AsyncSession, stmt: Select, key: InstrumentedAttribute, page: PageParams, response: Response
+) -> Sequence[Any]:
+    """Return one keyset page ordered by ``key`` and set ``X-Next-Cursor`` if more rows follow."""
+    if page.after is not None:
+        stmt = stmt.where(key > page.after)
+    result = await db.execute(stmt.order_by(key).limit(page.limit + 1))
+    rows = result.scalars().all()
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        response.headers[NEXT_CURSOR_HEADER] = str(getattr(rows[-1], key.key))
+    return rows
+
+
+def stream_ndjson(
+    stmt: Select, key: InstrumentedAttribute, schema: Type[BaseModel], after: str | None = None
+) -> StreamingResponse:
+    """Stream every row after ``after`` as newline-delimited JSON through a server-side cursor.
+
+    The body outlives the request's dependencies, so it opens its own session.
+    """
+    if after is not None:
+        stmt = stmt.where(key > after)
+    stmt = stmt.order_by(key).execution_options(yield_per=STREAM_BATCH_SIZE)
+
+    async def body() -> AsyncIterator[str]:
+        async with async_session_factory() as session:
+            result = await session.stream_scalars(stmt)
+            async for row in result:
+                yield schema.from_orm(row).json(by_alias=True) + "\n"
+
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
@@ -1,28 +1,56 @@
 from __future__ import annotations
 
+import os
 import uuid
-from typing import Sequence
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Sequence
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db
-from app.models import PriceHistory, Product
-from app.schemas.common import ProductCreate, ProductRead
-from app.services.catalog_ingestion import CatalogIngestionService
+from app.api.pagination import PageParams, page_params, paginate, stream_ndjson, wants_ndjson
+from app.core.cache import invalidate_tables
+from app.models import IngestionJob, PriceHistory, Product, Supplier
+from app.schemas.common import BarcodeLookupRequest, BarcodeMatch, ProductCreate, ProductRead
+from app.services.catalog_ingestion import CatalogMode, check_catalog_format
+from app.services.price_book import PriceBook
+from app.services.price_rollups import PriceRollupService
+from app.services.storage import get_catalog_storage
+from app.tasks.catalog import process_catalog
+from app.utils.identifiers import barcode_key, classify_identifiers
 
 router = APIRouter(prefix="/products", tags=["products"])
 
+_BARCODE_CHUNK = 500
+
 
 @router.get("/", response_model=list[ProductRead])
-async def list_products(db: AsyncSession = Depends(get_db)) -> Sequence[Product]:
-    result = await db.execute(select(Product))
-    return result.scalars().all()
+async def list_products(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_db),
+) -> Sequence[Product] | StreamingResponse:
+    stmt = select(Product)
+    if wants_ndjson(request):
+        return stream_ndjson(stmt, Product.id, ProductRead, page.after)
+    return await paginate(db, stmt, Product.id, page, response)
 
 
 @router.post("/", response_model=ProductRead, status_code=status.HTTP_201_CREATED)
 async def create_product(payload: ProductCreate, db: AsyncSession = Depends(get_db)) -> Product:
+    existing = await db.execute(
+        select(Product.id).where(Product.supplier_id == payload.supplier_id, Product.sku == payload.sku)
+    )
+    if existing.scalar_one_or_none() is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="SKU already exists for this supplier"
+        )
     product_id = payload.id or str(uuid.uuid4())
     product = Product(
         id=product_id,
@@ -30,6 +58,7 @@ async def create_product(payload: ProductCreate, db: AsyncSession = Depends(get_
         sku=payload.sku,
         upc=payload.upc,
         gtin=payload.gtin,
+        barcode=barcode_key(payload.upc) or barcode_key(payload.gtin),
         name=payload.name,
         unit=payload.unit,
         package_size=payload.package_size,
@@ -37,16 +66,20 @@ async def create_product(payload: ProductCreate, db: AsyncSession = Depends(get_
         currency=payload.currency,
     )
     db.add(product)
-    db.add(
-        PriceHistory(
-            id=str(uuid.uuid4()),
-            product_id=product_id,
-            supplier_id=payload.supplier_id,
-            price=payload.price,
-            currency=payload.currency,
-        )
-    )
+    price_row = {
+        "id": str(uuid.uuid4()),
+        "product_id": product_id,
+        "supplier_id": payload.supplier_id,
+        "price": payload.price,
+        "currency": payload.currency,
+        "recorded_at": datetime.now(timezone.utc),
+    }
+    db.add(PriceHistory(**price_row))
+    await db.flush()
+    await PriceRollupService(db).record([price_row])
+    await PriceBook(db).refresh_for_products([product_id])
     await db.commit()
+    await invalidate_tables("products", "price_history", "price_rollups", "price_book_entries")
     await db.refresh(product)
     return product
 
@@ -55,16 +88,59 @@ async def create_product(payload: ProductCreate, db: AsyncSession = Depends(get_
 async def upload_catalog(
     supplier_id: str,
     file: UploadFile,
+    mode: CatalogMode = Query(
+        "insert",
+        description=(
+            "insert adds every row as a new product and fails on SKUs the supplier already has; "
+            "snapshot updates existing SKUs and records a price for every row; incremental updates "
+            "existing SKUs and records a price only when it changed"
+        ),
+    ),
     db: AsyncSession = Depends(get_db),
-) -> dict[str, str]:
-    service = CatalogIngestionService(db)
+) -> dict[str, Any]:
+    """Stage a supplier catalog and queue it for ingestion in the given ``mode``."""
+    result = await db.execute(select(Supplier.id).where(Supplier.id == supplier_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Supplier not found")
+    filename = os.path.basename(file.filename or "catalog.csv")
     try:
-        await service.handle_upload(supplier_id=supplier_id, file=file)
-    except NotImplementedError as exc:  # pragma: no cover - placeholder until implemented
-        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(exc)) from exc
+        extension = check_catalog_format(filename)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
-    return {"message": "Catalog queued for processing"}
+    job_id = str(uuid.uuid4())
+    object_key = f"catalogs/{supplier_id}/{job_id}.{extension}"
+    await file.seek(0)
+    await run_in_threadpool(get_catalog_storage().save, object_key, file.file)
+    db.add(IngestionJob(id=job_id, supplier_id=supplier_id, filename=filename, object_key=object_key))
+    await db.commit()
+    await run_in_threadpool(
+        process_catalog.delay, supplier_id, object_key, job_id=job_id, mode=mode
+    )
+    return {"message": "Catalog queued for processing", "job_id": job_id, "status": "queued"}
+
+
+@router.get("/by-barcode/{code}", response_model=list[ProductRead])
+async def get_products_by_barcode(code: str, db: AsyncSession = Depends(get_db)) -> list[Product]:
+    """Every supplier's offering of the scanned item, cheapest first."""
+    key = barcode_key(code)
+    if key is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Not a valid UPC/GTIN barcode")
+    offerings = await _offerings_by_barcode(db, [key])
+    if not offerings:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No products for barcode")
+    return offerings[key]
+
+
+@router.post("/by-barcode", response_model=list[BarcodeMatch])
+async def resolve_barcodes(payload: BarcodeLookupRequest, db: AsyncSession = Depends(get_db)) -> list[dict]:
+    """Resolve a whole delivery manifest; results follow the order of ``codes``."""
+    batch = classify_identifiers(payload.codes)
+    keys = [gtin14 if valid else None for gtin14, valid in zip(batch.gtin14, batch.valid)]
+    offerings = await _offerings_by_barcode(db, sorted({key for key in keys if key}))
+    return [
+        {"code": code, "barcode": key, "products": offerings.get(key, [])}
+        for code, key in zip(payload.codes, keys)
+    ]
 
 
 @router.get("/{product_id}", response_model=ProductRead)
@@ -74,3 +150,16 @@ async def get_product(product_id: str, db: AsyncSession = Depends(get_db)) -> Pr
     if not product:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
     return product
+
+
+async def _offerings_by_barcode(db: AsyncSession, keys: list[str]) -> dict[str, list[Product]]:
+    offerings: dict[str, list[Product]] = defaultdict(list)
+    for offset in range(0, len(keys), _BARCODE_CHUNK):
+        result = await db.execute(
+            select(Product)
+            .where(Product.barcode.in_(keys[offset : offset + _BARCODE_CHUNK]))
+            .order_by(Product.price, Product.id)
+        )
+        for product in result.scalars():
+            offerings[product.barcode].append(product)
+    return offerings
@@ -2,29 +2,53 @@ from __future__ import annotations
 
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.api.deps import get_db
+from app.api.pagination import PageParams, page_params, paginate, stream_ndjson, wants_ndjson
+from app.core.cache import get_cache, invalidate_tables
+from app.db.query_budget import query_budget
 from app.models import Ingredient, Recipe, RecipeIngredient
-from app.schemas.recipe import RecipeCreate, RecipeRead
-from app.services.costing import CostingService
+from app.schemas.recipe import (
+    RecipeCostRead,
+    RecipeCostRequest,
+    RecipeCreate,
+    RecipeNutritionRead,
+    RecipeNutritionRequest,
+    RecipeRead,
+)
+from app.services.costing import CostingService, RecipeNotFoundError
+from app.services.nutrition_rollup import NutritionRollupService, RecipeNutrition
+from app.services.recipe_cost_cache import RecipeCostCache
 
 router = APIRouter(prefix="/recipes", tags=["recipes"])
 
 
-@router.get("/", response_model=list[RecipeRead])
-async def list_recipes(db: AsyncSession = Depends(get_db)) -> list[Recipe]:
-    result = await db.execute(select(Recipe))
-    recipes = result.scalars().all()
-    for recipe in recipes:
-        await db.refresh(recipe, attribute_names=["ingredients"])
-    return recipes
+@router.get("/", response_model=list[RecipeRead], dependencies=[Depends(query_budget(2))])
+async def list_recipes(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_db),
+) -> list[Recipe] | StreamingResponse:
+    stmt = select(Recipe).options(selectinload(Recipe.ingredients))
+    if wants_ndjson(request):
+        return stream_ndjson(stmt, Recipe.id, RecipeRead, page.after)
+    return await paginate(db, stmt, Recipe.id, page, response)
 
 
-@router.post("/", response_model=RecipeRead, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=RecipeRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(query_budget(5))],
+)
 async def create_recipe(payload: RecipeCreate, db: AsyncSession = Depends(get_db)) -> Recipe:
+    await _ensure_ingredients_exist(db, {item.ingredient_id for item in payload.ingredients})
     recipe_id = payload.id or str(uuid.uuid4())
     recipe = Recipe(
         id=recipe_id,
@@ -37,7 +61,6 @@ async def create_recipe(payload: RecipeCreate, db: AsyncSession = Depends(get_db
     )
     db.add(recipe)
     for item in payload.ingredients:
-        await _ensure_ingredient_exists(db, item.ingredient_id)
         db.add(
             RecipeIngredient(
                 id=str(uuid.uuid4()),
@@ -49,29 +72,93 @@ async def create_recipe(payload: RecipeCreate, db: AsyncSession = Depends(get_db
             )
         )
     await db.commit()
-    await db.refresh(recipe)
-    await db.refresh(recipe, attribute_names=["ingredients"])
-    return recipe
+    await invalidate_tables("recipes", "recipe_ingredients")
+    return await _load_recipe(db, recipe_id)
+
+
+@router.post("/costs", response_model=list[RecipeCostRead])
+async def recipe_costs(
+    payload: RecipeCostRequest, db: AsyncSession = Depends(get_db)
+) -> list[RecipeCostRead]:
+    service = CostingService(db, get_cache())
+    try:
+        breakdowns = await service.recipe_costs(payload.recipe_ids)
+    except RecipeNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    return [
+        RecipeCostRead(
+            recipe_id=recipe_id,
+            total_cost=breakdown.total_cost,
+            ingredient_costs=breakdown.ingredient_costs,
+            unpriced_ingredients=breakdown.unpriced_ingredients,
+        )
+        for recipe_id, breakdown in breakdowns.items()
+    ]
 
 
-@router.get("/{recipe_id}", response_model=RecipeRead)
+@router.post(
+    "/nutrition", response_model=list[RecipeNutritionRead], dependencies=[Depends(query_budget(2))]
+)
+async def menu_nutrition(
+    payload: RecipeNutritionRequest, db: AsyncSession = Depends(get_db)
+) -> list[RecipeNutrition]:
+    service = NutritionRollupService(db, get_cache())
+    try:
+        rollups = await service.rollup(payload.recipe_ids)
+    except RecipeNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    return list(rollups.values())
+
+
+@router.get("/{recipe_id}", response_model=RecipeRead, dependencies=[Depends(query_budget(2))])
 async def get_recipe(recipe_id: str, db: AsyncSession = Depends(get_db)) -> Recipe:
-    result = await db.execute(select(Recipe).where(Recipe.id == recipe_id))
-    recipe = result.scalar_one_or_none()
+    recipe = await _load_recipe(db, recipe_id)
     if not recipe:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recipe not found")
-    await db.refresh(recipe, attribute_names=["ingredients"])
     return recipe
 
 
-@router.get("/{recipe_id}/cost")
-async def recipe_cost(recipe_id: str, db: AsyncSession = Depends(get_db)) -> dict[str, float]:
-    service = CostingService(db)
-    breakdown = await service.recipe_cost(recipe_id)
-    return {"total_cost": breakdown.total_cost, "ingredient_costs": breakdown.ingredient_costs}
+@router.get("/{recipe_id}/cost", response_model=RecipeCostRead)
+async def recipe_cost(recipe_id: str, db: AsyncSession = Depends(get_db)) -> RecipeCostRead:
+    cache = RecipeCostCache(db)
+    try:
+        cached = await cache.get(recipe_id)
+    except RecipeNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recipe not found") from exc
+    await db.commit()
+    return RecipeCostRead(
+        recipe_id=recipe_id,
+        total_cost=cached.total_cost,
+        ingredient_costs=cached.ingredient_costs,
+        unpriced_ingredients=cached.unpriced_ingredients,
+        computed_at=cached.computed_at,
+        age_seconds=cached.age_seconds,
+    )
+
+
+@router.get(
+    "/{recipe_id}/nutrition", response_model=RecipeNutritionRead, dependencies=[Depends(query_budget(2))]
+)
+async def recipe_nutrition(recipe_id: str, db: AsyncSession = Depends(get_db)) -> RecipeNutrition:
+    try:
+        return await NutritionRollupService(db, get_cache()).recipe_nutrition(recipe_id)
+    except RecipeNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recipe not found") from exc
+
+
+async def _load_recipe(db: AsyncSession, recipe_id: str) -> Recipe | None:
+    result = await db.execute(
+        select(Recipe)
+        .where(Recipe.id == recipe_id)
+        .options(selectinload(Recipe.ingredients))
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
 
 
-async def _ensure_ingredient_exists(db: AsyncSession, ingredient_id: str) -> None:
-    result = await db.execute(select(Ingredient).where(Ingredient.id == ingredient_id))
-    if not result.scalar_one_or_none():
+async def _ensure_ingredients_exist(db: AsyncSession, ingredient_ids: set[str]) -> None:
+    if not ingredient_ids:
+        return
+    result = await db.execute(select(Ingredient.id).where(Ingredient.id.in_(ingredient_ids)))
+    if len(result.scalars().all()) != len(ingredient_ids):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ingredient not found")
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db
+from app.core.cache import get_cache
+from app.schemas.reporting import PriceTrendRead
+from app.services.reporting import TREND_WINDOWS, PriceTrend, ReportingService
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+
+@router.get("/price-trends", response_model=list[PriceTrendRead])
+async def price_trends(
+    window_days: int = 30,
+    supplier_id: Optional[str] = None,
+    product_id: Optional[List[str]] = Query(default=None),
+    aligned: bool = False,
+    db: AsyncSession = Depends(get_db),
+) -> list[PriceTrend]:
+    if window_days not in TREND_WINDOWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"window_days must be one of {', '.join(map(str, TREND_WINDOWS))}",
+        )
+    service = ReportingService(db, get_cache())
+    return await service.price_trends(
+        supplier_id=supplier_id, window_days=window_days, product_ids=product_id, aligned=aligned
+    )
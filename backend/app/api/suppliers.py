@@ -3,11 +3,14 @@ from __future__ import annotations
 import uuid
 from typing import Sequence
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db
+from app.api.pagination import PageParams, page_params, paginate, stream_ndjson, wants_ndjson
+from app.core.cache import invalidate_tables
 from app.models import Supplier
 from app.schemas.common import SupplierCreate, SupplierRead
 
@@ -15,9 +18,16 @@ router = APIRouter(prefix="/suppliers", tags=["suppliers"])
 
 
 @router.get("/", response_model=list[SupplierRead])
-async def list_suppliers(db: AsyncSession = Depends(get_db)) -> Sequence[Supplier]:
-    result = await db.execute(select(Supplier))
-    return result.scalars().all()
+async def list_suppliers(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_db),
+) -> Sequence[Supplier] | StreamingResponse:
+    stmt = select(Supplier)
+    if wants_ndjson(request):
+        return stream_ndjson(stmt, Supplier.id, SupplierRead, page.after)
+    return await paginate(db, stmt, Supplier.id, page, response)
 
 
 @router.post("/", response_model=SupplierRead, status_code=status.HTTP_201_CREATED)
@@ -32,6 +42,7 @@ async def create_supplier(payload: SupplierCreate, db: AsyncSession = Depends(ge
     )
     db.add(supplier)
     await db.commit()
+    await invalidate_tables("suppliers")
     await db.refresh(supplier)
     return supplier
 
@@ -58,6 +69,7 @@ async def update_supplier(
     supplier.api_credentials = payload.api_credentials
     supplier.catalog_format = payload.catalog_format
     await db.commit()
+    await invalidate_tables("suppliers")
     await db.refresh(supplier)
     return supplier
 
@@ -70,3 +82,7 @@ async def delete_supplier(supplier_id: str, db: AsyncSession = Depends(get_db))
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Supplier not found")
     await db.delete(supplier)
     await db.commit()
+    # Deleting a supplier cascades to its products and everything read from them.
+    await invalidate_tables(
+        "suppliers", "products", "price_history", "price_rollups", "price_book_entries"
+    )
@@ -0,0 +1,386 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import secrets
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Protocol, Sequence, TypeVar
+
+from app.core.config import get_settings
+from app.core.metrics import CACHE_EVENTS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# How often a worker waiting on another worker's computation checks the shared tier.
+_LOCK_POLL_SECONDS = 0.05
+
+
+class SharedBackend(Protocol):
+    """The operations the cache needs from its shared tier; byte values, float TTLs in seconds.
+
+    ``scope`` names the store the values live in; processes reading the same store share it.
+    """
+
+    scope: str
+
+    async def mget(self, keys: Sequence[str]) -> list[bytes | None]: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool: ...
+
+    async def delete(self, key: str) -> None: ...
+
+    async def incr(self, key: str) -> int: ...
+
+    async def close(self) -> None: ...
+
+
+class MemoryBackend:
+    """Process-local stand-in for Redis, used in tests and single-process development."""
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries = max_entries
+        # Values live in this process only, so versions read from another instance must not match.
+        self.scope = secrets.token_hex(4)
+        self._values: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def mget(self, keys: Sequence[str]) -> list[bytes | None]:
+        now = time.monotonic()
+        with self._lock:
+            values = []
+            for key in keys:
+                item = self._values.get(key)
+                if item is not None and item[1] is not None and item[1] <= now:
+                    del self._values[key]
+                    item = None
+                values.append(None if item is None else item[0])
+            return values
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._put(key, value, time.monotonic() + ttl)
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        if (await self.mget([key]))[0] is not None:
+            return False
+        with self._lock:
+            if key in self._values:
+                return False
+            self._put(key, value, time.monotonic() + ttl)
+            return True
+
+    async def delete(self, key: str) -> None:
+        with self._lock:
+            self._values.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        with self._lock:
+            item = self._values.get(key)
+            value = int(item[0]) + 1 if item else 1
+            self._put(key, str(value).encode(), None)
+            return value
+
+    async def close(self) -> None:
+        return None
+
+    def _put(self, key: str, value: bytes, expires_at: float | None) -> None:
+        self._values[key] = (value, expires_at)
+        self._values.move_to_end(key)
+        while len(self._values) > self.max_entries:
+            self._values.popitem(last=False)
+
+
+class RedisBackend:
+    """Shared tier on Redis. Clients are bound to an event loop, so each running loop gets its own.
+
+    Eager Celery tasks run on their own thread and loop; they ``close`` their client when done.
+    """
+
+    scope = "redis"
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _redis(self) -> Any:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None:
+                from redis.asyncio import Redis
+
+                client = self._clients[loop] = Redis.from_url(self.url)
+            return client
+
+    async def mget(self, keys: Sequence[str]) -> list[bytes | None]:
+        return await self._redis().mget(list(keys))
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._redis().set(key, value, px=max(int(ttl * 1000), 1))
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        return bool(await self._redis().set(key, value, px=max(int(ttl * 1000), 1), nx=True))
+
+    async def delete(self, key: str) -> None:
+        await self._redis().delete(key)
+
+    async def incr(self, key: str) -> int:
+        return await self._redis().incr(key)
+
+    async def close(self) -> None:
+        """Close the running loop's client; the next call on this loop opens a new one."""
+        with self._lock:
+            client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+@dataclass
+class _LocalEntry:
+    value: Any
+    size: int
+    expires_at: float
+
+
+class TwoTierCache:
+    """Computed results in an in-process LRU in front of a shared tier (Redis) all workers read.
+
+    Keys embed a version per table the result is read from; ``invalidate`` bumps those versions in
+    the shared tier, so every worker stops reading older entries once its local copy of the
+    versions expires (``version_ttl``). Concurrent misses for one key are computed once: within a
+    process callers await the same future, across processes a short-lived lock in the shared tier
+    makes other workers wait for the result instead of recomputing it. A shared tier that is down
+    degrades to computing every miss locally.
+    """
+
+    def __init__(
+        self,
+        backend: SharedBackend,
+        *,
+        ttl: float,
+        local_ttl: float,
+        local_max_bytes: int,
+        version_ttl: float,
+        lock_ttl: float,
+        prefix: str = "cache",
+    ) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.local_max_bytes = local_max_bytes
+        self.version_ttl = version_ttl
+        self.lock_ttl = lock_ttl
+        self.prefix = prefix
+        self._local: OrderedDict[str, _LocalEntry] = OrderedDict()
+        self._local_bytes = 0
+        self._versions: dict[str, tuple[int, float]] = {}
+        # Eager Celery tasks run on their own thread and event loop, hence the lock and loop-keyed futures.
+        self._lock = threading.Lock()
+        self._inflight: dict[tuple[int, str], asyncio.Future[Any]] = {}
+
+    async def get_or_compute(
+        self,
+        namespace: str,
+        tables: Sequence[str],
+        key: Any,
+        compute: Callable[[], Awaitable[T]],
+        encode: Callable[[T], Any],
+        decode: Callable[[Any], T],
+    ) -> T:
+        """Return the cached result for ``key`` or store what ``compute`` returns.
+
+        ``tables`` are the tables the result is read from; ``encode`` turns the result into
+        JSON-compatible data for the shared tier and ``decode`` reverses it.
+        """
+        versions = await self.versions(tables)
+        digest = hashlib.sha1(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()
+        full_key = f"{self.prefix}:{namespace}:{'.'.join(map(str, versions))}:{digest}"
+
+        value = self._local_get(full_key)
+        if value is not None:
+            CACHE_EVENTS.inc(namespace, "local_hit")
+            return value
+        flight = (id(asyncio.get_running_loop()), full_key)
+        pending = self._inflight.get(flight)
+        if pending is not None:
+            CACHE_EVENTS.inc(namespace, "coalesced")
+            return await asyncio.shield(pending)
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._inflight[flight] = future
+        try:
+            value = await self._load(namespace, full_key, compute, encode, decode)
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Nobody may be waiting; mark the exception retrieved so asyncio does not log it.
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[flight]
+
+    async def invalidate(self, *tables: str) -> None:
+        """Bump ``tables``' versions so results read from them are recomputed."""
+        now = time.monotonic()
+        for table in tables:
+            try:
+                version = await self.backend.incr(f"{self.prefix}:version:{table}")
+            except Exception:
+                logger.warning("Could not bump cache version of %s", table, exc_info=True)
+                CACHE_EVENTS.inc("versions", "error")
+                version = self._versions.get(table, (0, now))[0] + 1
+            with self._lock:
+                self._versions[table] = (version, now)
+
+    async def versions(self, tables: Sequence[str]) -> list[int]:
+        """Current versions of ``tables``, for callers keeping their own data in step with them."""
+        now = time.monotonic()
+        with self._lock:
+            known = {table: self._versions.get(table) for table in tables}
+        stale = [
+            table for table, cached in known.items() if cached is None or now - cached[1] >= self.version_ttl
+        ]
+        if stale:
+            keys = [f"{self.prefix}:version:{table}" for table in stale]
+            values = await self._shared_call("versions", self.backend.mget(keys), None)
+            if values is not None:
+                with self._lock:
+                    for table, value in zip(stale, values):
+                        version = int(value) if value is not None else 0
+                        self._versions[table] = (version, now)
+                        known[table] = (version, now)
+        return [known[table][0] if known[table] else 0 for table in tables]
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
+            self._local_bytes = 0
+            self._versions.clear()
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    async def _load(
+        self,
+        namespace: str,
+        full_key: str,
+        compute: Callable[[], Awaitable[T]],
+        encode: Callable[[T], Any],
+        decode: Callable[[Any], T],
+    ) -> T:
+        payload = await self._shared_get(namespace, full_key)
+        if payload is not None:
+            CACHE_EVENTS.inc(namespace, "shared_hit")
+            value = decode(json.loads(payload))
+            self._local_put(namespace, full_key, value, len(payload))
+            return value
+        CACHE_EVENTS.inc(namespace, "miss")
+
+        lock_key = f"{full_key}:lock"
+        locked = await self._shared_call(namespace, self.backend.add(lock_key, b"1", self.lock_ttl), True)
+        if not locked:
+            # Another worker is computing this key; wait for its result up to the lock's lifetime.
+            deadline = time.monotonic() + self.lock_ttl
+            while time.monotonic() < deadline:
+                await asyncio.sleep(_LOCK_POLL_SECONDS)
+                payload = await self._shared_get(namespace, full_key)
+                if payload is not None:
+                    CACHE_EVENTS.inc(namespace, "coalesced")
+                    value = decode(json.loads(payload))
+                    self._local_put(namespace, full_key, value, len(payload))
+                    return value
+        try:
+            value = await compute()
+            payload = json.dumps(encode(value)).encode()
+            await self._shared_call(namespace, self.backend.set(full_key, payload, self.ttl), None)
+            self._local_put(namespace, full_key, value, len(payload))
+            return value
+        finally:
+            if locked:
+                await self._shared_call(namespace, self.backend.delete(lock_key), None)
+
+    async def _shared_get(self, namespace: str, key: str) -> bytes | None:
+        values = await self._shared_call(namespace, self.backend.mget([key]), None)
+        return values[0] if values else None
+
+    async def _shared_call(self, namespace: str, call: Awaitable[Any], fallback: Any) -> Any:
+        try:
+            return await call
+        except Exception:
+            logger.warning("Shared cache unavailable", exc_info=True)
+            CACHE_EVENTS.inc(namespace, "error")
+            return fallback
+
+    def _local_get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._drop(key)
+                return None
+            self._local.move_to_end(key)
+            return entry.value
+
+    def _local_put(self, namespace: str, key: str, value: Any, size: int) -> None:
+        if size > self.local_max_bytes:
+            return
+        with self._lock:
+            if key in self._local:
+                self._drop(key)
+            self._local[key] = _LocalEntry(value, size, time.monotonic() + self.local_ttl)
+            self._local_bytes += size
+            while self._local_bytes > self.local_max_bytes:
+                self._drop(next(iter(self._local)))
+                CACHE_EVENTS.inc(namespace, "eviction")
+
+    def _drop(self, key: str) -> None:
+        self._local_bytes -= self._local.pop(key).size
+
+
+_cache: TwoTierCache | None = None
+
+
+def get_cache() -> TwoTierCache:
+    """The process-wide cache, built from settings on first use."""
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        if settings.cache_backend == "redis":
+            backend: SharedBackend = RedisBackend(settings.cache_redis_url or settings.celery_broker_url)
+        elif settings.cache_backend == "memory":
+            backend = MemoryBackend()
+        else:
+            raise ValueError(f"Unknown cache backend: {settings.cache_backend}")
+        _cache = TwoTierCache(
+            backend,
+            ttl=settings.cache_ttl_seconds,
+            local_ttl=settings.cache_local_ttl_seconds,
+            local_max_bytes=settings.cache_local_max_bytes,
+            version_ttl=settings.cache_version_ttl_seconds,
+            lock_ttl=settings.cache_lock_ttl_seconds,
+        )
+    return _cache
+
+
+def set_cache(cache: TwoTierCache | None) -> None:
+    """Replace the process-wide cache, e.g. with one on a ``MemoryBackend`` in tests."""
+    global _cache
+    _cache = cache
+
+
+async def invalidate_tables(*tables: str) -> None:
+    """Tell every cache that ``tables`` changed; call after the write has committed."""
+    await get_cache().invalidate(*tables)
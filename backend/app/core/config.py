@@ -5,11 +5,38 @@ from pydantic import BaseSettings, AnyUrl
 class Settings(BaseSettings):
     app_name: str = "Food Thing"
     database_url: str = "sqlite+aiosqlite:///./app.db"
+    # Engine tuning profile from app.db.profiles; inferred from database_url when unset.
+    database_profile: str | None = None
+    db_pool_size: int | None = None
+    db_max_overflow: int | None = None
+    db_pool_recycle: int | None = None
     celery_broker_url: str = "redis://localhost:6379/0"
     celery_result_backend: str = "redis://localhost:6379/1"
+    celery_task_always_eager: bool = False
     s3_endpoint_url: AnyUrl | None = None
     s3_bucket_name: str | None = None
+    local_storage_path: str = "./storage"
     usda_api_key: str | None = None
+    catalog_batch_size: int = 5000
+    catalog_read_chunk_size: int = 1024 * 1024
+    # Staged CSV/TSV files at least this large are parsed in a process pool (workers default to CPUs).
+    catalog_parse_workers: int | None = None
+    catalog_parallel_min_bytes: int = 16 * 1024 * 1024
+    enforce_query_budgets: bool = False
+    # ETag/body cache for the product, ingredient and supplier GET routes. ETags come from the shared
+    # cache's table versions, so writes by other processes show up within cache_version_ttl_seconds.
+    response_cache_enabled: bool = True
+    response_cache_max_entries: int = 1024
+    # Two-tier cache for computed recipe costs and price trends: "memory" keeps the shared tier in
+    # process (dev, tests); "redis" shares it across workers via cache_redis_url or the broker URL.
+    cache_backend: str = "memory"
+    cache_redis_url: str | None = None
+    cache_ttl_seconds: float = 300.0
+    cache_local_ttl_seconds: float = 60.0
+    cache_local_max_bytes: int = 64 * 1024 * 1024
+    # Other workers' invalidations are seen within this many seconds.
+    cache_version_ttl_seconds: float = 1.0
+    cache_lock_ttl_seconds: float = 10.0
 
     class Config:
         env_file = ".env"
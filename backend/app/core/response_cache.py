@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import get_cache
+from app.core.config import get_settings
+
+# Collection prefixes whose list (``/products/``) and detail (``/products/{id}``) routes are cached,
+# with the tables their responses are built from. Deeper paths such as ``/ingredients/{id}/offers``
+# read other tables and are never cached.
+CACHED_COLLECTIONS: dict[str, tuple[str, ...]] = {
+    "/products": ("products",),
+    "/ingredients": ("ingredients",),
+    "/suppliers": ("suppliers",),
+}
+_REPLAYED_HEADERS = (b"content-type", b"x-next-cursor")
+
+
+@dataclass
+class CachedResponse:
+    etag: str
+    body: bytes
+    headers: list[tuple[bytes, bytes]]
+
+
+class ResponseCache:
+    """An LRU of serialized response bodies keyed by URL, each stored with the ETag it was sent with.
+
+    ETags are built from the shared cache's table versions (``get_cache().versions``), which every
+    worker sees bumped by ``invalidate_tables``; an entry whose ETag no longer matches is stale.
+    """
+
+    def __init__(self, max_entries: int, enabled: bool = True) -> None:
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        # Eager Celery tasks ingest on a worker thread, so the cache can be used from outside the loop.
+        self._lock = threading.Lock()
+
+    async def etag(self, tables: tuple[str, ...]) -> str:
+        cache = get_cache()
+        versions = await cache.versions(tables)
+        return f'"{cache.backend.scope}-{".".join(map(str, versions))}"'
+
+    def get(self, key: str, etag: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.etag != etag:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_response_cache: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache:
+    """The process-wide response cache, built from settings on first use (not at import)."""
+    global _response_cache
+    if _response_cache is None:
+        settings = get_settings()
+        _response_cache = ResponseCache(
+            settings.response_cache_max_entries, enabled=settings.response_cache_enabled
+        )
+    return _response_cache
+
+
+def cached_tables(path: str) -> tuple[str, ...] | None:
+    # "/products/" splits into ["", "products", ""] and "/products/{id}" into ["", "products", id].
+    parts = path.split("/")
+    if len(parts) != 3:
+        return None
+    return CACHED_COLLECTIONS.get("/" + parts[1])
+
+
+def matches(if_none_match: str, etag: str, cached: bool) -> bool:
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    if any(value.removeprefix("W/") == etag for value in candidates):
+        return True
+    # "*" matches any current representation; one is only known to exist once its 200 is cached.
+    return cached and "*" in candidates
+
+
+class ResponseCacheMiddleware:
+    """Answers conditional and repeated GETs on ``CACHED_COLLECTIONS`` without running the route.
+
+    ``If-None-Match`` with the current ETag (or ``*`` once the URL's 200 is cached) gets a bodiless
+    304; otherwise a cached body for the same URL and versions is replayed, and a miss runs the
+    route and stores its 200 JSON body. NDJSON streams are passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, cache: ResponseCache | None = None) -> None:
+        self.app = app
+        self.cache = cache or get_response_cache()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        tables = None
+        if scope["type"] == "http" and scope["method"] == "GET" and self.cache.enabled:
+            tables = cached_tables(scope["path"])
+        headers = dict(scope["headers"]) if tables else {}
+        if not tables or b"ndjson" in headers.get(b"accept", b""):
+            await self.app(scope, receive, send)
+            return
+
+        etag = await self.cache.etag(tables)
+        validators = [(b"etag", etag.encode("latin-1")), (b"cache-control", b"no-cache")]
+        key = scope["path"] + "?" + scope.get("query_string", b"").decode("latin-1")
+        entry = self.cache.get(key, etag)
+        if_none_match = headers.get(b"if-none-match")
+        if if_none_match is not None and matches(if_none_match.decode("latin-1"), etag, entry is not None):
+            await send({"type": "http.response.start", "status": 304, "headers": validators})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        if entry is not None:
+            length = [(b"content-length", str(len(entry.body)).encode("latin-1"))]
+            await send({"type": "http.response.start", "status": 200, "headers": entry.headers + length})
+            await send({"type": "http.response.body", "body": entry.body})
+            return
+
+        status = 0
+        response_headers: list[tuple[bytes, bytes]] = []
+        chunks: list[bytes] = []
+
+        async def send_and_capture(message: Message) -> None:
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if status == 200:
+                    response_headers = list(message.get("headers", ()))
+                    message["headers"] = [*response_headers, *validators]
+            elif message["type"] == "http.response.body" and status == 200:
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, receive, send_and_capture)
+        content_type = dict(response_headers).get(b"content-type", b"")
+        if status == 200 and content_type.startswith(b"application/json"):
+            replayed = [(name, value) for name, value in response_headers if name in _REPLAYED_HEADERS]
+            self.cache.put(key, CachedResponse(etag, b"".join(chunks), replayed + validators))
@@ -11,5 +11,10 @@ async def init_models() -> None:
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def _init_from_cli() -> None:
+    await init_models()
+    await engine.dispose()
+
+
 if __name__ == "__main__":
-    asyncio.run(init_models())
+    asyncio.run(_init_from_cli())
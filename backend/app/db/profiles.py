@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from app.core.config import Settings
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    """Connection pool and driver tuning applied when the async engine is created."""
+
+    pool_size: int | None = None
+    max_overflow: int | None = None
+    pool_timeout: float | None = None
+    pool_recycle: int | None = None
+    pool_pre_ping: bool = False
+    # For servers fronted by an external pooler such as PgBouncer.
+    null_pool: bool = False
+    # Executed on every new SQLite connection, e.g. ("journal_mode", "WAL").
+    sqlite_pragmas: tuple[tuple[str, str], ...] = ()
+    # psycopg prepares a statement server-side after this many executions; None disables it.
+    prepare_threshold: int | None = 5
+    connect_args: dict[str, Any] = field(default_factory=dict)
+
+
+ENGINE_PROFILES: dict[str, EngineProfile] = {
+    # SQLAlchemy and driver defaults, kept for comparison benchmarks.
+    "default": EngineProfile(),
+    "dev-sqlite": EngineProfile(
+        pool_size=5,
+        max_overflow=10,
+        pool_timeout=30,
+        sqlite_pragmas=(
+            # WAL lets readers proceed while one writer commits; NORMAL sync is durable in WAL mode
+            # except on power loss. Writers wait up to busy_timeout instead of "database is locked".
+            ("journal_mode", "WAL"),
+            ("synchronous", "NORMAL"),
+            ("busy_timeout", "5000"),
+            ("cache_size", "-65536"),
+            ("temp_store", "MEMORY"),
+        ),
+    ),
+    "prod-postgres": EngineProfile(
+        pool_size=10,
+        max_overflow=20,
+        pool_timeout=30,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+    ),
+    # PgBouncer in transaction mode pools connections itself and cannot keep prepared statements.
+    "pgbouncer": EngineProfile(null_pool=True, prepare_threshold=None),
+}
+
+
+def resolve_profile(settings: Settings) -> EngineProfile:
+    """Return the configured profile (inferred from the URL if unset) with any pool overrides."""
+    name = settings.database_profile
+    if name is None:
+        backend = make_url(settings.database_url).get_backend_name()
+        name = {"sqlite": "dev-sqlite", "postgresql": "prod-postgres"}.get(backend, "default")
+    try:
+        profile = ENGINE_PROFILES[name]
+    except KeyError as exc:
+        raise ValueError(
+            f"Unknown database profile '{name}'; expected one of {', '.join(ENGINE_PROFILES)}"
+        ) from exc
+    overrides = {
+        key: value
+        for key, value in (
+            ("pool_size", settings.db_pool_size),
+            ("max_overflow", settings.db_max_overflow),
+            ("pool_recycle", settings.db_pool_recycle),
+        )
+        if value is not None
+    }
+    return replace(profile, **overrides)
+
+
+def engine_options(database_url: str, profile: EngineProfile) -> dict[str, Any]:
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    options: dict[str, Any] = {}
+    connect_args = dict(profile.connect_args)
+    if backend == "postgresql" and url.get_driver_name() == "psycopg":
+        connect_args["prepare_threshold"] = profile.prepare_threshold
+    if connect_args:
+        options["connect_args"] = connect_args
+    if profile.null_pool:
+        options["poolclass"] = NullPool
+        return options
+    if backend == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory databases live on a single shared connection; pool sizing does not apply.
+        return options
+    for key in ("pool_size", "max_overflow", "pool_timeout", "pool_recycle"):
+        value = getattr(profile, key)
+        if value is not None:
+            options[key] = value
+    if "pool_size" in options:
+        # aiosqlite would otherwise default to NullPool and reconnect for every checkout.
+        options["poolclass"] = AsyncAdaptedQueuePool
+    if profile.pool_pre_ping:
+        options["pool_pre_ping"] = True
+    return options
+
+
+def create_engine_for(settings: Settings, **kwargs: Any) -> AsyncEngine:
+    """Create the async engine for ``settings`` with its profile applied; ``kwargs`` win."""
+    profile = resolve_profile(settings)
+    options = {**engine_options(settings.database_url, profile), **kwargs}
+    if options.get("poolclass") is NullPool:
+        for key in ("pool_size", "max_overflow", "pool_timeout"):
+            options.pop(key, None)
+    engine = create_async_engine(settings.database_url, future=True, echo=False, **options)
+    if profile.sqlite_pragmas and engine.dialect.name == "sqlite":
+        _install_sqlite_pragmas(engine, profile.sqlite_pragmas)
+    return engine
+
+
+def _install_sqlite_pragmas(engine: AsyncEngine, pragmas: tuple[tuple[str, str], ...]) -> None:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):  # noqa: ANN001
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
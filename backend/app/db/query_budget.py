@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+@dataclass
+class StatementCounter:
+    statements: int = 0
+
+
+_counter: ContextVar[StatementCounter | None] = ContextVar("statement_counter", default=None)
+
+
+def count_statements(engine: AsyncEngine) -> None:
+    """Count ``engine``'s statements against the budget of the request executing them."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _count_statement)
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+    counter = _counter.get()
+    if counter is not None:
+        counter.statements += 1
+
+
+def query_budget(max_statements: int) -> Callable[[Request], AsyncIterator[StatementCounter]]:
+    """Route dependency declaring the most SQL statements a request may execute.
+
+    Statements are counted while the request runs, including lazy loads triggered by response
+    serialisation. Going over budget is logged, or raised when ``enforce_query_budgets`` is set
+    so N+1 regressions fail loudly in development and CI.
+    """
+
+    async def dependency(request: Request) -> AsyncIterator[StatementCounter]:
+        counter = StatementCounter()
+        token = _counter.set(counter)
+        try:
+            yield counter
+        finally:
+            _counter.reset(token)
+        if counter.statements > max_statements:
+            message = (
+                f"{request.method} {request.url.path} ran {counter.statements} SQL statements "
+                f"(budget {max_statements})"
+            )
+            if get_settings().enforce_query_budgets:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+    return dependency
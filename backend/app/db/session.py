@@ -1,10 +1,44 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import get_settings
+from app.core.metrics import current_request_stats
+from app.db.profiles import create_engine_for
+from app.db.query_budget import count_statements
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attach per-request statement timing and query-budget counting to ``engine``."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _start_statement_timer)
+    event.listen(engine.sync_engine, "after_cursor_execute", _record_statement)
+    event.listen(engine.sync_engine, "handle_error", _clear_statement_timer)
+    count_statements(engine)
+
+
+def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):  # noqa: ANN001
+    if current_request_stats() is not None:
+        conn.info["statement_started"] = time.perf_counter()
+
+
+def _record_statement(conn, cursor, statement, parameters, context, executemany):  # noqa: ANN001
+    started = conn.info.pop("statement_started", None)
+    stats = current_request_stats()
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started, cursor.rowcount)
+
+
+def _clear_statement_timer(exception_context):  # noqa: ANN001
+    # A failed statement never reaches after_cursor_execute; don't leave its start on the connection.
+    if exception_context.connection is not None:
+        exception_context.connection.info.pop("statement_started", None)
+
 
 settings = get_settings()
-engine = create_async_engine(settings.database_url, future=True, echo=False)
+engine = create_engine_for(settings)
+instrument_engine(engine)
 async_session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
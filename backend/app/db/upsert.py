@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from sqlalchemy import Insert, Table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def dialect_insert(db: AsyncSession, table: Table) -> Insert:
+    """``INSERT`` into ``table`` for ``db``'s dialect, so it supports ``on_conflict_do_update``.
+
+    Concurrent writers of one key should upsert rather than delete and re-insert, which fails on
+    the primary key when two transactions insert the same row.
+    """
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(table)
@@ -1,20 +1,48 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
-from app.api import ingredients, orders, products, recipes, suppliers
+from app.api import identifiers, ingestion_jobs, ingredients, orders, products, recipes, reports, suppliers
+from app.core.cache import get_cache
 from app.core.config import get_settings
+from app.core.metrics import PROMETHEUS_CONTENT_TYPE, RequestMetricsMiddleware, render_metrics
+from app.core.response_cache import ResponseCacheMiddleware
+from app.db.session import engine
 
 settings = get_settings()
 
-app = FastAPI(title=settings.app_name)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    # Close pooled connections; aiosqlite connection threads would otherwise keep the process alive.
+    await engine.dispose()
+    await get_cache().close()
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
+# Added first so it runs inside the metrics middleware and cache hits are still timed.
+app.add_middleware(ResponseCacheMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
 app.include_router(suppliers.router)
 app.include_router(products.router)
 app.include_router(ingredients.router)
 app.include_router(recipes.router)
 app.include_router(orders.router)
+app.include_router(ingestion_jobs.router)
+app.include_router(reports.router)
+app.include_router(identifiers.router)
 
 
 @app.get("/healthz")
 def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -4,9 +4,13 @@ from .ingredient import Ingredient
 from .product_ingredient_mapping import ProductIngredientMapping
 from .recipe import Recipe
 from .recipe_ingredient import RecipeIngredient
+from .recipe_cost import RecipeCost
 from .price_history import PriceHistory
+from .price_rollup import PriceRollup
+from .price_book import PriceBookEntry
 from .order import Order
 from .order_item import OrderItem
+from .ingestion_job import IngestionJob
 
 __all__ = [
     "Supplier",
@@ -15,7 +19,11 @@ __all__ = [
     "ProductIngredientMapping",
     "Recipe",
     "RecipeIngredient",
+    "RecipeCost",
     "PriceHistory",
+    "PriceRollup",
+    "PriceBookEntry",
     "Order",
     "OrderItem",
+    "IngestionJob",
 ]
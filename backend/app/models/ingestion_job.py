@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text, func
+
+from app.db.base import Base
+
+
+class IngestionJob(Base):
+    __tablename__ = "ingestion_jobs"
+
+    id = Column(String(36), primary_key=True)
+    supplier_id = Column(String(36), ForeignKey("suppliers.id", ondelete="CASCADE"), nullable=False)
+    filename = Column(String(255), nullable=False)
+    object_key = Column(String(512), nullable=False)
+    status = Column(String(20), nullable=False, default="queued")
+    rows_parsed = Column(Integer, nullable=False, default=0)
+    rows_persisted = Column(Integer, nullable=False, default=0)
+    rows_per_second = Column(Float, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
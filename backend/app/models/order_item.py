@@ -10,7 +10,7 @@ class OrderItem(Base):
     __tablename__ = "order_items"
 
     id = Column(String(36), primary_key=True)
-    order_id = Column(String(36), ForeignKey("orders.id", ondelete="CASCADE"), nullable=False)
+    order_id = Column(String(36), ForeignKey("orders.id", ondelete="CASCADE"), nullable=False, index=True)
     product_id = Column(String(36), ForeignKey("products.id", ondelete="SET NULL"), nullable=True)
     quantity = Column(Numeric(12, 4), nullable=False)
     unit = Column(String(25), nullable=False)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Numeric, String
+
+from app.db.base import Base
+
+
+class PriceBookEntry(Base):
+    """One supplier offer for an ingredient, ranked among offers with the same ``base_unit``.
+
+    Rank 1 is the offer costing uses for recipe quantities in that base unit.
+    """
+
+    __tablename__ = "price_book_entries"
+    __table_args__ = (Index("ix_price_book_entries_ingredient_rank", "ingredient_id", "rank"),)
+
+    ingredient_id = Column(String(36), ForeignKey("ingredients.id", ondelete="CASCADE"), primary_key=True)
+    product_id = Column(
+        String(36), ForeignKey("products.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+    supplier_id = Column(String(36), ForeignKey("suppliers.id", ondelete="CASCADE"), nullable=False)
+    rank = Column(Integer, nullable=False)
+    price = Column(Numeric(12, 4), nullable=False)
+    currency = Column(String(3), nullable=False)
+    unit = Column(String(50), nullable=False)
+    package_size = Column(String(50), nullable=True)
+    # Price per base unit (lb, gal or ea) so offers sold in different units can be compared.
+    unit_price = Column(Numeric(14, 6), nullable=False)
+    base_unit = Column(String(50), nullable=False)
+    confidence_score = Column(Numeric(5, 4), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, DateTime, ForeignKey, Numeric, String, func
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Numeric, String, func
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -8,6 +8,10 @@ from app.db.base import Base
 
 class PriceHistory(Base):
     __tablename__ = "price_history"
+    __table_args__ = (
+        Index("ix_price_history_product_recorded", "product_id", "recorded_at"),
+        Index("ix_price_history_supplier_recorded", "supplier_id", "recorded_at"),
+    )
 
     id = Column(String(36), primary_key=True)
     product_id = Column(String(36), ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Numeric, String
+
+from app.db.base import Base
+
+
+class PriceRollup(Base):
+    __tablename__ = "price_rollups"
+    __table_args__ = (Index("ix_price_rollups_granularity_bucket", "granularity", "bucket_start"),)
+
+    product_id = Column(String(36), ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    granularity = Column(String(10), primary_key=True)
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    supplier_id = Column(
+        String(36), ForeignKey("suppliers.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    open_price = Column(Numeric(12, 4), nullable=False)
+    high_price = Column(Numeric(12, 4), nullable=False)
+    low_price = Column(Numeric(12, 4), nullable=False)
+    close_price = Column(Numeric(12, 4), nullable=False)
+    price_sum = Column(Numeric(18, 4), nullable=False)
+    observations = Column(Integer, nullable=False)
+    first_recorded_at = Column(DateTime(timezone=True), nullable=False)
+    last_recorded_at = Column(DateTime(timezone=True), nullable=False)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, DateTime, ForeignKey, Numeric, String, func
+from sqlalchemy import Column, DateTime, ForeignKey, Numeric, String, UniqueConstraint, func
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -8,12 +8,15 @@ from app.db.base import Base
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (UniqueConstraint("supplier_id", "sku", name="uq_products_supplier_sku"),)
 
     id = Column(String(36), primary_key=True)
     supplier_id = Column(String(36), ForeignKey("suppliers.id", ondelete="CASCADE"), nullable=False)
     sku = Column(String(100), nullable=False)
-    upc = Column(String(14), nullable=True)
-    gtin = Column(String(14), nullable=True)
+    upc = Column(String(14), nullable=True, index=True)
+    gtin = Column(String(14), nullable=True, index=True)
+    # GTIN-14 form of whichever of upc/gtin is valid, shared by every supplier's offering of an item.
+    barcode = Column(String(14), nullable=True, index=True)
     name = Column(String(255), nullable=False)
     unit = Column(String(50), nullable=False)
     package_size = Column(String(50), nullable=True)
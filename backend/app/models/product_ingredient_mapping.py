@@ -10,8 +10,10 @@ class ProductIngredientMapping(Base):
     __tablename__ = "product_ingredient_mappings"
 
     id = Column(String(36), primary_key=True)
-    product_id = Column(String(36), ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
-    ingredient_id = Column(String(36), ForeignKey("ingredients.id", ondelete="CASCADE"), nullable=False)
+    product_id = Column(String(36), ForeignKey("products.id", ondelete="CASCADE"), nullable=False, index=True)
+    ingredient_id = Column(
+        String(36), ForeignKey("ingredients.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     confidence_score = Column(Numeric(5, 4), nullable=False)
     notes = Column(String(255), nullable=True)
 
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, ForeignKey, JSON, Numeric, String
+
+from app.db.base import Base
+
+
+class RecipeCost(Base):
+    __tablename__ = "recipe_costs"
+
+    recipe_id = Column(String(36), ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True)
+    total_cost = Column(Numeric(12, 4), nullable=False)
+    ingredient_costs = Column(JSON, nullable=False)
+    unpriced_ingredients = Column(JSON, nullable=False, default=list)
+    computed_at = Column(DateTime(timezone=True), nullable=False)
@@ -10,8 +10,10 @@ class RecipeIngredient(Base):
     __tablename__ = "recipe_ingredients"
 
     id = Column(String(36), primary_key=True)
-    recipe_id = Column(String(36), ForeignKey("recipes.id", ondelete="CASCADE"), nullable=False)
-    ingredient_id = Column(String(36), ForeignKey("ingredients.id", ondelete="CASCADE"), nullable=False)
+    recipe_id = Column(String(36), ForeignKey("recipes.id", ondelete="CASCADE"), nullable=False, index=True)
+    ingredient_id = Column(
+        String(36), ForeignKey("ingredients.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     quantity = Column(Numeric(12, 4), nullable=False)
     unit = Column(String(25), nullable=False)
     notes = Column(String(255), nullable=True)
@@ -44,12 +44,23 @@ class ProductCreate(ProductBase):
 
 class ProductRead(ProductBase):
     id: str
+    barcode: str | None = None
     last_updated: datetime
 
     class Config:
         orm_mode = True
 
 
+class BarcodeLookupRequest(BaseModel):
+    codes: list[str] = Field(..., max_items=1000, description="Scanned UPC/EAN/GTIN codes, e.g. a manifest")
+
+
+class BarcodeMatch(BaseModel):
+    code: str
+    barcode: str | None = Field(default=None, description="GTIN-14 key, or null if the code is not valid")
+    products: list[ProductRead]
+
+
 class IngredientBase(BaseModel):
     name: str
     fndds_code: str | None = None
@@ -68,3 +79,20 @@ class IngredientRead(IngredientBase):
 
     class Config:
         orm_mode = True
+
+
+class PriceBookOfferRead(BaseModel):
+    product_id: str
+    supplier_id: str
+    rank: int
+    price: float
+    currency: str
+    unit: str
+    package_size: str | None = None
+    unit_price: float = Field(..., description="Price per base_unit, comparable across suppliers")
+    base_unit: str = Field(..., description="lb, gal or ea when the product unit converts")
+    confidence_score: float
+    updated_at: datetime
+
+    class Config:
+        orm_mode = True
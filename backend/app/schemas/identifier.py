@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+MAX_IDENTIFIERS_PER_REQUEST = 100_000
+
+
+class IdentifierValidationRequest(BaseModel):
+    identifiers: list[str] = Field(..., max_items=MAX_IDENTIFIERS_PER_REQUEST)
+
+
+class IdentifierValidationResult(BaseModel):
+    identifier: str
+    type: str
+    valid: bool
+    check_digit: Optional[int] = Field(
+        default=None, description="Expected check digit for identifiers with 12-14 digits"
+    )
+    gtin14: Optional[str] = Field(default=None, description="Digits zero-padded to GTIN-14")
+
+
+class IdentifierValidationResponse(BaseModel):
+    results: list[IdentifierValidationResult]
+    valid: int
+    invalid: int
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class IngestionJobRead(BaseModel):
+    id: str
+    supplier_id: str
+    filename: str
+    status: str
+    rows_parsed: int
+    rows_persisted: int
+    rows_per_second: Optional[float] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, List, Optional
+from datetime import date, datetime
+from typing import Any, List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class OrderItemInput(BaseModel):
@@ -12,6 +12,9 @@ class OrderItemInput(BaseModel):
     unit: str
     price_each: Optional[float] = None
 
+    class Config:
+        orm_mode = True
+
 
 class OrderBase(BaseModel):
     supplier_id: Optional[str] = None
@@ -33,3 +36,86 @@ class OrderRead(OrderBase):
     class Config:
         orm_mode = True
         fields = {"metadata": "order_metadata"}
+
+
+MAX_BULK_ORDERS = 5_000
+
+
+class BulkOrderRequest(BaseModel):
+    orders: List[OrderCreate] = Field(..., min_items=1, max_items=MAX_BULK_ORDERS)
+    mode: Literal["all_or_nothing", "per_order"] = Field(
+        default="all_or_nothing",
+        description="all_or_nothing writes nothing if any order is invalid; per_order skips invalid orders",
+    )
+
+
+class BulkOrderError(BaseModel):
+    index: int = Field(..., description="Position of the order in the request")
+    id: Optional[str] = None
+    detail: str
+
+
+class BulkOrderResult(BaseModel):
+    created: List[str] = Field(..., description="Ids of the created orders, in request order")
+    errors: List[BulkOrderError]
+
+
+MAX_PLAN_LINES = 10_000
+
+
+class ProductionLineInput(BaseModel):
+    recipe_id: str
+    portions: float = Field(..., gt=0)
+    date: date
+    kitchen: Optional[str] = None
+
+
+class ProductionPlanRequest(BaseModel):
+    lines: List[ProductionLineInput] = Field(..., min_items=1, max_items=MAX_PLAN_LINES)
+
+
+class DraftOrderItemRead(BaseModel):
+    product_id: str
+    quantity: int
+    unit: str
+    price_each: float
+    line_total: float
+    required_quantity: float
+    required_unit: str
+    ingredient_ids: List[str]
+
+    class Config:
+        orm_mode = True
+
+
+class DraftOrderRead(BaseModel):
+    id: Optional[str] = None
+    supplier_id: str
+    scheduled_date: date
+    kitchen: Optional[str] = None
+    total: float
+    lines: List[DraftOrderItemRead]
+
+    class Config:
+        orm_mode = True
+
+
+class UnresolvedRequirementRead(BaseModel):
+    ingredient_id: str
+    quantity: float
+    unit: str
+    date: date
+    kitchen: Optional[str] = None
+    reason: str
+
+    class Config:
+        orm_mode = True
+
+
+class OrderPlanRead(BaseModel):
+    orders: List[DraftOrderRead]
+    unresolved: List[UnresolvedRequirementRead]
+    total: float
+
+    class Config:
+        orm_mode = True
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class RecipeIngredientInput(BaseModel):
@@ -37,3 +37,34 @@ class RecipeRead(RecipeBase):
 
     class Config:
         orm_mode = True
+
+
+class RecipeCostRequest(BaseModel):
+    recipe_ids: Optional[List[str]] = None
+
+
+class RecipeCostRead(BaseModel):
+    recipe_id: str
+    total_cost: float
+    ingredient_costs: dict[str, float]
+    unpriced_ingredients: List[str]
+    computed_at: Optional[datetime] = None
+    age_seconds: Optional[float] = None
+
+
+# One NutritionRollupService lookup chunk, so a request loads its recipe lines in one statement.
+MAX_NUTRITION_RECIPES = 500
+
+
+class RecipeNutritionRequest(BaseModel):
+    recipe_ids: Optional[List[str]] = Field(default=None, max_items=MAX_NUTRITION_RECIPES)
+
+
+class RecipeNutritionRead(BaseModel):
+    recipe_id: str
+    nutrients: dict[str, float]
+    allergens: List[str]
+    unprofiled_ingredients: List[str]
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class PriceTrendRead(BaseModel):
+    product_id: str
+    average_price: float
+    latest_price: float
+    change_percent: float
+    observations: int
+
+    class Config:
+        orm_mode = True
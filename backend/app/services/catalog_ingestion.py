@@ -1,17 +1,77 @@
 from __future__ import annotations
 
+import codecs
 import csv
 import io
+import logging
+import mmap
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import time
 import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Iterable
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Awaitable, BinaryIO, Callable, Iterable, Iterator, Literal
 
 from fastapi import UploadFile
-from sqlalchemy import select
+from fastapi.concurrency import run_in_threadpool
+from openpyxl import load_workbook
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
+from app.core.cache import invalidate_tables
+from app.core.metrics import timed
 from app.models import PriceHistory, Product, Supplier
-from app.utils.identifiers import detect_identifier_type, validate_gtin
+from app.services.price_book import PriceBook
+from app.services.price_rollups import PriceRollupService
+from app.services.recipe_cost_cache import RecipeCostCache
+from app.utils.csv_ranges import read_csv_header, split_csv_ranges
+from app.utils.identifiers import classify_identifiers
+
+logger = logging.getLogger(__name__)
+
+# Column names the row parser understands, in order of preference.
+_NAME_COLUMNS = ("name", "product", "description")
+_PRICE_COLUMNS = ("price", "cost")
+_SKU_COLUMNS = ("sku", "item_number")
+_IDENTIFIER_COLUMNS = ("upc", "gtin")
+_KNOWN_COLUMNS = frozenset(
+    (*_NAME_COLUMNS, *_PRICE_COLUMNS, *_SKU_COLUMNS, *_IDENTIFIER_COLUMNS, "unit", "package_size")
+)
+# Spreadsheet headers are written for people; map the common variants onto the names above.
+_XLSX_COLUMN_ALIASES = {
+    "product_name": "name",
+    "item_name": "name",
+    "item_description": "description",
+    "unit_price": "price",
+    "case_price": "price",
+    "item_no": "item_number",
+    "item_#": "item_number",
+    "uom": "unit",
+    "pack_size": "package_size",
+    "pack": "package_size",
+    "upc_code": "upc",
+    "gtin_14": "gtin",
+}
+_IDENTIFIER_BLOCK_SIZE = 1000
+# SKUs per IN lookup when diffing a batch against the stored catalog.
+_LOOKUP_CHUNK = 500
+# Formats with a parser; uploads in any other format are rejected before they are staged.
+SUPPORTED_FORMATS = frozenset({"csv", "tsv", "xlsx"})
+# How an upload writes its rows. "insert" (the default) adds every row as a new product with a price
+# observation; "snapshot" upserts on (supplier_id, sku) and records an observation for every row;
+# "incremental" upserts and records one only for rows whose price changed.
+CatalogMode = Literal["insert", "snapshot", "incremental"]
+# How far down each sheet to look for the header row, past titles and supplier banners.
+_XLSX_HEADER_SCAN_ROWS = 25
 
 
 @dataclass
@@ -24,20 +84,107 @@ class CatalogProduct:
     gtin: str | None = None
     package_size: str | None = None
     currency: str = "USD"
+    barcode: str | None = None
+
+
+@dataclass
+class ExistingProduct:
+    id: str
+    name: str
+    unit: str
+    package_size: str | None
+    price: float
+    currency: str
+    upc: str | None
+    gtin: str | None
+
+    def differs_from(self, product: CatalogProduct) -> bool:
+        return (
+            self.price != round(product.price, 4)
+            or self.name != product.name
+            or self.unit != product.unit
+            or self.package_size != product.package_size
+            or self.currency != product.currency
+            or self.upc != product.upc
+            or self.gtin != product.gtin
+        )
+
+
+@dataclass
+class IngestionResult:
+    rows_parsed: int = 0
+    rows_persisted: int = 0
+    rows_inserted: int = 0
+    rows_updated: int = 0
+    rows_unchanged: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_persisted / self.elapsed_seconds if self.elapsed_seconds else 0.0
 
 
 class CatalogIngestionService:
-    def __init__(self, db: AsyncSession) -> None:
+    def __init__(
+        self,
+        db: AsyncSession,
+        batch_size: int | None = None,
+        on_batch: Callable[[IngestionResult], Awaitable[None]] | None = None,
+    ) -> None:
         self.db = db
+        settings = get_settings()
+        self.batch_size = batch_size or settings.catalog_batch_size
+        self.chunk_size = settings.catalog_read_chunk_size
+        self.parse_workers = settings.catalog_parse_workers or os.cpu_count() or 1
+        self.parallel_min_bytes = settings.catalog_parallel_min_bytes
+        self.on_batch = on_batch
 
-    async def handle_upload(self, supplier_id: str, file: UploadFile) -> None:
-        supplier = await self._get_supplier(supplier_id)
-        if supplier is None:
+    @timed
+    async def handle_upload(
+        self, supplier_id: str, file: UploadFile, streaming: bool = False, mode: CatalogMode = "insert"
+    ) -> IngestionResult:
+        await self._require_supplier(supplier_id)
+        extension = _extension(file.filename)
+        started = time.perf_counter()
+        if streaming:
+            await file.seek(0)
+            products = self._iter_products(extension, file.file)
+        else:
+            content = await file.read()
+            products = iter(await run_in_threadpool(self._parse_content, extension, content))
+        return await self._ingest(supplier_id, products, started, mode)
+
+    @timed
+    async def ingest_stream(
+        self, supplier_id: str, filename: str, stream: BinaryIO, mode: CatalogMode = "insert"
+    ) -> IngestionResult:
+        """Run the streaming pipeline over an already-staged catalog file."""
+        await self._require_supplier(supplier_id)
+        started = time.perf_counter()
+        products = self._iter_products(_extension(filename), stream)
+        return await self._ingest(supplier_id, products, started, mode)
+
+    async def _ingest(
+        self, supplier_id: str, products: Iterator[CatalogProduct], started: float, mode: CatalogMode
+    ) -> IngestionResult:
+        if mode == "insert":
+            result = await self._insert_products(supplier_id, products)
+        else:
+            result = await self._upsert_products(supplier_id, products, snapshot=mode == "snapshot")
+        result.elapsed_seconds = time.perf_counter() - started
+        logger.info(
+            "Catalog ingested",
+            extra={
+                "supplier_id": supplier_id,
+                "rows": result.rows_persisted,
+                "rows_per_second": round(result.rows_per_second, 1),
+            },
+        )
+        return result
+
+    async def _require_supplier(self, supplier_id: str) -> None:
+        if await self._get_supplier(supplier_id) is None:
             raise ValueError("Supplier not found")
-        content = await file.read()
-        extension = file.filename.split(".")[-1].lower()
-        products = self._parse_content(extension, content)
-        await self._persist_products(supplier_id, products)
 
     async def _get_supplier(self, supplier_id: str) -> Supplier | None:
         result = await self.db.execute(select(Supplier).where(Supplier.id == supplier_id))
@@ -46,70 +193,264 @@ class CatalogIngestionService:
     def _parse_content(self, extension: str, content: bytes) -> Iterable[CatalogProduct]:
         if extension in {"csv", "tsv"}:
             return list(self._parse_csv(content, delimiter="," if extension == "csv" else "\t"))
-        if extension in {"xls", "xlsx"}:
-            # Placeholder: real implementation would use openpyxl or pandas
-            raise NotImplementedError("Excel parsing not yet implemented")
+        if extension == "xlsx":
+            return list(self._parse_rows(_iter_xlsx_rows(io.BytesIO(content))))
+        if extension == "xls":
+            raise NotImplementedError("Legacy .xls catalogs are not supported; save the file as .xlsx")
         if extension == "pdf":
             raise NotImplementedError("PDF parsing with OCR not yet implemented")
         raise ValueError(f"Unsupported catalog format: {extension}")
 
+    def _iter_products(self, extension: str, stream: BinaryIO) -> Iterator[CatalogProduct]:
+        """Lazily parse a catalog from a binary stream without buffering the whole file."""
+        if extension in {"csv", "tsv"}:
+            delimiter = "," if extension == "csv" else "\t"
+            if self._parallel_parse_enabled(stream):
+                return self._parse_csv_parallel(stream, delimiter)
+            return self._parse_csv_lines(_iter_lines(stream, self.chunk_size), delimiter)
+        if extension == "xlsx":
+            return self._parse_rows(_iter_xlsx_rows(stream))
+        # Formats without a streaming parser fall back to the buffered path.
+        return iter(self._parse_content(extension, stream.read()))
+
     def _parse_csv(self, content: bytes, delimiter: str) -> Iterable[CatalogProduct]:
         decoded = content.decode("utf-8")
-        reader = csv.DictReader(io.StringIO(decoded), delimiter=delimiter)
-        for row in reader:
-            name = row.get("name") or row.get("product") or row.get("description")
-            if not name:
-                continue
-            price_str = (row.get("price") or row.get("cost") or "0").strip()
-            price = self._normalize_price(price_str)
-            sku = row.get("sku") or row.get("item_number") or str(uuid.uuid4())
-            unit = row.get("unit") or "ea"
-            identifier = row.get("upc") or row.get("gtin")
-            upc = None
-            gtin = None
-            if identifier:
-                id_type = detect_identifier_type(identifier)
-                if id_type == "upc" and validate_gtin(identifier):
-                    upc = identifier
-                elif id_type in {"gtin13", "gtin14"} and validate_gtin(identifier):
-                    gtin = identifier
-            yield CatalogProduct(
-                name=name.strip(),
-                price=price,
-                unit=unit,
-                sku=sku,
-                upc=upc,
-                gtin=gtin,
-                package_size=row.get("package_size"),
-            )
+        return self._parse_csv_lines(io.StringIO(decoded), delimiter)
 
-    async def _persist_products(self, supplier_id: str, products: Iterable[CatalogProduct]) -> None:
-        for product in products:
-            product_id = str(uuid.uuid4())
-            db_product = Product(
-                id=product_id,
-                supplier_id=supplier_id,
-                sku=product.sku,
-                name=product.name,
-                unit=product.unit,
-                package_size=product.package_size,
-                price=product.price,
-                currency=product.currency,
-                upc=product.upc,
-                gtin=product.gtin,
-            )
-            self.db.add(db_product)
-            self.db.add(
-                PriceHistory(
-                    id=str(uuid.uuid4()),
-                    product_id=product_id,
-                    supplier_id=supplier_id,
-                    price=product.price,
+    def _parse_csv_lines(self, lines: Iterable[str], delimiter: str) -> Iterator[CatalogProduct]:
+        return self._parse_rows(csv.DictReader(lines, delimiter=delimiter))
+
+    def _parallel_parse_enabled(self, stream: BinaryIO) -> bool:
+        # Daemonic processes (e.g. prefork Celery workers) cannot start a pool.
+        if self.parse_workers < 2 or multiprocessing.current_process().daemon:
+            return False
+        try:
+            position = stream.tell()
+            size = stream.seek(0, io.SEEK_END) - position
+            stream.seek(position)
+            if size < self.parallel_min_bytes:
+                return False
+            stream.fileno()
+        except (AttributeError, OSError):
+            return False
+        return True
+
+    def _parse_csv_parallel(self, stream: BinaryIO, delimiter: str) -> Iterator[CatalogProduct]:
+        """Parse a file-backed catalog over newline-aligned byte ranges in a process pool.
+
+        Ranges are memory-mapped and parsed in order, with a bounded number in flight. A range that
+        does not parse strictly (it ended inside a quoted field, or has a malformed quote) is parsed
+        serially from its start to the end of the file, so the output always matches the serial path.
+        """
+        position = stream.tell()
+        with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            header = read_csv_header(buffer, position, delimiter)
+            if header is None:
+                return
+            fieldnames, start = header
+            ranges = iter(split_csv_ranges(buffer, start, self.chunk_size))
+            path = _local_path(stream)
+            pending: deque[tuple[int, Future]] = deque()
+            with ProcessPoolExecutor(max_workers=self.parse_workers) as executor:
+
+                def submit() -> None:
+                    for range_start, range_end in ranges:
+                        source = path or buffer[range_start:range_end]
+                        args = (source, range_start, range_end, fieldnames, delimiter)
+                        pending.append((range_start, executor.submit(_parse_csv_range, *args)))
+                        if len(pending) >= self.parse_workers * 2:
+                            return
+
+                submit()
+                while pending:
+                    range_start, future = pending.popleft()
+                    rows = future.result()
+                    if rows is None:
+                        executor.shutdown(cancel_futures=True)
+                        break
+                    for values in rows:
+                        yield CatalogProduct(*values)
+                    submit()
+                else:
+                    return
+            logger.info("Falling back to serial CSV parsing", extra={"offset": range_start})
+            buffer.seek(range_start)
+            lines = _iter_lines(buffer, self.chunk_size)
+            yield from self._parse_rows(csv.DictReader(lines, fieldnames=fieldnames, delimiter=delimiter))
+
+    def _parse_rows(self, rows: Iterable[dict[str, str | None]]) -> Iterator[CatalogProduct]:
+        rows = iter(rows)
+        # Identifiers are classified a block at a time with the vectorized batch functions.
+        while block := list(islice(rows, _IDENTIFIER_BLOCK_SIZE)):
+            products = []
+            identifiers = []
+            for row in block:
+                name = _first(row, _NAME_COLUMNS)
+                if not name:
+                    continue
+                price_str = (_first(row, _PRICE_COLUMNS) or "0").strip()
+                products.append(
+                    CatalogProduct(
+                        name=name.strip(),
+                        price=self._normalize_price(price_str),
+                        unit=row.get("unit") or "ea",
+                        sku=_first(row, _SKU_COLUMNS) or str(uuid.uuid4()),
+                        package_size=row.get("package_size"),
+                    )
+                )
+                identifiers.append(_first(row, _IDENTIFIER_COLUMNS) or "")
+            batch = classify_identifiers(identifiers)
+            for product, identifier, id_type, valid, gtin14 in zip(
+                products, identifiers, batch.types, batch.valid, batch.gtin14
+            ):
+                if not valid:
+                    continue
+                if id_type == "upc":
+                    product.upc = identifier
+                elif id_type in {"gtin13", "gtin14"}:
+                    product.gtin = identifier
+                product.barcode = gtin14
+            yield from products
+
+    async def _insert_products(self, supplier_id: str, products: Iterator[CatalogProduct]) -> IngestionResult:
+        """Write every row as a new product with a price observation, a few statements per batch.
+
+        Raises ``ValueError`` if a SKU repeats or already exists for the supplier; re-uploads of a
+        catalog go through ``_upsert_products`` instead.
+        """
+        result = IngestionResult()
+        while batch := await self._next_batch(products):
+            result.rows_parsed += len(batch)
+            product_rows: list[dict] = []
+            price_rows: list[dict] = []
+            for product in batch:
+                product_id = str(uuid.uuid4())
+                product_rows.append(_product_row(supplier_id, product_id, product))
+                price_rows.append(_price_row(supplier_id, product_id, product))
+            try:
+                await self.db.execute(insert(Product.__table__), product_rows)
+            except IntegrityError as exc:
+                raise ValueError(
+                    "Catalog repeats a SKU or has SKUs that already exist for this supplier; "
+                    "upload it in snapshot or incremental mode"
+                ) from exc
+            await self.db.execute(insert(PriceHistory.__table__), price_rows)
+            await PriceRollupService(self.db).record(price_rows)
+            # New products have no ingredient mappings yet, so no offers or recipe costs move.
+            await self.db.commit()
+            await invalidate_tables("products", "price_history", "price_rollups")
+            result.rows_inserted += len(batch)
+            result.rows_persisted += len(batch)
+            await self._report(result)
+        return result
+
+    async def _upsert_products(
+        self, supplier_id: str, products: Iterator[CatalogProduct], snapshot: bool = False
+    ) -> IngestionResult:
+        """Diff incoming rows against the supplier's catalog by SKU and write only what changed.
+
+        With ``snapshot`` every row records a price history observation, not just repriced ones.
+        """
+        result = IngestionResult()
+        while batch := await self._next_batch(products):
+            result.rows_parsed += len(batch)
+            # Earlier batches are committed, so only this batch's SKUs need to be looked up.
+            existing = await self._load_existing(supplier_id, {product.sku for product in batch})
+            new_rows: list[dict] = []
+            changed_rows: list[dict] = []
+            price_rows: list[dict] = []
+            repriced: list[str] = []
+            for product in batch:
+                current = existing.get(product.sku)
+                if current is None:
+                    product_id = str(uuid.uuid4())
+                    new_rows.append(_product_row(supplier_id, product_id, product))
+                    price_rows.append(_price_row(supplier_id, product_id, product))
+                elif current.differs_from(product):
+                    product_id = current.id
+                    row = _product_row(supplier_id, product_id, product)
+                    del row["id"], row["supplier_id"], row["sku"]
+                    changed_rows.append({"b_id": product_id, **row})
+                    if current.price != round(product.price, 4):
+                        price_rows.append(_price_row(supplier_id, product_id, product))
+                        repriced.append(product_id)
+                    elif snapshot:
+                        price_rows.append(_price_row(supplier_id, product_id, product))
+                else:
+                    result.rows_unchanged += 1
+                    if snapshot:
+                        price_rows.append(_price_row(supplier_id, current.id, product))
+                    continue
+                # Track what was just written so repeated SKUs later in the batch diff correctly.
+                existing[product.sku] = ExistingProduct(
+                    id=product_id,
+                    name=product.name,
+                    unit=product.unit,
+                    package_size=product.package_size,
+                    price=round(product.price, 4),
                     currency=product.currency,
-                    is_bulk="bulk" if product.package_size else None,
+                    upc=product.upc,
+                    gtin=product.gtin,
+                )
+            if new_rows:
+                await self.db.execute(insert(Product.__table__), new_rows)
+            if changed_rows:
+                await self.db.execute(_UPDATE_PRODUCT, changed_rows)
+            if price_rows:
+                await self.db.execute(insert(PriceHistory.__table__), price_rows)
+                await PriceRollupService(self.db).record(price_rows)
+            # New SKUs have no ingredient mappings yet, so only changed products can move offers; of
+            # those, only repriced ones can move recipe costs.
+            await PriceBook(self.db).refresh_for_products(row["b_id"] for row in changed_rows)
+            await RecipeCostCache(self.db).refresh_for_products(repriced)
+            await self.db.commit()
+            await invalidate_tables("products", "price_history", "price_rollups", "price_book_entries")
+            result.rows_inserted += len(new_rows)
+            result.rows_updated += len(changed_rows)
+            result.rows_persisted += len(batch)
+            await self._report(result)
+        return result
+
+    async def _next_batch(self, products: Iterator[CatalogProduct]) -> list[CatalogProduct]:
+        # Parsing reads the upload or staged file with blocking I/O, so it runs off the event loop.
+        return await run_in_threadpool(lambda: list(islice(products, self.batch_size)))
+
+    async def _report(self, result: IngestionResult) -> None:
+        if self.on_batch is not None:
+            await self.on_batch(result)
+
+    async def _load_existing(self, supplier_id: str, skus: Iterable[str]) -> dict[str, ExistingProduct]:
+        skus = sorted(skus)
+        existing: dict[str, ExistingProduct] = {}
+        for offset in range(0, len(skus), _LOOKUP_CHUNK):
+            result = await self.db.execute(
+                select(
+                    Product.sku,
+                    Product.id,
+                    Product.name,
+                    Product.unit,
+                    Product.package_size,
+                    Product.price,
+                    Product.currency,
+                    Product.upc,
+                    Product.gtin,
+                ).where(
+                    Product.supplier_id == supplier_id,
+                    Product.sku.in_(skus[offset : offset + _LOOKUP_CHUNK]),
                 )
             )
-        await self.db.commit()
+            for sku, product_id, name, unit, package_size, price, currency, upc, gtin in result:
+                existing[sku] = ExistingProduct(
+                    id=product_id,
+                    name=name,
+                    unit=unit,
+                    package_size=package_size,
+                    price=round(float(price), 4),
+                    currency=currency,
+                    upc=upc,
+                    gtin=gtin,
+                )
+        return existing
 
     def _normalize_price(self, value: str) -> float:
         cleaned = value.replace(",", "")
@@ -127,3 +468,158 @@ class CatalogIngestionService:
             return float(cleaned)
         except ValueError as exc:
             raise ValueError(f"Unable to parse price value '{value}'") from exc
+
+
+# Executed with a list of parameter dicts; every key other than ``b_id`` lands in the SET clause.
+_UPDATE_PRODUCT = update(Product.__table__).where(Product.__table__.c.id == bindparam("b_id"))
+
+
+def _product_row(supplier_id: str, product_id: str, product: CatalogProduct) -> dict:
+    return {
+        "id": product_id,
+        "supplier_id": supplier_id,
+        "sku": product.sku,
+        "name": product.name,
+        "unit": product.unit,
+        "package_size": product.package_size,
+        "price": product.price,
+        "currency": product.currency,
+        "upc": product.upc,
+        "gtin": product.gtin,
+        "barcode": product.barcode,
+    }
+
+
+def _price_row(supplier_id: str, product_id: str, product: CatalogProduct) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "product_id": product_id,
+        "supplier_id": supplier_id,
+        "price": product.price,
+        "currency": product.currency,
+        "is_bulk": "bulk" if product.package_size else None,
+        "recorded_at": datetime.now(timezone.utc),
+    }
+
+
+def _extension(filename: str) -> str:
+    return filename.split(".")[-1].lower()
+
+
+def check_catalog_format(filename: str) -> str:
+    """Return the format of ``filename`` or raise ``ValueError`` if no parser handles it."""
+    extension = _extension(filename)
+    if extension == "xls":
+        raise ValueError("Legacy .xls catalogs are not supported; save the file as .xlsx")
+    if extension not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported catalog format: {extension}")
+    return extension
+
+
+def _iter_lines(stream: BinaryIO, chunk_size: int) -> Iterator[str]:
+    """Yield decoded lines (with endings) from a binary stream read in fixed-size chunks."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    while chunk := stream.read(chunk_size):
+        # Split on "\n" only, like iterating an ``io.StringIO``; the tail may be a partial line.
+        *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def _local_path(stream: BinaryIO) -> str | None:
+    # Pool workers map the file themselves when it has a path; otherwise ranges are sent as bytes.
+    name = getattr(stream, "name", None)
+    return os.path.abspath(name) if isinstance(name, str) and os.path.isfile(name) else None
+
+
+def _parse_csv_range(
+    source: str | bytes, start: int, end: int, fieldnames: list[str], delimiter: str
+) -> list[tuple] | None:
+    """Pool worker: parse one byte range, or return None if it does not parse strictly."""
+    if isinstance(source, str):
+        with open(source, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            source = buffer[start:end]
+    rows = csv.DictReader(
+        io.StringIO(source.decode("utf-8")), fieldnames=fieldnames, delimiter=delimiter, strict=True
+    )
+    try:
+        products = CatalogIngestionService(db=None)._parse_rows(rows)
+        # Plain tuples pickle in about a third of the time of dataclass instances.
+        return [tuple(vars(product).values()) for product in products]
+    except csv.Error:
+        return None
+
+
+def _first(row: dict[str, str | None], columns: tuple[str, ...]) -> str | None:
+    for column in columns:
+        if value := row.get(column):
+            return value
+    return None
+
+
+def _iter_xlsx_rows(stream: BinaryIO) -> Iterator[dict[str, str | None]]:
+    """Stream data rows from the first sheet with a recognisable header, keyed like ``csv.DictReader``.
+
+    The workbook is opened read-only, so rows are parsed from the sheet XML as they are consumed.
+    """
+    if not stream.seekable():
+        # xlsx is a zip archive and needs random access.
+        spooled = tempfile.TemporaryFile()
+        shutil.copyfileobj(stream, spooled)
+        spooled.seek(0)
+        stream = spooled
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            # Some writers store a wrong used range; read whatever rows the sheet actually has.
+            sheet.reset_dimensions()
+            header = _find_xlsx_header(sheet)
+            if header is not None:
+                break
+        else:
+            raise ValueError("No worksheet has a header row with a product name column")
+        header_row, columns = header
+        for values in sheet.iter_rows(min_row=header_row + 1, values_only=True):
+            yield {
+                column: _xlsx_cell_text(column, value)
+                for column, value in zip(columns, values)
+                if column is not None
+            }
+    finally:
+        workbook.close()
+
+
+def _find_xlsx_header(sheet: Any) -> tuple[int, list[str | None]] | None:
+    rows = sheet.iter_rows(min_row=1, max_row=_XLSX_HEADER_SCAN_ROWS, values_only=True)
+    for index, values in enumerate(rows, start=1):
+        columns = [_xlsx_column_name(value) for value in values]
+        if any(column in _NAME_COLUMNS for column in columns) and (
+            sum(column in _KNOWN_COLUMNS for column in columns) >= 2
+        ):
+            return index, columns
+    return None
+
+
+def _xlsx_column_name(value: Any) -> str | None:
+    if value is None:
+        return None
+    # "Item Number" and "Package-Size" map to the snake_case names CSV headers use.
+    name = re.sub(r"[\s\-]+", "_", str(value).strip().lower())
+    return _XLSX_COLUMN_ALIASES.get(name, name) or None
+
+
+def _xlsx_cell_text(column: str, value: Any) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, int) and not isinstance(value, bool) and column in _IDENTIFIER_COLUMNS:
+        # Identifiers typed as numbers lose their leading zeros (a UPC-A like 012345678905).
+        return str(value).zfill(12)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
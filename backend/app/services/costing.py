@@ -1,58 +1,131 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Sequence
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import PriceHistory, Product, ProductIngredientMapping, Recipe, RecipeIngredient
+from app.core.cache import TwoTierCache
+from app.core.metrics import timed
+from app.models import Recipe, RecipeIngredient
+from app.services.price_book import PriceBook
+from app.utils.units import to_base_quantity
 
 
 @dataclass
 class RecipeCostBreakdown:
     total_cost: float
     ingredient_costs: dict[str, float]
+    # Ingredients with a line no offer prices: unmapped, or in a unit no offer converts to.
+    unpriced_ingredients: list[str] = field(default_factory=list)
+
+
+class RecipeNotFoundError(LookupError):
+    def __init__(self, recipe_ids: Sequence[str]) -> None:
+        super().__init__(f"Recipe not found: {', '.join(recipe_ids)}")
+        self.recipe_ids = list(recipe_ids)
+
+
+# Tables recipe costs are computed from; writes to any of them must invalidate cached costs.
+COST_TABLES = ("recipes", "recipe_ingredients", "price_book_entries")
 
 
 class CostingService:
-    def __init__(self, db: AsyncSession) -> None:
+    """Costs recipes from mapped product prices using a fixed number of queries per call.
+
+    With a ``cache`` results are shared across requests and workers until one of ``COST_TABLES``
+    is invalidated; ``RecipeCostCache`` passes none since it stores what it computes itself.
+    """
+
+    def __init__(self, db: AsyncSession, cache: TwoTierCache | None = None) -> None:
         self.db = db
+        self.cache = cache
 
+    @timed
     async def recipe_cost(self, recipe_id: str) -> RecipeCostBreakdown:
-        recipe = await self._get_recipe(recipe_id)
-        ingredient_costs: dict[str, float] = {}
-        total = 0.0
-        for entry in recipe.ingredients:
-            cost = await self._ingredient_cost(entry)
-            ingredient_costs[entry.ingredient_id] = cost
-            total += cost
-        return RecipeCostBreakdown(total_cost=total, ingredient_costs=ingredient_costs)
-
-    async def _get_recipe(self, recipe_id: str) -> Recipe:
-        result = await self.db.execute(select(Recipe).where(Recipe.id == recipe_id))
-        recipe = result.scalar_one()
-        await self._prefetch_ingredients(recipe)
-        return recipe
-
-    async def _prefetch_ingredients(self, recipe: Recipe) -> None:
-        for entry in recipe.ingredients:
-            await self.db.refresh(entry, attribute_names=["ingredient"])
-
-    async def _ingredient_cost(self, entry: RecipeIngredient) -> float:
-        result = await self.db.execute(
-            select(Product)
-            .join(ProductIngredientMapping)
-            .where(ProductIngredientMapping.ingredient_id == entry.ingredient_id)
-        )
-        product = result.scalar_one_or_none()
-        if product:
-            return float(product.price) * float(entry.quantity)
-        price_result = await self.db.execute(
-            select(PriceHistory)
-            .join(Product)
-            .join(ProductIngredientMapping)
-            .where(ProductIngredientMapping.ingredient_id == entry.ingredient_id)
-            .order_by(PriceHistory.recorded_at.desc())
+        costs = await self.recipe_costs([recipe_id])
+        return costs[recipe_id]
+
+    @timed
+    async def recipe_costs(self, recipe_ids: Sequence[str] | None = None) -> dict[str, RecipeCostBreakdown]:
+        """Cost the given recipes, or every recipe when ``recipe_ids`` is None.
+
+        Runs two statements regardless of how many recipes or ingredients are involved:
+        one for the recipe lines and one for the price book's best offers.
+        """
+        if self.cache is None:
+            return await self._compute(recipe_ids)
+        key = None if recipe_ids is None else sorted(set(recipe_ids))
+        return await self.cache.get_or_compute(
+            "recipe_costs",
+            COST_TABLES,
+            key,
+            lambda: self._compute(recipe_ids),
+            _encode_costs,
+            _decode_costs,
         )
-        price = price_result.scalar_one_or_none()
-        return float(price.price) * float(entry.quantity) if price else 0.0
+
+    async def _compute(self, recipe_ids: Sequence[str] | None) -> dict[str, RecipeCostBreakdown]:
+        recipes = await self._load_lines(recipe_ids)
+        if recipe_ids is not None:
+            missing = [recipe_id for recipe_id in dict.fromkeys(recipe_ids) if recipe_id not in recipes]
+            if missing:
+                raise RecipeNotFoundError(missing)
+        prices = await self._load_unit_prices(recipe_ids)
+        breakdowns: dict[str, RecipeCostBreakdown] = {}
+        for recipe_id, lines in recipes.items():
+            ingredient_costs: dict[str, float] = defaultdict(float)
+            unpriced: set[str] = set()
+            for ingredient_id, quantity, unit in lines:
+                amount, base_unit = to_base_quantity(quantity, unit)
+                price = prices.get((ingredient_id, base_unit))
+                if price is None:
+                    unpriced.add(ingredient_id)
+                ingredient_costs[ingredient_id] += (price or 0.0) * amount
+            breakdowns[recipe_id] = RecipeCostBreakdown(
+                total_cost=sum(ingredient_costs.values()),
+                ingredient_costs=dict(ingredient_costs),
+                unpriced_ingredients=sorted(unpriced),
+            )
+        return breakdowns
+
+    async def _load_lines(
+        self, recipe_ids: Sequence[str] | None
+    ) -> dict[str, list[tuple[str, float, str]]]:
+        stmt = select(
+            Recipe.id, RecipeIngredient.ingredient_id, RecipeIngredient.quantity, RecipeIngredient.unit
+        ).outerjoin(RecipeIngredient, RecipeIngredient.recipe_id == Recipe.id)
+        if recipe_ids is not None:
+            stmt = stmt.where(Recipe.id.in_(recipe_ids))
+        recipes: dict[str, list[tuple[str, float, str]]] = defaultdict(list)
+        for recipe_id, ingredient_id, quantity, unit in await self.db.execute(stmt):
+            lines = recipes[recipe_id]
+            if ingredient_id is not None:
+                lines.append((ingredient_id, float(quantity), unit))
+        return recipes
+
+    async def _load_unit_prices(self, recipe_ids: Sequence[str] | None) -> dict[tuple[str, str], float]:
+        """Return the preferred offer's price per base unit, keyed by ingredient and base unit.
+
+        The preferred offer is the price book's rank-1 offer for that base unit: the cheapest per
+        unit among confidently mapped products.
+        """
+        ingredient_ids = select(RecipeIngredient.ingredient_id)
+        if recipe_ids is not None:
+            ingredient_ids = ingredient_ids.where(RecipeIngredient.recipe_id.in_(recipe_ids))
+        offers = await PriceBook(self.db).best_offers(ingredient_ids)
+        return {
+            (ingredient_id, base_unit): offer.unit_price
+            for ingredient_id, by_unit in offers.items()
+            for base_unit, offer in by_unit.items()
+        }
+
+
+def _encode_costs(breakdowns: dict[str, RecipeCostBreakdown]) -> dict[str, Any]:
+    return {recipe_id: asdict(breakdown) for recipe_id, breakdown in breakdowns.items()}
+
+
+def _decode_costs(data: dict[str, Any]) -> dict[str, RecipeCostBreakdown]:
+    return {recipe_id: RecipeCostBreakdown(**breakdown) for recipe_id, breakdown in data.items()}
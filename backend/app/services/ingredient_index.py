@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TwoTierCache, get_cache
+from app.models import Ingredient
+
+# Writes to this table (see ``invalidate_tables``) make the cached index stale.
+INDEX_TABLE = "ingredients"
+
+
+def tokenize(text: str) -> frozenset[str]:
+    return frozenset(text.lower().split())
+
+
+class IngredientIndex:
+    """Inverted token index over ingredient names.
+
+    A query only scores ingredients that share at least one token with it, using the same
+    overlap / max(len(query), len(candidate)) confidence as a full scan.
+    """
+
+    def __init__(self) -> None:
+        self._postings: dict[str, set[str]] = defaultdict(set)
+        self._tokens: dict[str, frozenset[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def add(self, ingredient_id: str, name: str) -> None:
+        self.remove(ingredient_id)
+        tokens = tokenize(name)
+        self._tokens[ingredient_id] = tokens
+        for token in tokens:
+            self._postings[token].add(ingredient_id)
+
+    def remove(self, ingredient_id: str) -> None:
+        for token in self._tokens.pop(ingredient_id, ()):
+            postings = self._postings[token]
+            postings.discard(ingredient_id)
+            if not postings:
+                del self._postings[token]
+
+    def search(self, query: str, threshold: float = 0.4) -> list[tuple[str, float]]:
+        """Return ``(ingredient_id, confidence)`` for every candidate scoring above ``threshold``."""
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+        overlaps: dict[str, int] = defaultdict(int)
+        for token in query_tokens:
+            for ingredient_id in self._postings.get(token, ()):
+                overlaps[ingredient_id] += 1
+        matches = []
+        for ingredient_id, overlap in overlaps.items():
+            confidence = overlap / max(len(query_tokens), len(self._tokens[ingredient_id]))
+            if confidence > threshold:
+                matches.append((ingredient_id, confidence))
+        return matches
+
+
+# Process-wide index and the ``INDEX_TABLE`` version it was built at.
+_index: tuple[int, IngredientIndex] | None = None
+
+
+async def load_ingredient_index(db: AsyncSession) -> IngredientIndex:
+    index = IngredientIndex()
+    result = await db.execute(select(Ingredient.id, Ingredient.name))
+    for ingredient_id, name in result:
+        index.add(ingredient_id, name)
+    return index
+
+
+async def get_ingredient_index(db: AsyncSession, cache: TwoTierCache | None = None) -> IngredientIndex:
+    """Return the process-wide index, rebuilding it once ``INDEX_TABLE`` has been invalidated.
+
+    The table's version comes from the shared cache tier, so writes made by other workers are
+    picked up too.
+    """
+    global _index
+    (version,) = await (cache or get_cache()).versions((INDEX_TABLE,))
+    cached = _index
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    index = await load_ingredient_index(db)
+    _index = (version, index)
+    return index
+
+
+async def index_ingredient(ingredient_id: str, name: str, cache: TwoTierCache | None = None) -> None:
+    """Add a single written ingredient to the built index; call after invalidating ``INDEX_TABLE``.
+
+    The index moves to the new version only if this write is the one change since it was built.
+    After a version gap (another worker's writes, or a bulk change) it is left stale, so the next
+    ``get_ingredient_index`` rebuilds it in full.
+    """
+    global _index
+    cached = _index
+    if cached is None:
+        return
+    (version,) = await (cache or get_cache()).versions((INDEX_TABLE,))
+    if version == cached[0] + 1:
+        cached[1].add(ingredient_id, name)
+        _index = (version, cached[1])
+
+
+def reset_ingredient_index() -> None:
+    global _index
+    _index = None
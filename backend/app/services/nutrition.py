@@ -1,13 +1,25 @@
 from __future__ import annotations
 
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
 from dataclasses import dataclass
 import uuid
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Ingredient, Product, ProductIngredientMapping
+from app.core.cache import invalidate_tables
+from app.models import Product, ProductIngredientMapping
+from app.services.ingredient_index import IngredientIndex, get_ingredient_index, load_ingredient_index
+from app.services.price_book import LOW_CONFIDENCE_THRESHOLD, PriceBook
+from app.services.recipe_cost_cache import RecipeCostCache
+
+MATCH_THRESHOLD = 0.4
 
 
 @dataclass
@@ -17,6 +29,18 @@ class NutritionMatch:
     confidence: float
 
 
+@dataclass
+class CatalogMatchSummary:
+    matched: int = 0
+    unmatched: int = 0
+    low_confidence: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def products(self) -> int:
+        return self.matched + self.unmatched
+
+
 class NutritionMatchingService:
     def __init__(self, db: AsyncSession) -> None:
         self.db = db
@@ -25,26 +49,117 @@ class NutritionMatchingService:
         ingredients = await self._search_ingredients(product.name)
         if not ingredients:
             return None
-        best = max(ingredients, key=lambda candidate: candidate[1])
-        ingredient, confidence = best
+        ingredient_id, confidence = _best(ingredients)
         mapping = ProductIngredientMapping(
             id=str(uuid.uuid4()),
             product_id=product.id,
-            ingredient_id=ingredient.id,
+            ingredient_id=ingredient_id,
             confidence_score=confidence,
         )
         self.db.add(mapping)
+        await PriceBook(self.db).refresh_for_ingredients([ingredient_id])
+        await RecipeCostCache(self.db).refresh_for_ingredients([ingredient_id])
         await self.db.commit()
-        return NutritionMatch(product.id, ingredient.id, confidence)
+        await invalidate_tables("product_ingredient_mappings", "price_book_entries")
+        return NutritionMatch(product.id, ingredient_id, confidence)
+
+    async def match_catalog(
+        self,
+        supplier_id: str | None = None,
+        batch_size: int = 5000,
+        workers: int | None = None,
+    ) -> CatalogMatchSummary:
+        """Match every unmapped product (optionally of one supplier) and bulk-write the mappings.
 
-    async def _search_ingredients(self, query: str) -> list[tuple[Ingredient, float]]:
-        result = await self.db.execute(select(Ingredient))
-        matches: list[tuple[Ingredient, float]] = []
-        for ingredient in result.scalars():
-            confidence = self._score(query, ingredient.name)
-            if confidence > 0.4:
-                matches.append((ingredient, confidence))
-        return matches
+        Scoring is spread over a process pool; each batch is written with one insert and committed.
+        Daemonic processes (e.g. prefork Celery workers) cannot fork a pool, so they score inline.
+        """
+        started = time.perf_counter()
+        # A long-running job loads a fresh index rather than trusting this process's cached copy.
+        index = await load_ingredient_index(self.db)
+        workers = workers if workers is not None else os.cpu_count() or 1
+        if multiprocessing.current_process().daemon:
+            workers = 1
+        # Spawned rather than forked: this process runs an event loop and holds database connections.
+        executor = (
+            ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(index,),
+            )
+            if workers > 1
+            else None
+        )
+        summary = CatalogMatchSummary()
+        last_id = ""
+        try:
+            while True:
+                stmt = (
+                    select(Product.id, Product.name)
+                    .where(Product.id > last_id, ~Product.ingredient_mappings.any())
+                    .order_by(Product.id)
+                    .limit(batch_size)
+                )
+                if supplier_id:
+                    stmt = stmt.where(Product.supplier_id == supplier_id)
+                products = (await self.db.execute(stmt)).all()
+                if not products:
+                    break
+                last_id = products[-1][0]
+                matches = await self._score_batch(products, index, executor, workers)
+                await self._write_matches(matches, summary)
+                summary.unmatched += len(products) - len(matches)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        summary.elapsed_seconds = time.perf_counter() - started
+        return summary
+
+    async def _score_batch(
+        self,
+        products: list[tuple[str, str]],
+        index: IngredientIndex,
+        executor: Executor | None,
+        workers: int,
+    ) -> list[NutritionMatch]:
+        if executor is None:
+            return _match_chunk(products, index)
+        loop = asyncio.get_running_loop()
+        size = -(-len(products) // workers)
+        chunks = [products[offset : offset + size] for offset in range(0, len(products), size)]
+        results = await asyncio.gather(
+            *(loop.run_in_executor(executor, _match_chunk, chunk) for chunk in chunks)
+        )
+        return [match for chunk in results for match in chunk]
+
+    async def _write_matches(self, matches: list[NutritionMatch], summary: CatalogMatchSummary) -> None:
+        if not matches:
+            return
+        rows = []
+        for match in matches:
+            low = match.confidence < LOW_CONFIDENCE_THRESHOLD
+            summary.low_confidence += low
+            rows.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "product_id": match.product_id,
+                    "ingredient_id": match.ingredient_id,
+                    "confidence_score": match.confidence,
+                    "notes": "low confidence" if low else None,
+                }
+            )
+        await self.db.execute(insert(ProductIngredientMapping.__table__), rows)
+        ingredient_ids = {match.ingredient_id for match in matches}
+        await PriceBook(self.db).refresh_for_ingredients(ingredient_ids)
+        await RecipeCostCache(self.db).refresh_for_ingredients(ingredient_ids)
+        await self.db.commit()
+        await invalidate_tables("product_ingredient_mappings", "price_book_entries")
+        summary.matched += len(matches)
+
+    async def _search_ingredients(self, query: str) -> list[tuple[str, float]]:
+        index = await get_ingredient_index(self.db)
+        return index.search(query, threshold=MATCH_THRESHOLD)
 
     def _score(self, query: str, candidate: str) -> float:
         query_tokens = set(query.lower().split())
@@ -53,3 +168,52 @@ class NutritionMatchingService:
         if not overlap:
             return 0.0
         return len(overlap) / max(len(query_tokens), len(candidate_tokens))
+
+
+def _best(candidates: list[tuple[str, float]]) -> tuple[str, float]:
+    # Highest confidence wins; ties go to the lowest ingredient id so results are stable.
+    return min(candidates, key=lambda candidate: (-candidate[1], candidate[0]))
+
+
+_worker_index: IngredientIndex | None = None
+
+
+def _init_worker(index: IngredientIndex) -> None:
+    global _worker_index
+    _worker_index = index
+
+
+def _match_chunk(
+    products: list[tuple[str, str]], index: IngredientIndex | None = None
+) -> list[NutritionMatch]:
+    index = index if index is not None else _worker_index
+    matches = []
+    for product_id, name in products:
+        candidates = index.search(name, threshold=MATCH_THRESHOLD)
+        if candidates:
+            ingredient_id, confidence = _best(candidates)
+            matches.append(NutritionMatch(product_id, ingredient_id, confidence))
+    return matches
+
+
+async def _match_from_cli(supplier_id: str | None, workers: int | None) -> CatalogMatchSummary:
+    from app.db.session import async_session_factory, engine
+
+    try:
+        async with async_session_factory() as session:
+            service = NutritionMatchingService(session)
+            return await service.match_catalog(supplier_id=supplier_id, workers=workers)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Match unmapped products to ingredients in bulk.")
+    parser.add_argument("--supplier-id", help="only match this supplier's products")
+    parser.add_argument("--workers", type=int, help="scoring processes (default: CPU count)")
+    args = parser.parse_args()
+    result = asyncio.run(_match_from_cli(args.supplier_id, args.workers))
+    print(
+        f"matched={result.matched} unmatched={result.unmatched} "
+        f"low_confidence={result.low_confidence} elapsed={result.elapsed_seconds:.2f}s"
+    )
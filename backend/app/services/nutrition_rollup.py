@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TwoTierCache
+from app.core.metrics import timed
+from app.models import Ingredient, Recipe, RecipeIngredient
+from app.services.costing import RecipeNotFoundError
+from app.utils.units import to_base_quantity
+
+# Writes to this table (see ``invalidate_tables``) make cached matrices stale.
+MATRIX_TABLE = "ingredients"
+# Recipe ids per IN lookup; requests for up to this many recipes load their lines in one statement.
+_LOOKUP_CHUNK = 500
+
+
+@dataclass
+class RecipeNutrition:
+    recipe_id: str
+    nutrients: dict[str, float]
+    allergens: list[str]
+    # Ingredients in the recipe without a numeric nutritional profile; their nutrients count as zero.
+    unprofiled_ingredients: list[str] = field(default_factory=list)
+
+
+@dataclass
+class NutrientMatrix:
+    """Ingredients × nutrients values and ingredients × allergens flags, one row per ingredient.
+
+    Profile values are read as amounts per base unit of the ingredient (lb, gal or ea); keys whose
+    values are not numbers are ignored, and a nutrient missing from a profile is zero.
+    """
+
+    positions: dict[str, int]
+    nutrients: list[str]
+    values: np.ndarray
+    allergens: list[str]
+    allergen_flags: np.ndarray
+    profiled: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[str, Any, Any]]) -> NutrientMatrix:
+        """Build from ``(ingredient_id, nutritional_profile, allergen_flags)`` rows."""
+        rows = list(rows)
+        profiles = [_numeric(profile) for _, profile, _ in rows]
+        flags = [_flagged(allergen_flags) for _, _, allergen_flags in rows]
+        nutrients = sorted({name for profile in profiles for name in profile})
+        allergens = sorted({name for flagged in flags for name in flagged})
+        nutrient_columns = {name: column for column, name in enumerate(nutrients)}
+        allergen_columns = {name: column for column, name in enumerate(allergens)}
+        values = np.zeros((len(rows), len(nutrients)))
+        allergen_flags = np.zeros((len(rows), len(allergens)), dtype=bool)
+        for row, (profile, flagged) in enumerate(zip(profiles, flags)):
+            for name, value in profile.items():
+                values[row, nutrient_columns[name]] = value
+            for name in flagged:
+                allergen_flags[row, allergen_columns[name]] = True
+        return cls(
+            positions={ingredient_id: row for row, (ingredient_id, _, _) in enumerate(rows)},
+            nutrients=nutrients,
+            values=values,
+            allergens=allergens,
+            allergen_flags=allergen_flags,
+            profiled=np.array([bool(profile) for profile in profiles], dtype=bool),
+        )
+
+
+# Process-wide matrix and the ``MATRIX_TABLE`` version it was built at.
+_matrix: tuple[int, NutrientMatrix] | None = None
+
+
+class NutritionRollupService:
+    """Nutrient totals and allergens per recipe, computed for any number of recipes at once.
+
+    Recipe lines form a sparse recipes × ingredients quantity matrix (one entry per line, grouped
+    by recipe) that is multiplied with the ingredient ``NutrientMatrix``: every line's quantity
+    scales its ingredient's row and ``np.add.reduceat`` sums the rows per recipe, which is the
+    sparse product without materializing the dense recipe matrix. Allergens are or-reduced the
+    same way. With a ``cache`` the ingredient matrix is built once per process and rebuilt only
+    after ``ingredients`` is invalidated.
+    """
+
+    def __init__(self, db: AsyncSession, cache: TwoTierCache | None = None) -> None:
+        self.db = db
+        self.cache = cache
+
+    @timed
+    async def recipe_nutrition(self, recipe_id: str) -> RecipeNutrition:
+        rollups = await self.rollup([recipe_id])
+        return rollups[recipe_id]
+
+    @timed
+    async def rollup(self, recipe_ids: Sequence[str] | None = None) -> dict[str, RecipeNutrition]:
+        """Roll up the given recipes, or every recipe when ``recipe_ids`` is None.
+
+        Runs one statement per 500 recipes for the recipe lines (one when rolling up every recipe)
+        plus one for the ingredients when the matrix is not cached. Recipe quantities are converted
+        to base units before scaling; units that do not convert are used as they are. Raises
+        ``RecipeNotFoundError`` for unknown recipes.
+        """
+        order, starts, ingredient_ids, quantities = await self._load_lines(recipe_ids)
+        if recipe_ids is not None:
+            missing = [recipe_id for recipe_id in dict.fromkeys(recipe_ids) if recipe_id not in starts]
+            if missing:
+                raise RecipeNotFoundError(missing)
+        matrix = await self._matrix()
+        if any(ingredient_id not in matrix.positions for ingredient_id in ingredient_ids):
+            # Written after the cached matrix was built, before its invalidation reached us.
+            matrix = await self._matrix(refresh=True)
+
+        columns = np.fromiter(
+            (matrix.positions[ingredient_id] for ingredient_id in ingredient_ids), dtype=np.intp
+        )
+        # Recipes with lines, in line order, and where each one's lines start.
+        with_lines = [recipe_id for recipe_id in order if starts[recipe_id] is not None]
+        offsets = np.array([starts[recipe_id] for recipe_id in with_lines], dtype=np.intp)
+        if len(columns):
+            totals = np.add.reduceat(np.array(quantities)[:, None] * matrix.values[columns], offsets)
+            allergens = np.logical_or.reduceat(matrix.allergen_flags[columns], offsets)
+            unprofiled = ~matrix.profiled[columns]
+        else:
+            totals = np.zeros((0, len(matrix.nutrients)))
+            allergens = np.zeros((0, len(matrix.allergens)), dtype=bool)
+            unprofiled = np.zeros(0, dtype=bool)
+
+        rollups: dict[str, RecipeNutrition] = {}
+        row_of = {recipe_id: row for row, recipe_id in enumerate(with_lines)}
+        bounds = dict(zip(with_lines, [*offsets[1:].tolist(), len(columns)]))
+        for recipe_id in order:
+            row = row_of.get(recipe_id)
+            if row is None:
+                rollups[recipe_id] = RecipeNutrition(recipe_id, dict.fromkeys(matrix.nutrients, 0.0), [])
+                continue
+            start, end = starts[recipe_id], bounds[recipe_id]
+            rollups[recipe_id] = RecipeNutrition(
+                recipe_id=recipe_id,
+                nutrients=dict(zip(matrix.nutrients, totals[row].tolist())),
+                allergens=[name for name, flagged in zip(matrix.allergens, allergens[row]) if flagged],
+                unprofiled_ingredients=sorted(
+                    {ingredient_ids[line] for line in np.flatnonzero(unprofiled[start:end]) + start}
+                ),
+            )
+        return rollups
+
+    async def _load_lines(
+        self, recipe_ids: Sequence[str] | None
+    ) -> tuple[list[str], dict[str, int | None], list[str], list[float]]:
+        """Return recipe ids, each recipe's first line (None without lines), and the lines."""
+        stmt = (
+            select(
+                Recipe.id, RecipeIngredient.ingredient_id, RecipeIngredient.quantity, RecipeIngredient.unit
+            )
+            .outerjoin(RecipeIngredient, RecipeIngredient.recipe_id == Recipe.id)
+            .order_by(Recipe.id)
+        )
+        if recipe_ids is None:
+            statements = [stmt]
+        else:
+            # Chunks are in id order, so lines still arrive grouped by recipe across statements.
+            ordered = sorted(set(recipe_ids))
+            statements = [
+                stmt.where(Recipe.id.in_(ordered[offset : offset + _LOOKUP_CHUNK]))
+                for offset in range(0, len(ordered), _LOOKUP_CHUNK)
+            ]
+        order: list[str] = []
+        starts: dict[str, int | None] = {}
+        ingredient_ids: list[str] = []
+        quantities: list[float] = []
+        factors: dict[str, float] = {}
+        for chunk in statements:
+            for recipe_id, ingredient_id, quantity, unit in await self.db.execute(chunk):
+                if recipe_id not in starts:
+                    order.append(recipe_id)
+                    starts[recipe_id] = None
+                if ingredient_id is None:
+                    continue
+                if starts[recipe_id] is None:
+                    starts[recipe_id] = len(ingredient_ids)
+                factor = factors.get(unit)
+                if factor is None:
+                    factor = factors[unit] = to_base_quantity(1.0, unit)[0]
+                ingredient_ids.append(ingredient_id)
+                quantities.append(float(quantity) * factor)
+        return order, starts, ingredient_ids, quantities
+
+    async def _matrix(self, refresh: bool = False) -> NutrientMatrix:
+        global _matrix
+        if self.cache is None:
+            return await self._build_matrix()
+        (version,) = await self.cache.versions((MATRIX_TABLE,))
+        cached = _matrix
+        if not refresh and cached is not None and cached[0] == version:
+            return cached[1]
+        matrix = await self._build_matrix()
+        _matrix = (version, matrix)
+        return matrix
+
+    async def _build_matrix(self) -> NutrientMatrix:
+        result = await self.db.execute(
+            select(Ingredient.id, Ingredient.nutritional_profile, Ingredient.allergen_flags)
+        )
+        return NutrientMatrix.from_rows(result.tuples())
+
+
+def reset_nutrient_matrix() -> None:
+    global _matrix
+    _matrix = None
+
+
+def _numeric(profile: Any) -> dict[str, float]:
+    if not isinstance(profile, dict):
+        return {}
+    return {
+        name: float(value)
+        for name, value in profile.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    }
+
+
+def _flagged(allergen_flags: Any) -> list[str]:
+    if not isinstance(allergen_flags, dict):
+        return []
+    return [name for name, flagged in allergen_flags.items() if flagged]
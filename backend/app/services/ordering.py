@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import math
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timezone
+from typing import Iterable, Sequence
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import timed
+from app.models import Order, OrderItem, Recipe, RecipeIngredient
+from app.services.costing import RecipeNotFoundError
+from app.services.price_book import LOW_CONFIDENCE_THRESHOLD, PriceBook, PriceBookOffer
+from app.utils.units import to_base_quantity
+
+DRAFT_STATUS = "draft"
+_LOOKUP_CHUNK = 500
+# Ceil after rounding so float noise such as 3.0000000001 cases does not order a whole extra case.
+_QUANTITY_PRECISION = 6
+
+
+@dataclass(frozen=True)
+class ProductionLine:
+    """``portions`` of a recipe to produce on ``date``; recipe quantities are per portion."""
+
+    recipe_id: str
+    portions: float
+    date: date
+    kitchen: str | None = None
+
+
+@dataclass
+class UnresolvedRequirement:
+    ingredient_id: str
+    quantity: float
+    unit: str
+    date: date
+    kitchen: str | None
+    reason: str
+
+
+@dataclass
+class DraftOrderLine:
+    product_id: str
+    quantity: int
+    unit: str
+    price_each: float
+    # Base-unit amount the recipes need; ``quantity`` is that rounded up to whole product units.
+    required_quantity: float
+    required_unit: str
+    ingredient_ids: list[str] = field(default_factory=list)
+
+    @property
+    def line_total(self) -> float:
+        return self.quantity * self.price_each
+
+
+@dataclass
+class DraftOrder:
+    supplier_id: str
+    scheduled_date: date
+    kitchen: str | None
+    lines: list[DraftOrderLine]
+    id: str | None = None
+
+    @property
+    def total(self) -> float:
+        return sum(line.line_total for line in self.lines)
+
+
+@dataclass
+class OrderPlan:
+    orders: list[DraftOrder]
+    unresolved: list[UnresolvedRequirement]
+
+    @property
+    def total(self) -> float:
+        return sum(order.total for order in self.orders)
+
+
+class OrderingService:
+    """Turns a production plan into draft supplier orders priced from the price book.
+
+    Planning runs two statements however large the plan is (more only past 500 distinct recipes
+    or ingredients): one for the recipe lines and one for the ingredients' offers.
+    """
+
+    def __init__(self, db: AsyncSession, min_confidence: float = LOW_CONFIDENCE_THRESHOLD) -> None:
+        self.db = db
+        self.min_confidence = min_confidence
+
+    @timed
+    async def plan(self, production: Sequence[ProductionLine]) -> OrderPlan:
+        """Explode ``production`` into requirements and pick the cheapest usable offer for each.
+
+        Requirements are aggregated per kitchen, date and ingredient in base units (lb, gal, ea).
+        An offer is usable when its mapping is at least ``min_confidence`` and its unit converts
+        to the requirement's; among those the one with the lowest cost for the whole requirement
+        wins, so pack rounding is accounted for. Raises ``RecipeNotFoundError`` for unknown recipes.
+        """
+        recipes = await self._load_lines({line.recipe_id for line in production})
+        requirements: dict[tuple[str | None, date, str, str], float] = defaultdict(float)
+        for line in production:
+            for ingredient_id, quantity, unit in recipes[line.recipe_id]:
+                amount, base_unit = to_base_quantity(quantity * line.portions, unit)
+                requirements[(line.kitchen, line.date, ingredient_id, base_unit)] += amount
+
+        offers = await PriceBook(self.db).offers_for({key[2] for key in requirements})
+        chosen: dict[tuple[str | None, date, str, str], DraftOrderLine] = {}
+        unresolved = []
+        for (kitchen, day, ingredient_id, base_unit), amount in requirements.items():
+            offer, reason = self._choose(offers.get(ingredient_id, []), amount, base_unit)
+            if offer is None:
+                unresolved.append(
+                    UnresolvedRequirement(ingredient_id, amount, base_unit, day, kitchen, reason)
+                )
+                continue
+            key = (kitchen, day, offer.supplier_id, offer.product_id)
+            line = chosen.get(key)
+            if line is None:
+                chosen[key] = line = DraftOrderLine(
+                    product_id=offer.product_id,
+                    quantity=0,
+                    unit=offer.unit,
+                    price_each=offer.price,
+                    required_quantity=0.0,
+                    required_unit=base_unit,
+                )
+            line.required_quantity += amount
+            line.ingredient_ids.append(ingredient_id)
+            per_unit = to_base_quantity(1.0, offer.unit, offer.package_size)[0]
+            line.quantity = _whole_units(line.required_quantity, per_unit)
+
+        orders: dict[tuple[str | None, date, str], DraftOrder] = {}
+        for (kitchen, day, supplier_id, _), line in sorted(chosen.items(), key=_order_key):
+            order = orders.get((kitchen, day, supplier_id))
+            if order is None:
+                orders[(kitchen, day, supplier_id)] = order = DraftOrder(supplier_id, day, kitchen, [])
+            order.lines.append(line)
+        return OrderPlan(orders=list(orders.values()), unresolved=unresolved)
+
+    @timed
+    async def create_drafts(self, plan: OrderPlan) -> list[DraftOrder]:
+        """Write ``plan``'s orders as draft ``Order``/``OrderItem`` rows and assign their ids. Commits."""
+        if not plan.orders:
+            return []
+        order_rows, item_rows = [], []
+        for order in plan.orders:
+            order.id = str(uuid.uuid4())
+            order_rows.append(
+                {
+                    "id": order.id,
+                    "supplier_id": order.supplier_id,
+                    "status": DRAFT_STATUS,
+                    "scheduled_date": datetime.combine(order.scheduled_date, time(), tzinfo=timezone.utc),
+                    "metadata": {"source": "production_plan", "kitchen": order.kitchen},
+                }
+            )
+            item_rows.extend(
+                {
+                    "id": str(uuid.uuid4()),
+                    "order_id": order.id,
+                    "product_id": line.product_id,
+                    "quantity": line.quantity,
+                    "unit": line.unit,
+                    "price_each": line.price_each,
+                }
+                for line in order.lines
+            )
+        await self.db.execute(insert(Order.__table__), order_rows)
+        await self.db.execute(insert(OrderItem.__table__), item_rows)
+        await self.db.commit()
+        return plan.orders
+
+    async def _load_lines(self, recipe_ids: Iterable[str]) -> dict[str, list[tuple[str, float, str]]]:
+        ordered = sorted(recipe_ids)
+        recipes: dict[str, list[tuple[str, float, str]]] = {}
+        for offset in range(0, len(ordered), _LOOKUP_CHUNK):
+            chunk = ordered[offset : offset + _LOOKUP_CHUNK]
+            result = await self.db.execute(
+                select(
+                    Recipe.id,
+                    RecipeIngredient.ingredient_id,
+                    RecipeIngredient.quantity,
+                    RecipeIngredient.unit,
+                )
+                .outerjoin(RecipeIngredient, RecipeIngredient.recipe_id == Recipe.id)
+                .where(Recipe.id.in_(chunk))
+            )
+            for recipe_id, ingredient_id, quantity, unit in result:
+                lines = recipes.setdefault(recipe_id, [])
+                if ingredient_id is not None:
+                    lines.append((ingredient_id, float(quantity), unit))
+        missing = [recipe_id for recipe_id in ordered if recipe_id not in recipes]
+        if missing:
+            raise RecipeNotFoundError(missing)
+        return recipes
+
+    def _choose(
+        self, offers: list[PriceBookOffer], amount: float, base_unit: str
+    ) -> tuple[PriceBookOffer | None, str]:
+        if not offers:
+            return None, "no mapped product"
+        confident = [offer for offer in offers if offer.confidence_score >= self.min_confidence]
+        if not confident:
+            return None, "only low-confidence mappings"
+        best, best_cost = None, math.inf
+        # Offers arrive in price book order, so ties keep the better-ranked offer.
+        for offer in confident:
+            per_unit, unit = to_base_quantity(1.0, offer.unit, offer.package_size)
+            if unit != base_unit:
+                continue
+            cost = _whole_units(amount, per_unit) * offer.price
+            if cost < best_cost:
+                best, best_cost = offer, cost
+        if best is None:
+            return None, f"no product sold in a unit convertible to {base_unit}"
+        return best, ""
+
+
+def _whole_units(amount: float, per_unit: float) -> int:
+    return math.ceil(round(amount / per_unit, _QUANTITY_PRECISION))
+
+
+def _order_key(item: tuple[tuple[str | None, date, str, str], DraftOrderLine]) -> tuple[str, date, str, str]:
+    (kitchen, day, supplier_id, product_id), _ = item
+    return kitchen or "", day, supplier_id, product_id
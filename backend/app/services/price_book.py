@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterable, Mapping, Sequence
+
+from sqlalchemy import Insert, Select, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import invalidate_tables
+from app.db.upsert import dialect_insert
+from app.models import PriceBookEntry, Product, ProductIngredientMapping
+from app.utils.units import normalize_unit_price
+
+_LOOKUP_CHUNK = 500
+_REBUILD_FLUSH = 5000
+# Mappings scored below this are likely wrong matches; their offers rank after every confident one.
+LOW_CONFIDENCE_THRESHOLD = 0.6
+
+
+@dataclass
+class PriceBookOffer:
+    ingredient_id: str
+    product_id: str
+    supplier_id: str
+    rank: int
+    price: float
+    currency: str
+    unit: str
+    package_size: str | None
+    unit_price: float
+    base_unit: str
+    confidence_score: float
+    updated_at: datetime
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> PriceBookOffer:
+        updated_at = row["updated_at"]
+        return cls(
+            ingredient_id=row["ingredient_id"],
+            product_id=row["product_id"],
+            supplier_id=row["supplier_id"],
+            rank=row["rank"],
+            price=float(row["price"]),
+            currency=row["currency"],
+            unit=row["unit"],
+            package_size=row["package_size"],
+            unit_price=float(row["unit_price"]),
+            base_unit=row["base_unit"],
+            confidence_score=float(row["confidence_score"]),
+            # SQLite hands back naive datetimes; every value written here is UTC.
+            updated_at=updated_at.replace(tzinfo=updated_at.tzinfo or timezone.utc),
+        )
+
+
+def rank_offers(offers: Iterable[Mapping[str, Any]], updated_at: datetime) -> list[dict[str, Any]]:
+    """Turn mapped product rows into ranked price book rows, grouped per ingredient and base unit.
+
+    Each input row carries the mapping's ``ingredient_id`` and ``confidence_score`` plus the
+    product's ``product_id``, ``supplier_id``, ``price``, ``currency``, ``unit`` and ``package_size``.
+    Only offers whose unit converts to the same base unit (lb, gal or ea) are comparable, so each
+    ingredient has one ranking per base unit: confident mappings (``LOW_CONFIDENCE_THRESHOLD`` and
+    up) first, each group by lowest unit price, ties broken by product id. A product mapped to the
+    same ingredient twice keeps its most confident mapping.
+    """
+    grouped: dict[str, dict[str, Mapping[str, Any]]] = defaultdict(dict)
+    for offer in offers:
+        by_product = grouped[offer["ingredient_id"]]
+        seen = by_product.get(offer["product_id"])
+        if seen is None or float(offer["confidence_score"]) > float(seen["confidence_score"]):
+            by_product[offer["product_id"]] = offer
+    rows = []
+    for by_product in grouped.values():
+        by_unit: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for offer in by_product.values():
+            price = float(offer["price"])
+            unit_price, base_unit = normalize_unit_price(price, offer["unit"], offer["package_size"])
+            by_unit[base_unit].append(
+                {
+                    "ingredient_id": offer["ingredient_id"],
+                    "product_id": offer["product_id"],
+                    "supplier_id": offer["supplier_id"],
+                    "price": price,
+                    "currency": offer["currency"],
+                    "unit": offer["unit"],
+                    "package_size": offer["package_size"],
+                    "unit_price": round(unit_price, 6),
+                    "base_unit": base_unit,
+                    "confidence_score": float(offer["confidence_score"]),
+                    "updated_at": updated_at,
+                }
+            )
+        for comparable in by_unit.values():
+            comparable.sort(
+                key=lambda row: (
+                    row["confidence_score"] < LOW_CONFIDENCE_THRESHOLD,
+                    row["unit_price"],
+                    row["product_id"],
+                )
+            )
+            rows.extend({**row, "rank": rank} for rank, row in enumerate(comparable, start=1))
+    return rows
+
+
+def _mapped_offers() -> Select:
+    return select(
+        ProductIngredientMapping.ingredient_id,
+        ProductIngredientMapping.confidence_score,
+        Product.id.label("product_id"),
+        Product.supplier_id,
+        Product.price,
+        Product.currency,
+        Product.unit,
+        Product.package_size,
+    ).join(Product, Product.id == ProductIngredientMapping.product_id)
+
+
+class PriceBook:
+    """Ranked supplier offers per ingredient, kept current as prices and mappings change.
+
+    Write paths call ``refresh_for_products`` or ``refresh_for_ingredients`` inside their own
+    transaction, before ``RecipeCostCache`` since costing reads the book; neither method commits.
+    ``rebuild`` recomputes every entry from the mappings for backfills.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def best_offers(
+        self, ingredient_ids: Iterable[str] | Select
+    ) -> dict[str, dict[str, PriceBookOffer]]:
+        """Return the rank-1 offer per base unit for each of ``ingredient_ids`` that has one."""
+        stmt = select(PriceBookEntry.__table__).where(PriceBookEntry.rank == 1)
+        best: dict[str, dict[str, PriceBookOffer]] = defaultdict(dict)
+        if isinstance(ingredient_ids, Select):
+            chunks: list[list[str] | Select] = [ingredient_ids]
+        else:
+            ordered = list(dict.fromkeys(ingredient_ids))
+            step = _LOOKUP_CHUNK
+            chunks = [ordered[offset : offset + step] for offset in range(0, len(ordered), step)]
+        for chunk in chunks:
+            result = await self.db.execute(stmt.where(PriceBookEntry.ingredient_id.in_(chunk)))
+            for row in result.mappings():
+                best[row["ingredient_id"]][row["base_unit"]] = PriceBookOffer.from_row(row)
+        return dict(best)
+
+    async def offers_for(self, ingredient_ids: Iterable[str]) -> dict[str, list[PriceBookOffer]]:
+        """Return every offer for each of ``ingredient_ids`` that has any, best first per base unit."""
+        offers: dict[str, list[PriceBookOffer]] = defaultdict(list)
+        ordered = list(dict.fromkeys(ingredient_ids))
+        for offset in range(0, len(ordered), _LOOKUP_CHUNK):
+            chunk = ordered[offset : offset + _LOOKUP_CHUNK]
+            result = await self.db.execute(
+                select(PriceBookEntry.__table__)
+                .where(PriceBookEntry.ingredient_id.in_(chunk))
+                .order_by(PriceBookEntry.ingredient_id, PriceBookEntry.base_unit, PriceBookEntry.rank)
+            )
+            for row in result.mappings():
+                offers[row["ingredient_id"]].append(PriceBookOffer.from_row(row))
+        return dict(offers)
+
+    async def offers(self, ingredient_id: str) -> list[PriceBookOffer]:
+        """Return every offer for ``ingredient_id``, best first per base unit."""
+        result = await self.db.execute(
+            select(PriceBookEntry.__table__)
+            .where(PriceBookEntry.ingredient_id == ingredient_id)
+            .order_by(PriceBookEntry.base_unit, PriceBookEntry.rank)
+        )
+        return [PriceBookOffer.from_row(row) for row in result.mappings()]
+
+    async def refresh_for_products(self, product_ids: Iterable[str]) -> list[str]:
+        """Re-rank the ingredients mapped to any of ``product_ids``; return their ids."""
+        product_ids = list(dict.fromkeys(product_ids))
+        ingredient_ids: set[str] = set()
+        for offset in range(0, len(product_ids), _LOOKUP_CHUNK):
+            chunk = product_ids[offset : offset + _LOOKUP_CHUNK]
+            result = await self.db.execute(
+                select(ProductIngredientMapping.ingredient_id)
+                .where(ProductIngredientMapping.product_id.in_(chunk))
+                .distinct()
+            )
+            ingredient_ids.update(result.scalars())
+        return await self.refresh_for_ingredients(ingredient_ids)
+
+    async def refresh_for_ingredients(self, ingredient_ids: Iterable[str]) -> list[str]:
+        """Recompute every offer of ``ingredient_ids`` from the current mappings and prices."""
+        ingredient_ids = sorted(set(ingredient_ids))
+        updated_at = datetime.now(timezone.utc)
+        for offset in range(0, len(ingredient_ids), _LOOKUP_CHUNK):
+            chunk = ingredient_ids[offset : offset + _LOOKUP_CHUNK]
+            result = await self.db.execute(
+                _mapped_offers().where(ProductIngredientMapping.ingredient_id.in_(chunk))
+            )
+            await self._write(rank_offers(result.mappings(), updated_at))
+            # Offers whose mapping is gone are the ones this refresh did not rewrite.
+            await self.db.execute(
+                delete(PriceBookEntry).where(
+                    PriceBookEntry.ingredient_id.in_(chunk), PriceBookEntry.updated_at != updated_at
+                )
+            )
+        return ingredient_ids
+
+    async def rebuild(self) -> int:
+        """Recompute the whole book, streaming mappings in ingredient order. Commits."""
+        await self.db.execute(delete(PriceBookEntry))
+        updated_at = datetime.now(timezone.utc)
+        written = 0
+        pending: list[Mapping[str, Any]] = []
+        current_ingredient = None
+        stmt = _mapped_offers().order_by(ProductIngredientMapping.ingredient_id)
+        stream = await self.db.stream(stmt.execution_options(yield_per=_REBUILD_FLUSH))
+        async for offer in stream.mappings():
+            # Rows arrive grouped by ingredient, so an ingredient change means its offers are complete.
+            if offer["ingredient_id"] != current_ingredient and len(pending) >= _REBUILD_FLUSH:
+                written += await self._write(rank_offers(pending, updated_at))
+                pending = []
+            current_ingredient = offer["ingredient_id"]
+            pending.append(offer)
+        written += await self._write(rank_offers(pending, updated_at))
+        await self.db.commit()
+        await invalidate_tables("price_book_entries")
+        return written
+
+    async def _write(self, rows: Sequence[dict[str, Any]]) -> int:
+        if rows:
+            await self.db.execute(self._upsert(), rows)
+        return len(rows)
+
+    def _upsert(self) -> Insert:
+        # Concurrent refreshes of one ingredient overwrite each other's rows instead of colliding.
+        stmt = dialect_insert(self.db, PriceBookEntry.__table__)
+        keys = {"ingredient_id", "product_id"}
+        return stmt.on_conflict_do_update(
+            index_elements=[PriceBookEntry.ingredient_id, PriceBookEntry.product_id],
+            set_={column.name: column for column in stmt.excluded if column.name not in keys},
+        )
+
+
+async def _rebuild_all() -> None:
+    from app.db.session import async_session_factory, engine
+
+    async with async_session_factory() as session:
+        written = await PriceBook(session).rebuild()
+    await engine.dispose()
+    print(f"Rebuilt {written} price book entries")
+
+
+if __name__ == "__main__":
+    asyncio.run(_rebuild_all())
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Mapping, Sequence
+
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import invalidate_tables
+from app.db.upsert import dialect_insert
+from app.models import PriceHistory, PriceRollup
+
+GRANULARITIES = ("day", "week")
+_REBUILD_FLUSH = 5000
+
+
+def bucket_start(recorded_at: datetime, granularity: str) -> datetime:
+    """Return the UTC start of the day or ISO week (Monday) containing ``recorded_at``."""
+    day = as_utc(recorded_at).replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    raise ValueError(f"Unsupported rollup granularity: {granularity}")
+
+
+def as_utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes; everything this app stores is UTC.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+@dataclass
+class _Bucket:
+    product_id: str
+    granularity: str
+    bucket_start: datetime
+    supplier_id: str | None
+    open_price: float
+    high_price: float
+    low_price: float
+    close_price: float
+    price_sum: float
+    observations: int
+    first_recorded_at: datetime
+    last_recorded_at: datetime
+
+    @classmethod
+    def start(
+        cls, product_id: str, supplier_id: str | None, granularity: str, price: float, at: datetime
+    ) -> _Bucket:
+        return cls(
+            product_id=product_id,
+            granularity=granularity,
+            bucket_start=bucket_start(at, granularity),
+            supplier_id=supplier_id,
+            open_price=price,
+            high_price=price,
+            low_price=price,
+            close_price=price,
+            price_sum=price,
+            observations=1,
+            first_recorded_at=at,
+            last_recorded_at=at,
+        )
+
+    def add(self, price: float, at: datetime) -> None:
+        self.high_price = max(self.high_price, price)
+        self.low_price = min(self.low_price, price)
+        self.price_sum += price
+        self.observations += 1
+        if at < self.first_recorded_at:
+            self.open_price, self.first_recorded_at = price, at
+        if at >= self.last_recorded_at:
+            self.close_price, self.last_recorded_at = price, at
+
+    def as_row(self) -> dict[str, Any]:
+        return {
+            "product_id": self.product_id,
+            "granularity": self.granularity,
+            "bucket_start": self.bucket_start,
+            "supplier_id": self.supplier_id,
+            "open_price": self.open_price,
+            "high_price": self.high_price,
+            "low_price": self.low_price,
+            "close_price": self.close_price,
+            "price_sum": self.price_sum,
+            "observations": self.observations,
+            "first_recorded_at": self.first_recorded_at,
+            "last_recorded_at": self.last_recorded_at,
+        }
+
+
+class PriceRollupService:
+    """Maintains daily and weekly OHLC buckets of ``PriceHistory`` per product.
+
+    ``record`` folds freshly written history rows into their buckets inside the caller's
+    transaction with one upsert, so concurrent writers merge into a bucket rather than overwrite
+    each other; ``rebuild`` recomputes everything from raw history for backfills.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def record(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Fold price history rows (``product_id``, ``supplier_id``, ``price``, ``recorded_at``) in."""
+        if not rows:
+            return
+        buckets: dict[tuple[str, str, datetime], _Bucket] = {}
+        for row in rows:
+            at = as_utc(row["recorded_at"])
+            price = float(row["price"])
+            for granularity in GRANULARITIES:
+                key = (row["product_id"], granularity, bucket_start(at, granularity))
+                bucket = buckets.get(key)
+                if bucket is None:
+                    buckets[key] = _Bucket.start(
+                        row["product_id"], row.get("supplier_id"), granularity, price, at
+                    )
+                else:
+                    bucket.add(price, at)
+        await self._write(buckets.values())
+
+    async def rebuild(self, product_ids: Sequence[str] | None = None) -> int:
+        """Recompute buckets from raw history, streaming it in product/time order. Commits."""
+        clear = delete(PriceRollup)
+        stmt = select(
+            PriceHistory.product_id, PriceHistory.supplier_id, PriceHistory.price, PriceHistory.recorded_at
+        ).order_by(PriceHistory.product_id, PriceHistory.recorded_at)
+        if product_ids is not None:
+            clear = clear.where(PriceRollup.product_id.in_(product_ids))
+            stmt = stmt.where(PriceHistory.product_id.in_(product_ids))
+        await self.db.execute(clear)
+        written = 0
+        pending: dict[tuple[str, str, datetime], _Bucket] = {}
+        current_product = None
+        stream = await self.db.stream(stmt.execution_options(yield_per=_REBUILD_FLUSH))
+        async for product_id, supplier_id, price, recorded_at in stream:
+            # Rows arrive grouped by product, so a product change means its buckets are final.
+            if product_id != current_product and len(pending) >= _REBUILD_FLUSH:
+                await self._write(pending.values())
+                written += len(pending)
+                pending = {}
+            current_product = product_id
+            at = as_utc(recorded_at)
+            for granularity in GRANULARITIES:
+                key = (product_id, granularity, bucket_start(at, granularity))
+                if key in pending:
+                    pending[key].add(float(price), at)
+                else:
+                    pending[key] = _Bucket.start(product_id, supplier_id, granularity, float(price), at)
+        await self._write(pending.values())
+        written += len(pending)
+        await self.db.commit()
+        await invalidate_tables("price_rollups")
+        return written
+
+    async def _write(self, buckets: Iterable[_Bucket]) -> None:
+        rows = [bucket.as_row() for bucket in buckets]
+        if not rows:
+            return
+        table = PriceRollup.__table__
+        stmt = dialect_insert(self.db, table)
+        new = stmt.excluded
+        # SQLite spells GREATEST/LEAST as its multi-argument scalar MAX/MIN.
+        if self.db.get_bind().dialect.name == "postgresql":
+            greatest, least = func.greatest, func.least
+        else:
+            greatest, least = func.max, func.min
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.product_id, table.c.granularity, table.c.bucket_start],
+            set_={
+                "supplier_id": func.coalesce(table.c.supplier_id, new.supplier_id),
+                "open_price": case(
+                    (new.first_recorded_at < table.c.first_recorded_at, new.open_price),
+                    else_=table.c.open_price,
+                ),
+                "high_price": greatest(table.c.high_price, new.high_price),
+                "low_price": least(table.c.low_price, new.low_price),
+                "close_price": case(
+                    (new.last_recorded_at >= table.c.last_recorded_at, new.close_price),
+                    else_=table.c.close_price,
+                ),
+                "price_sum": table.c.price_sum + new.price_sum,
+                "observations": table.c.observations + new.observations,
+                "first_recorded_at": least(table.c.first_recorded_at, new.first_recorded_at),
+                "last_recorded_at": greatest(table.c.last_recorded_at, new.last_recorded_at),
+            },
+        )
+        await self.db.execute(stmt, rows)
+
+async def _rebuild_all() -> None:
+    from app.db.session import async_session_factory, engine
+
+    async with async_session_factory() as session:
+        written = await PriceRollupService(session).rebuild()
+    await engine.dispose()
+    print(f"Rebuilt {written} price rollup buckets")
+
+
+if __name__ == "__main__":
+    asyncio.run(_rebuild_all())
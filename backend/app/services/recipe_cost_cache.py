@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Sequence
+
+from sqlalchemy import Insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.upsert import dialect_insert
+from app.models import ProductIngredientMapping, RecipeCost, RecipeIngredient
+from app.services.costing import CostingService, RecipeCostBreakdown
+
+_LOOKUP_CHUNK = 500
+
+
+@dataclass
+class CachedRecipeCost:
+    recipe_id: str
+    total_cost: float
+    ingredient_costs: dict[str, float]
+    unpriced_ingredients: list[str]
+    computed_at: datetime
+
+    @property
+    def age_seconds(self) -> float:
+        return max((datetime.now(timezone.utc) - self.computed_at).total_seconds(), 0.0)
+
+
+class RecipeCostCache:
+    """Persisted recipe costs, recomputed only for recipes whose prices or mappings changed.
+
+    Write paths call ``refresh_for_products`` or ``refresh_for_ingredients`` inside their own
+    transaction; the cache never commits on their behalf.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+        self.costing = CostingService(db)
+
+    async def get(self, recipe_id: str) -> CachedRecipeCost:
+        """Read a cached cost, computing and storing it on first access.
+
+        Raises ``RecipeNotFoundError`` for unknown recipes.
+        """
+        result = await self.db.execute(
+            select(
+                RecipeCost.recipe_id,
+                RecipeCost.total_cost,
+                RecipeCost.ingredient_costs,
+                RecipeCost.unpriced_ingredients,
+                RecipeCost.computed_at,
+            ).where(RecipeCost.recipe_id == recipe_id)
+        )
+        row = result.one_or_none()
+        if row is not None:
+            return CachedRecipeCost(
+                recipe_id=row.recipe_id,
+                total_cost=float(row.total_cost),
+                ingredient_costs=row.ingredient_costs,
+                unpriced_ingredients=row.unpriced_ingredients,
+                # SQLite hands back naive datetimes; every value written here is UTC.
+                computed_at=row.computed_at.replace(tzinfo=row.computed_at.tzinfo or timezone.utc),
+            )
+        cached = await self.refresh([recipe_id])
+        return cached[recipe_id]
+
+    async def refresh(self, recipe_ids: Sequence[str]) -> dict[str, CachedRecipeCost]:
+        recipe_ids = list(dict.fromkeys(recipe_ids))
+        if not recipe_ids:
+            return {}
+        breakdowns: dict[str, RecipeCostBreakdown] = {}
+        for offset in range(0, len(recipe_ids), _LOOKUP_CHUNK):
+            breakdowns.update(await self.costing.recipe_costs(recipe_ids[offset : offset + _LOOKUP_CHUNK]))
+        computed_at = datetime.now(timezone.utc)
+        # Upsert so concurrent refreshes of one recipe overwrite each other instead of colliding.
+        await self.db.execute(
+            self._upsert(),
+            [
+                {
+                    "recipe_id": recipe_id,
+                    "total_cost": breakdown.total_cost,
+                    "ingredient_costs": breakdown.ingredient_costs,
+                    "unpriced_ingredients": breakdown.unpriced_ingredients,
+                    "computed_at": computed_at,
+                }
+                for recipe_id, breakdown in breakdowns.items()
+            ],
+        )
+        return {
+            recipe_id: CachedRecipeCost(
+                recipe_id=recipe_id,
+                total_cost=breakdown.total_cost,
+                ingredient_costs=breakdown.ingredient_costs,
+                unpriced_ingredients=breakdown.unpriced_ingredients,
+                computed_at=computed_at,
+            )
+            for recipe_id, breakdown in breakdowns.items()
+        }
+
+    def _upsert(self) -> Insert:
+        stmt = dialect_insert(self.db, RecipeCost.__table__)
+        return stmt.on_conflict_do_update(
+            index_elements=[RecipeCost.recipe_id],
+            set_={
+                "total_cost": stmt.excluded.total_cost,
+                "ingredient_costs": stmt.excluded.ingredient_costs,
+                "unpriced_ingredients": stmt.excluded.unpriced_ingredients,
+                "computed_at": stmt.excluded.computed_at,
+            },
+        )
+
+    async def refresh_for_products(self, product_ids: Iterable[str]) -> list[str]:
+        """Recompute recipes that use an ingredient mapped to any of ``product_ids``."""
+        product_ids = list(dict.fromkeys(product_ids))
+        ingredient_ids: set[str] = set()
+        for offset in range(0, len(product_ids), _LOOKUP_CHUNK):
+            chunk = product_ids[offset : offset + _LOOKUP_CHUNK]
+            result = await self.db.execute(
+                select(ProductIngredientMapping.ingredient_id)
+                .where(ProductIngredientMapping.product_id.in_(chunk))
+                .distinct()
+            )
+            ingredient_ids.update(result.scalars())
+        return await self._refresh_affected(sorted(ingredient_ids))
+
+    async def refresh_for_ingredients(self, ingredient_ids: Iterable[str]) -> list[str]:
+        """Recompute recipes that use any of ``ingredient_ids``."""
+        return await self._refresh_affected(list(dict.fromkeys(ingredient_ids)))
+
+    async def _refresh_affected(self, ingredient_ids: list[str]) -> list[str]:
+        affected: dict[str, None] = {}
+        for offset in range(0, len(ingredient_ids), _LOOKUP_CHUNK):
+            chunk = ingredient_ids[offset : offset + _LOOKUP_CHUNK]
+            result = await self.db.execute(
+                select(RecipeIngredient.recipe_id).where(RecipeIngredient.ingredient_id.in_(chunk)).distinct()
+            )
+            affected.update(dict.fromkeys(result.scalars()))
+        recipe_ids = list(affected)
+        await self.refresh(recipe_ids)
+        return recipe_ids
+
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from sqlalchemy import func, select
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Sequence
+
+from sqlalchemy import Select, Subquery, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import PriceHistory
+from app.core.cache import TwoTierCache
+from app.core.metrics import timed
+from app.models import PriceHistory, PriceRollup
+from app.services.price_rollups import bucket_start
+
+TREND_WINDOWS = (7, 30, 90, 365)
+# Tables price trends are computed from; writes to any of them must invalidate cached trends.
+TREND_TABLES = ("price_history", "price_rollups")
 
 
 @dataclass
@@ -12,34 +22,129 @@ class PriceTrend:
     product_id: str
     average_price: float
     change_percent: float
+    latest_price: float = 0.0
+    observations: int = 0
 
 
 class ReportingService:
-    def __init__(self, db: AsyncSession) -> None:
+    def __init__(self, db: AsyncSession, cache: TwoTierCache | None = None) -> None:
         self.db = db
+        self.cache = cache
 
-    async def price_trends(self, supplier_id: str | None = None) -> list[PriceTrend]:
-        stmt = select(
-            PriceHistory.product_id,
-            func.avg(PriceHistory.price).label("avg_price"),
-        ).group_by(PriceHistory.product_id)
-        if supplier_id:
-            stmt = stmt.where(PriceHistory.supplier_id == supplier_id)
+    @timed
+    async def price_trends(
+        self,
+        supplier_id: str | None = None,
+        window_days: int | None = None,
+        product_ids: Sequence[str] | None = None,
+        aligned: bool = False,
+    ) -> list[PriceTrend]:
+        """Compare each product's latest price with its average over the window.
+
+        Runs as one statement: window functions compute the per-product price total, observation
+        count and latest price in a single pass. With ``aligned`` the window start is snapped
+        back to a day (or, from 90 days, a week) boundary so the answer comes from
+        ``price_rollups`` instead of raw history; the result is identical for that window.
+        With a ``cache`` the result is reused until one of ``TREND_TABLES`` is invalidated or
+        the cache TTL passes, so the window's start may lag by up to that TTL.
+        """
+        if self.cache is None:
+            return await self._compute(supplier_id, window_days, product_ids, aligned)
+        key = [supplier_id, window_days, sorted(set(product_ids)) if product_ids else None, aligned]
+        return await self.cache.get_or_compute(
+            "price_trends",
+            TREND_TABLES,
+            key,
+            lambda: self._compute(supplier_id, window_days, product_ids, aligned),
+            lambda trends: [asdict(trend) for trend in trends],
+            lambda data: [PriceTrend(**trend) for trend in data],
+        )
+
+    async def _compute(
+        self,
+        supplier_id: str | None,
+        window_days: int | None,
+        product_ids: Sequence[str] | None,
+        aligned: bool,
+    ) -> list[PriceTrend]:
+        since = None
+        granularity = None
+        if window_days:
+            since = datetime.now(timezone.utc) - timedelta(days=window_days)
+            if aligned:
+                granularity = "week" if window_days >= 90 else "day"
+                since = bucket_start(since, granularity)
+        if granularity:
+            stmt = self._rollup_trends(granularity, since, supplier_id, product_ids)
+        else:
+            stmt = self._history_trends(since, supplier_id, product_ids)
         result = await self.db.execute(stmt)
         trends: list[PriceTrend] = []
-        for product_id, avg_price in result:
-            latest_price = await self._latest_price(product_id)
-            if latest_price is None:
-                continue
+        for product_id, latest_price, price_total, observations in result:
+            latest_price = float(latest_price)
+            avg_price = float(price_total) / observations
             change = ((latest_price - avg_price) / avg_price) * 100 if avg_price else 0.0
-            trends.append(PriceTrend(product_id=product_id, average_price=float(avg_price), change_percent=change))
+            trends.append(
+                PriceTrend(
+                    product_id=product_id,
+                    average_price=avg_price,
+                    change_percent=change,
+                    latest_price=latest_price,
+                    observations=observations,
+                )
+            )
         return trends
 
-    async def _latest_price(self, product_id: str) -> float | None:
-        result = await self.db.execute(
-            select(PriceHistory.price)
-            .where(PriceHistory.product_id == product_id)
-            .order_by(PriceHistory.recorded_at.desc())
+    def _history_trends(
+        self, since: datetime | None, supplier_id: str | None, product_ids: Sequence[str] | None
+    ) -> Select:
+        ranked = select(
+            PriceHistory.product_id,
+            PriceHistory.price,
+            func.sum(PriceHistory.price).over(partition_by=PriceHistory.product_id).label("price_total"),
+            func.count().over(partition_by=PriceHistory.product_id).label("observations"),
+            func.row_number()
+            .over(
+                partition_by=PriceHistory.product_id,
+                order_by=(PriceHistory.recorded_at.desc(), PriceHistory.id.desc()),
+            )
+            .label("recency"),
         )
-        price = result.scalar_one_or_none()
-        return float(price) if price is not None else None
+        if supplier_id:
+            ranked = ranked.where(PriceHistory.supplier_id == supplier_id)
+        if product_ids:
+            ranked = ranked.where(PriceHistory.product_id.in_(product_ids))
+        if since is not None:
+            ranked = ranked.where(PriceHistory.recorded_at >= since)
+        return _latest_per_product(ranked.subquery())
+
+    def _rollup_trends(
+        self,
+        granularity: str,
+        since: datetime,
+        supplier_id: str | None,
+        product_ids: Sequence[str] | None,
+    ) -> Select:
+        partition = PriceRollup.product_id
+        ranked = select(
+            PriceRollup.product_id,
+            PriceRollup.close_price.label("price"),
+            func.sum(PriceRollup.price_sum).over(partition_by=partition).label("price_total"),
+            func.sum(PriceRollup.observations).over(partition_by=partition).label("observations"),
+            func.row_number()
+            .over(partition_by=partition, order_by=PriceRollup.bucket_start.desc())
+            .label("recency"),
+        ).where(PriceRollup.granularity == granularity, PriceRollup.bucket_start >= since)
+        if supplier_id:
+            ranked = ranked.where(PriceRollup.supplier_id == supplier_id)
+        if product_ids:
+            ranked = ranked.where(PriceRollup.product_id.in_(product_ids))
+        return _latest_per_product(ranked.subquery())
+
+
+def _latest_per_product(ranked: Subquery) -> Select:
+    return (
+        select(ranked.c.product_id, ranked.c.price, ranked.c.price_total, ranked.c.observations)
+        .where(ranked.c.recency == 1)
+        .order_by(ranked.c.product_id)
+    )
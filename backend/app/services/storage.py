@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Protocol
+
+from app.core.config import get_settings
+
+
+class CatalogStorage(Protocol):
+    def save(self, key: str, source: BinaryIO) -> None: ...
+
+    def open(self, key: str) -> BinaryIO: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class LocalCatalogStorage:
+    """Filesystem stand-in for object storage, used when no S3 bucket is configured."""
+
+    def __init__(self, root: str) -> None:
+        self.root = Path(root)
+
+    def save(self, key: str, source: BinaryIO) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as target:
+            shutil.copyfileobj(source, target)
+
+    def open(self, key: str) -> BinaryIO:
+        return self._path(key).open("rb")
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"Invalid storage key '{key}'")
+        return path
+
+
+class S3CatalogStorage:
+    def __init__(self, bucket: str, endpoint_url: str | None = None) -> None:
+        import boto3
+
+        self.bucket = bucket
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    def save(self, key: str, source: BinaryIO) -> None:
+        self.client.upload_fileobj(source, self.bucket, key)
+
+    def open(self, key: str) -> BinaryIO:
+        # Spool to a local temp file so parsers get a seekable stream.
+        target = tempfile.TemporaryFile()
+        self.client.download_fileobj(self.bucket, key, target)
+        target.seek(0)
+        return target
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+
+def get_catalog_storage() -> CatalogStorage:
+    settings = get_settings()
+    if settings.s3_bucket_name:
+        endpoint_url = str(settings.s3_endpoint_url) if settings.s3_endpoint_url else None
+        return S3CatalogStorage(settings.s3_bucket_name, endpoint_url)
+    return LocalCatalogStorage(settings.local_storage_path)
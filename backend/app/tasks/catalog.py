@@ -1,10 +1,28 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from typing import Any, AsyncIterator, Coroutine
 
 from celery import Celery
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
+from app.core.cache import get_cache
 from app.core.config import get_settings
+from app.db.profiles import create_engine_for
+from app.db.session import instrument_engine
+from app.models import IngestionJob
+from app.services.catalog_ingestion import CatalogIngestionService, CatalogMode, IngestionResult
+from app.services.nutrition import CatalogMatchSummary, NutritionMatchingService
+from app.services.storage import get_catalog_storage
 
 settings = get_settings()
 
@@ -13,9 +31,96 @@ celery_app = Celery(
     broker=settings.celery_broker_url,
     backend=settings.celery_result_backend,
 )
+celery_app.conf.task_always_eager = settings.celery_task_always_eager
 
 
 @celery_app.task(name="catalog.process")
-def process_catalog(supplier_id: str, object_key: str) -> None:
+def process_catalog(
+    supplier_id: str, object_key: str, job_id: str | None = None, mode: CatalogMode = "insert"
+) -> None:
     logging.info("Processing catalog", extra={"supplier_id": supplier_id, "object_key": object_key})
-    # Placeholder for actual parsing and persistence logic.
+    run_async(_process_catalog(supplier_id, object_key, job_id, mode))
+
+
+def run_async(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine to completion, even when called from inside a running loop (eager mode)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+@celery_app.task(name="catalog.match_nutrition")
+def match_catalog_nutrition(supplier_id: str | None = None, workers: int | None = None) -> dict[str, Any]:
+    summary = run_async(_match_catalog_nutrition(supplier_id, workers))
+    logging.info("Matched catalog products", extra={"supplier_id": supplier_id, **asdict(summary)})
+    return asdict(summary)
+
+
+@asynccontextmanager
+async def task_session() -> AsyncIterator[AsyncSession]:
+    # Each task run owns its event loop, so it cannot share pooled connections with the API engine.
+    engine = create_engine_for(settings, poolclass=NullPool)
+    instrument_engine(engine)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with session_factory() as session:
+            yield session
+    finally:
+        await engine.dispose()
+        # The loop ends with the task, so close the shared-cache client it opened as well.
+        await get_cache().close()
+
+
+async def _match_catalog_nutrition(supplier_id: str | None, workers: int | None) -> CatalogMatchSummary:
+    async with task_session() as db:
+        return await NutritionMatchingService(db).match_catalog(supplier_id=supplier_id, workers=workers)
+
+
+async def _process_catalog(supplier_id: str, object_key: str, job_id: str | None, mode: CatalogMode) -> None:
+    storage = get_catalog_storage()
+    async with task_session() as db:
+        job = await _get_job(db, job_id)
+        started = time.perf_counter()
+
+        async def on_batch(result: IngestionResult) -> None:
+            if job is None:
+                return
+            job.rows_parsed = result.rows_parsed
+            job.rows_persisted = result.rows_persisted
+            job.rows_per_second = result.rows_persisted / max(time.perf_counter() - started, 1e-9)
+            await db.commit()
+
+        if job is not None:
+            job.status = "running"
+            job.started_at = datetime.now(timezone.utc)
+            await db.commit()
+        service = CatalogIngestionService(db, on_batch=on_batch)
+        try:
+            with storage.open(object_key) as stream:
+                result = await service.ingest_stream(supplier_id, object_key, stream, mode=mode)
+        except Exception as exc:
+            await db.rollback()
+            if job is not None:
+                job.status = "failed"
+                job.error = str(exc)
+                job.finished_at = datetime.now(timezone.utc)
+                await db.commit()
+            raise
+        if job is not None:
+            job.status = "completed"
+            job.rows_parsed = result.rows_parsed
+            job.rows_persisted = result.rows_persisted
+            job.rows_per_second = result.rows_per_second
+            job.finished_at = datetime.now(timezone.utc)
+            await db.commit()
+    storage.delete(object_key)
+
+
+async def _get_job(db: AsyncSession, job_id: str | None) -> IngestionJob | None:
+    if job_id is None:
+        return None
+    result = await db.execute(select(IngestionJob).where(IngestionJob.id == job_id))
+    return result.scalar_one_or_none()
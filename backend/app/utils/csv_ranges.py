@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import csv
+import mmap
+from typing import Iterator
+
+# Quote counting reads the map in windows so a range never has to be copied whole.
+_SCAN_WINDOW = 8 * 1024 * 1024
+
+
+def read_csv_header(buffer: mmap.mmap, offset: int, delimiter: str) -> tuple[list[str], int] | None:
+    """Parse the header record at ``offset``; return it with the offset of the first data record."""
+    buffer.seek(offset)
+
+    def lines() -> Iterator[str]:
+        while line := buffer.readline():
+            yield line.decode("utf-8")
+
+    # csv.reader pulls lines one at a time, so the map position is exactly past the header afterwards.
+    header = next(csv.reader(lines(), delimiter=delimiter), None)
+    if header is None:
+        return None
+    return header, buffer.tell()
+
+
+def split_csv_ranges(
+    buffer: mmap.mmap, start: int, range_bytes: int, quotechar: bytes = b'"'
+) -> list[tuple[int, int]]:
+    """Cut ``buffer[start:]`` into record-aligned ``(start, end)`` byte ranges of about ``range_bytes``.
+
+    ``start`` must be a record boundary. Each cut is placed after a newline preceded by an even number
+    of quote characters, so quoted fields containing newlines are never split. This assumes quotes
+    only appear as field delimiters or doubled inside quoted fields; callers parse ranges strictly to
+    detect files where a stray quote made a cut land inside a field.
+    """
+    size = len(buffer)
+    ranges = []
+    inside = False
+    scanned = start
+    range_start = start
+    while range_start < size:
+        cut = range_start + range_bytes
+        while cut < size:
+            newline = buffer.find(b"\n", cut)
+            if newline == -1:
+                cut = size
+                break
+            inside ^= _count(buffer, quotechar, scanned, newline) % 2 == 1
+            scanned = newline
+            cut = newline + 1
+            if not inside:
+                break
+        cut = min(cut, size)
+        ranges.append((range_start, cut))
+        range_start = cut
+    return ranges
+
+
+def _count(buffer: mmap.mmap, needle: bytes, start: int, end: int) -> int:
+    return sum(
+        buffer[offset : min(offset + _SCAN_WINDOW, end)].count(needle)
+        for offset in range(start, end, _SCAN_WINDOW)
+    )
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import re
-from typing import Iterable
+from dataclasses import dataclass
+from typing import Iterable, Sequence
 
+import numpy as np
 
 GTIN_12_PATTERN = re.compile(r"^\d{12}$")
 GTIN_13_PATTERN = re.compile(r"^\d{13}$")
@@ -43,6 +45,13 @@ def generate_barcode_payload(identifier: str) -> str:
     return identifier.zfill(14)
 
 
+def barcode_key(identifier: str | None) -> str | None:
+    """The GTIN-14 lookup key for a valid UPC-12/GTIN-13/GTIN-14, or None for anything else."""
+    if not identifier or not validate_gtin(identifier):
+        return None
+    return generate_barcode_payload(normalize_gtin(identifier))
+
+
 def detect_identifier_type(identifier: str) -> str:
     cleaned = re.sub(r"\D", "", identifier)
     if GTIN_12_PATTERN.match(cleaned):
@@ -52,3 +61,124 @@ def detect_identifier_type(identifier: str) -> str:
     if GTIN_14_PATTERN.match(cleaned):
         return "gtin14"
     return "sku"
+
+
+# Batch versions of the functions above. They run the digit arithmetic over NumPy matrices and return
+# exactly what the scalar functions would for every element.
+
+_IDENTIFIER_TYPES = np.array(["sku", "upc", "gtin13", "gtin14"])
+# Weights for a right-aligned GTIN-14: 3 on the digit left of the check digit, then alternating.
+# Left padding with zeros adds nothing, so 12- and 13-digit identifiers share them.
+_GTIN14_WEIGHTS = np.array([3 if (13 - position) % 2 else 1 for position in range(13)] + [0])
+# Characters str.strip() removes, by ASCII code.
+_ASCII_SPACE = np.array([chr(code).isspace() for code in range(256)]) & (np.arange(256) < 128)
+
+
+@dataclass
+class IdentifierBatch:
+    """Per-identifier results of ``classify_identifiers``, in input order."""
+
+    # ``detect_identifier_type`` of each identifier.
+    types: list[str]
+    # ``validate_gtin`` of each identifier.
+    valid: np.ndarray
+    # ``calculate_check_digit`` of the digits before the last, for identifiers with 12-14 digits; else -1.
+    check_digits: np.ndarray
+    # ``normalize_gtin`` padded to 14 digits, or None where it would raise.
+    gtin14: list[str | None]
+
+
+def classify_identifiers(values: Sequence[str]) -> IdentifierBatch:
+    count = len(values)
+    # Non-ASCII input follows Unicode digit rules in the scalar functions; leave those to them.
+    joined = "".join(values)
+    ascii_values = values
+    fallback = []
+    if not joined.isascii():
+        fallback = [index for index, value in enumerate(values) if not value.isascii()]
+        ascii_values = ["" if not value.isascii() else value for value in values]
+        joined = "".join(ascii_values)
+
+    lengths = np.fromiter(map(len, ascii_values), dtype=np.int64, count=count)
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    raw = np.frombuffer(joined.encode("ascii"), dtype=np.uint8)
+    is_digit = raw - np.uint8(48) < 10
+    # Running totals turn per-character flags into per-identifier counts at the row boundaries.
+    digits_before = _running_total(is_digit)
+    spaces_before = _running_total(_ASCII_SPACE[raw])
+    digit_ends = digits_before[ends]
+    digit_counts = digit_ends - digits_before[starts]
+
+    kinds = np.where((digit_counts >= 12) & (digit_counts <= 14), digit_counts - 11, 0)
+    candidates = np.flatnonzero(kinds)
+    candidate_counts = digit_counts[candidates]
+    digit_offsets = np.flatnonzero(is_digit)
+    digits = raw[digit_offsets] - np.uint8(48)
+    # Right-align each candidate's digits into a 14-wide matrix, zero-padded on the left.
+    positions = np.arange(14)
+    gather = digit_ends[candidates, None] - 14 + positions
+    matrix = digits[np.maximum(gather, 0)] if digits.size else np.zeros((0, 14), dtype=np.uint8)
+    matrix[positions < 14 - candidate_counts[:, None]] = 0
+
+    check_digits = np.full(count, -1, dtype=np.int64)
+    candidate_checks = (10 - matrix.astype(np.int64) @ _GTIN14_WEIGHTS % 10) % 10
+    check_digits[candidates] = candidate_checks
+    # validate_gtin strips whitespace and requires what is left to be all digits: so the digits must be
+    # contiguous and every other character whitespace.
+    first_digit = digit_offsets[digit_ends[candidates] - candidate_counts]
+    last_digit = digit_offsets[digit_ends[candidates] - 1] if digits.size else first_digit
+    spaces = spaces_before[ends[candidates]] - spaces_before[starts[candidates]]
+    valid = np.zeros(count, dtype=bool)
+    valid[candidates] = (
+        (last_digit - first_digit + 1 == candidate_counts)
+        & (spaces == lengths[candidates] - candidate_counts)
+        & (candidate_checks == matrix[:, 13])
+    )
+    gtin14_column = np.full(count, None, dtype=object)
+    gtin14_column[candidates] = (matrix + np.uint8(48)).view("S14").ravel().astype("U14")
+    gtin14: list[str | None] = gtin14_column.tolist()
+    types = _IDENTIFIER_TYPES[kinds].tolist()
+
+    for index in fallback:
+        value = values[index]
+        types[index] = detect_identifier_type(value)
+        valid[index] = validate_gtin(value)
+        cleaned = re.sub(r"\D", "", value)
+        if len(cleaned) in {12, 13, 14}:
+            check_digits[index] = calculate_check_digit(cleaned[:-1])
+            gtin14[index] = generate_barcode_payload(normalize_gtin(value))
+    return IdentifierBatch(types=types, valid=valid, check_digits=check_digits, gtin14=gtin14)
+
+
+def _running_total(flags: np.ndarray) -> np.ndarray:
+    """``totals[i]`` is the number of set flags before position ``i``; ``len(totals) == len(flags) + 1``."""
+    totals = np.zeros(flags.size + 1, dtype=np.int64)
+    np.cumsum(flags, out=totals[1:])
+    return totals
+
+
+def calculate_check_digits(numbers: Sequence[str]) -> np.ndarray:
+    """``calculate_check_digit`` for each number; raises ValueError if any is not all digits."""
+    if not all(number.isascii() for number in numbers):
+        return np.array([calculate_check_digit(number) for number in numbers], dtype=np.int64)
+    width = max(map(len, numbers), default=0)
+    codes = np.frombuffer(
+        "".join(number.rjust(width, "0") for number in numbers).encode("ascii"), dtype=np.uint8
+    ).reshape(len(numbers), width) - np.uint8(48)
+    if (codes >= 10).any():
+        raise ValueError("Check digits can only be calculated for numeric strings")
+    weights = np.where((width - np.arange(width)) % 2 == 1, 3, 1)
+    return (10 - codes.astype(np.int64) @ weights % 10) % 10
+
+
+def validate_gtins(values: Sequence[str]) -> np.ndarray:
+    return classify_identifiers(values).valid
+
+
+def detect_identifier_types(values: Sequence[str]) -> list[str]:
+    return classify_identifiers(values).types
+
+
+def to_gtin14(values: Sequence[str]) -> list[str | None]:
+    return classify_identifiers(values).gtin14
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import re
+
+# Conversion factors into one base unit per dimension: pounds, US gallons and each.
+_WEIGHT = {"lb": 1.0, "lbs": 1.0, "oz": 1 / 16, "kg": 2.204623, "g": 0.002204623}
+_VOLUME = {"gal": 1.0, "qt": 0.25, "pt": 0.125, "floz": 1 / 128, "l": 0.264172, "ml": 0.000264172}
+_COUNT = {"ea", "each", "ct", "pc", "pcs", "unit"}
+_PACKS = {"case", "cs", "pack", "pk", "box", "bag"}
+# "24ct", "12x5", "6/10" and "12 x 1" all describe the pieces in one pack.
+_PACK_SIZE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(?:[x/*]\s*(\d+(?:\.\d+)?))?")
+
+
+def pack_count(package_size: str | None) -> float | None:
+    """Return the number of pieces a package size string describes, or None if it is unreadable."""
+    if not package_size:
+        return None
+    match = _PACK_SIZE.match(package_size.lower())
+    if match is None:
+        return None
+    count = float(match.group(1)) * float(match.group(2) or 1)
+    return count or None
+
+
+def to_base_quantity(quantity: float, unit: str, package_size: str | None = None) -> tuple[float, str]:
+    """Return ``quantity`` of ``unit`` in base units (lb, gal or ea) and that unit.
+
+    Packs (cases, boxes) are counted in pieces when the package size says how many they hold.
+    Units that cannot be converted are returned unchanged, lower-cased.
+    """
+    key = unit.strip().lower().rstrip(".").replace(" ", "")
+    if key in _WEIGHT:
+        return quantity * _WEIGHT[key], "lb"
+    if key in _VOLUME:
+        return quantity * _VOLUME[key], "gal"
+    if key in _COUNT:
+        return quantity, "ea"
+    if key in _PACKS and (count := pack_count(package_size)):
+        return quantity * count, "ea"
+    return quantity, key or unit
+
+
+def normalize_unit_price(price: float, unit: str, package_size: str | None = None) -> tuple[float, str]:
+    """Return ``price`` per base unit (lb, gal or ea) and that unit; see ``to_base_quantity``."""
+    per_unit, base_unit = to_base_quantity(1.0, unit, package_size)
+    return price / per_unit, base_unit
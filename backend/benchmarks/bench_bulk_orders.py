@@ -0,0 +1,96 @@
+"""Compare creating orders one request at a time with ``POST /orders/bulk``.
+
+A nightly reorder job's worth of orders is posted through the ASGI app in-process, first one
+``POST /orders/`` per order, then as a single bulk request. Run from ``backend/``; without
+``--database-url`` a throwaway SQLite file is used::
+
+    python -m benchmarks.bench_bulk_orders --orders 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from typing import Any
+
+from benchmarks.datagen import SCALES, generate
+
+
+def order_payloads(
+    rng: random.Random, supplier_ids: list[str], product_ids: list[str], count: int
+) -> list[dict[str, Any]]:
+    return [
+        {
+            "supplier_id": rng.choice(supplier_ids),
+            "metadata": {"source": "nightly-reorder"},
+            "items": [
+                {
+                    "product_id": product_id,
+                    "quantity": rng.randint(1, 20),
+                    "unit": "case",
+                    "price_each": round(rng.uniform(1, 100), 2),
+                }
+                for product_id in rng.sample(product_ids, rng.randint(1, 15))
+            ],
+        }
+        for _ in range(count)
+    ]
+
+
+async def _run(count: int, seed: int) -> None:
+    import httpx
+
+    from app.db.init_db import init_models
+    from app.db.session import async_session_factory, engine
+    from app.main import app
+
+    await init_models()
+    async with async_session_factory() as session:
+        dataset = await generate(session, SCALES["small"])
+    rng = random.Random(seed)
+    payloads = order_payloads(rng, dataset.supplier_ids, dataset.product_ids, count)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        started = time.perf_counter()
+        for payload in payloads:
+            (await client.post("/orders/", json=payload)).raise_for_status()
+        single_seconds = time.perf_counter() - started
+        report("single", count, single_seconds)
+
+        for mode in ("all_or_nothing", "per_order"):
+            started = time.perf_counter()
+            response = await client.post("/orders/bulk", json={"orders": payloads, "mode": mode})
+            response.raise_for_status()
+            seconds = time.perf_counter() - started
+            body: dict[str, Any] = response.json()
+            if len(body["created"]) != count or body["errors"]:
+                raise SystemExit(f"bulk[{mode}] created {len(body['created'])} of {count} orders")
+            report(f"bulk[{mode}]", count, seconds, single_seconds)
+    await engine.dispose()
+
+
+def report(label: str, count: int, seconds: float, baseline: float | None = None) -> None:
+    speedup = f"  x{baseline / seconds:.1f}" if baseline else ""
+    print(f"{label:<20} {seconds:8.3f} s  {count / seconds:9.0f} orders/s{speedup}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="Empty database to seed (default: a temporary SQLite file)")
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    # Settings and the engine are read at import time, so the URL must be in place first.
+    os.environ["DATABASE_URL"] = args.database_url or (
+        f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='food-bulk-')}/bench.db"
+    )
+    asyncio.run(_run(args.orders, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Compare parse time and peak memory of the streaming xlsx catalog path with the CSV path.
+
+Both files hold the same synthetic rows and are parsed through ``CatalogIngestionService`` exactly
+as a staged upload would be, without touching the database. Run from ``backend/``::
+
+    python -m benchmarks.bench_catalog_excel --rows 200000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from openpyxl import Workbook, load_workbook
+
+from app.services.catalog_ingestion import CatalogIngestionService
+from benchmarks.datagen import catalog_csv, catalog_rows
+
+
+def write_xlsx(path: Path, rng: random.Random, count: int) -> None:
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Catalog")
+    # A banner row above the header, as supplier exports usually have.
+    sheet.append(["Synthetic supplier catalog"])
+    sheet.append(["Item Number", "Product Name", "Unit Price", "UOM", "UPC", "Pack Size"])
+    for row in catalog_rows(rng, count, "SKU"):
+        sheet.append(
+            [row["sku"], row["name"], float(row["price"]), row["unit"], row["upc"], row["package_size"]]
+        )
+    workbook.save(path)
+
+
+def parse(path: Path) -> int:
+    service = CatalogIngestionService(db=None)
+    with path.open("rb") as stream:
+        return sum(1 for _ in service._iter_products(path.suffix.lstrip("."), stream))
+
+
+def full_load(path: Path) -> int:
+    # What a naive parser does: materialise every cell of the workbook before reading rows.
+    workbook = load_workbook(path, data_only=True)
+    rows = sum(1 for _ in workbook.active.iter_rows(values_only=True))
+    workbook.close()
+    return rows
+
+
+def measure(label: str, run: Callable[[], int]) -> None:
+    started = time.perf_counter()
+    rows = run()
+    seconds = time.perf_counter() - started
+    # A second, traced pass: tracemalloc slows allocation-heavy code, so it is kept out of the timing.
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<16} {rows:8d} rows  {seconds:7.2f} s  {rows / seconds:9.0f} rows/s  "
+        f"peak {peak / 2**20:8.1f} MiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--full-load", action="store_true", help="Also time openpyxl's default (non read-only) mode"
+    )
+    args = parser.parse_args()
+
+    directory = Path(tempfile.mkdtemp(prefix="food-excel-"))
+    csv_path = directory / "catalog.csv"
+    xlsx_path = directory / "catalog.xlsx"
+    csv_path.write_bytes(catalog_csv(random.Random(args.seed), args.rows, "SKU"))
+    started = time.perf_counter()
+    write_xlsx(xlsx_path, random.Random(args.seed), args.rows)
+    print(
+        f"wrote {args.rows} rows in {time.perf_counter() - started:.1f}s: csv "
+        f"{csv_path.stat().st_size / 2**20:.1f} MiB, xlsx {xlsx_path.stat().st_size / 2**20:.1f} MiB"
+    )
+
+    measure("csv", lambda: parse(csv_path))
+    measure("xlsx read-only", lambda: parse(xlsx_path))
+    if args.full_load:
+        measure("xlsx full load", lambda: full_load(xlsx_path))
+
+
+if __name__ == "__main__":
+    main()
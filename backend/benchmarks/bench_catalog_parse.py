@@ -0,0 +1,72 @@
+"""Compare serial and process-pool parsing of a large staged CSV catalog.
+
+Some names carry quoted commas and newlines, so range splitting is exercised. Both paths must return
+identical products. Run from ``backend/``::
+
+    python -m benchmarks.bench_catalog_parse --rows 1000000 --workers 2 4 8
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from app.services.catalog_ingestion import CatalogIngestionService
+from benchmarks.datagen import catalog_rows
+
+HEADER = ("sku", "name", "price", "unit", "upc", "package_size")
+
+
+def write_csv(path: Path, rng: random.Random, count: int) -> None:
+    with path.open("w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(HEADER)
+        for row in catalog_rows(rng, count, "SKU"):
+            roll = rng.random()
+            if roll < 0.02:
+                row["name"] += '\n(see "notes")'
+            elif roll < 0.1:
+                row["name"] += ", bulk"
+            writer.writerow([row[column] for column in HEADER])
+
+
+def parse(path: Path, workers: int) -> tuple[list, float]:
+    service = CatalogIngestionService(db=None)
+    service.parse_workers = workers
+    service.parallel_min_bytes = 0
+    started = time.perf_counter()
+    with path.open("rb") as stream:
+        products = list(service._iter_products("csv", stream))
+    return products, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, os.cpu_count() or 1])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    path = Path(tempfile.mkdtemp(prefix="food-parse-")) / "catalog.csv"
+    write_csv(path, random.Random(args.seed), args.rows)
+    print(f"{args.rows} rows, {path.stat().st_size / 2**20:.1f} MiB, {os.cpu_count()} CPUs")
+
+    serial, serial_seconds = parse(path, workers=1)
+    print(f"{'serial':<12} {serial_seconds:7.2f} s  {len(serial) / serial_seconds:9.0f} rows/s")
+    for workers in sorted(set(args.workers)):
+        products, seconds = parse(path, workers)
+        status = "identical" if products == serial else "MISMATCH"
+        print(
+            f"{f'{workers} workers':<12} {seconds:7.2f} s  {len(products) / seconds:9.0f} rows/s  "
+            f"x{serial_seconds / seconds:4.1f}  {status}"
+        )
+        if products != serial:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
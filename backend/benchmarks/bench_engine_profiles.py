@@ -0,0 +1,180 @@
+"""Compare engine profiles under concurrent load from several worker processes.
+
+Each process stands in for a uvicorn worker and runs concurrent tasks mixing recipe costing
+reads with price writes for a fixed duration. Run from ``backend/``::
+
+    python -m benchmarks.bench_engine_profiles --profiles default dev-sqlite
+    python -m benchmarks.bench_engine_profiles --database-url postgresql+psycopg://localhost/food_bench \\
+        --profiles default prod-postgres
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy.engine import make_url
+
+from benchmarks.datagen import SCALES, generate
+
+
+@dataclass
+class WorkerResult:
+    reads: int = 0
+    writes: int = 0
+    errors: dict[str, int] = field(default_factory=dict)
+    latencies_ms: list[float] = field(default_factory=list)
+
+
+def _worker(
+    database_url: str, profile: str, concurrency: int, duration: float, write_ratio: float, seed: int
+) -> WorkerResult:
+    # Runs in a spawned process, so the app reads this configuration when first imported.
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["DATABASE_PROFILE"] = profile
+    return asyncio.run(_drive(concurrency, duration, write_ratio, seed))
+
+
+async def _drive(concurrency: int, duration: float, write_ratio: float, seed: int) -> WorkerResult:
+    from sqlalchemy import insert, select, update
+
+    from app.db.session import async_session_factory, engine
+    from app.models import PriceHistory, Product, Recipe
+    from app.services.costing import CostingService
+
+    async with async_session_factory() as session:
+        recipe_ids = list((await session.execute(select(Recipe.id))).scalars())
+        products = list((await session.execute(select(Product.id, Product.supplier_id))).all())
+
+    result = WorkerResult()
+    deadline = time.perf_counter() + duration
+
+    async def run(rng: random.Random) -> None:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                async with async_session_factory() as session:
+                    if rng.random() < write_ratio:
+                        product_id, supplier_id = rng.choice(products)
+                        price = round(rng.uniform(1, 100), 2)
+                        await session.execute(
+                            insert(PriceHistory.__table__).values(
+                                id=str(uuid.uuid4()),
+                                product_id=product_id,
+                                supplier_id=supplier_id,
+                                price=price,
+                                currency="USD",
+                                recorded_at=datetime.now(timezone.utc),
+                            )
+                        )
+                        await session.execute(
+                            update(Product).where(Product.id == product_id).values(price=price)
+                        )
+                        await session.commit()
+                        result.writes += 1
+                    else:
+                        await CostingService(session).recipe_cost(rng.choice(recipe_ids))
+                        result.reads += 1
+            except Exception as exc:  # noqa: BLE001 - the point is to count what breaks under load
+                key = f"{type(exc).__name__}: {str(exc).splitlines()[0][:80]}"
+                result.errors[key] = result.errors.get(key, 0) + 1
+                continue
+            result.latencies_ms.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(run(random.Random(seed * 1000 + index)) for index in range(concurrency)))
+    # Pooled aiosqlite connections run on non-daemon threads; close them so the process can exit.
+    await engine.dispose()
+    return result
+
+
+def _seed(database_url: str, scale: str) -> None:
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["DATABASE_PROFILE"] = "default"
+
+    async def seed() -> None:
+        from app.db.init_db import init_models
+        from app.db.session import async_session_factory, engine
+
+        await init_models()
+        async with async_session_factory() as session:
+            await generate(session, replace(SCALES[scale], history_days=90))
+        await engine.dispose()
+
+    asyncio.run(seed())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="Seeded or empty database (default: temporary SQLite file)")
+    parser.add_argument("--profiles", nargs="+", default=["default", "dev-sqlite"])
+    parser.add_argument("--scale", default="small")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent tasks per process")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--skip-seed", action="store_true", help="Use --database-url as already seeded")
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    template = None
+    context = multiprocessing.get_context("spawn")
+    if database_url is None:
+        template = Path(tempfile.mkdtemp(prefix="food-profiles-")) / "template.db"
+        database_url = f"sqlite+aiosqlite:///{template}"
+    if not args.skip_seed:
+        # Seed in a child process so this one never imports the app with a fixed URL.
+        process = context.Process(target=_seed, args=(database_url, args.scale))
+        process.start()
+        process.join()
+        if process.exitcode:
+            raise SystemExit("Seeding failed")
+
+    print(
+        f"{args.processes} processes x {args.concurrency} tasks, {args.duration:.0f}s, "
+        f"{args.write_ratio:.0%} writes"
+    )
+    for profile in args.profiles:
+        run_url = database_url
+        if template is not None:
+            # SQLite journal mode persists in the file, so each profile starts from a clean copy.
+            copy = template.with_name(f"{profile}.db")
+            shutil.copyfile(template, copy)
+            run_url = str(make_url(database_url).set(database=str(copy)))
+        with context.Pool(args.processes) as pool:
+            results = pool.starmap(
+                _worker,
+                [
+                    (run_url, profile, args.concurrency, args.duration, args.write_ratio, index)
+                    for index in range(args.processes)
+                ],
+            )
+        reads = sum(result.reads for result in results)
+        writes = sum(result.writes for result in results)
+        latencies = sorted(latency for result in results for latency in result.latencies_ms)
+        errors: dict[str, int] = {}
+        for result in results:
+            for key, count in result.errors.items():
+                errors[key] = errors.get(key, 0) + count
+        p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+        median = statistics.median(latencies) if latencies else 0.0
+        print(
+            f"{profile:<15} {(reads + writes) / args.duration:9.1f} ops/s  "
+            f"reads {reads:6d}  writes {writes:6d}  errors {sum(errors.values()):5d}  "
+            f"median {median:7.2f} ms  p95 {p95:7.2f} ms"
+        )
+        for key, count in sorted(errors.items(), key=lambda item: -item[1]):
+            print(f"{'':<15} {count:6d} x {key}")
+
+
+if __name__ == "__main__":
+    main()
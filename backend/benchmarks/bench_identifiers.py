@@ -0,0 +1,86 @@
+"""Compare the scalar identifier functions with the vectorized batch versions.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_identifiers --count 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+
+from app.utils.identifiers import (
+    calculate_check_digit,
+    classify_identifiers,
+    detect_identifier_type,
+    generate_barcode_payload,
+    normalize_gtin,
+    validate_gtin,
+)
+from benchmarks.datagen import random_gtin
+
+
+def identifiers(rng: random.Random, count: int) -> list[str]:
+    """A catalog-like column: mostly valid UPC/EAN codes, some mistyped, formatted or free-text."""
+    values = []
+    for _ in range(count):
+        roll = rng.random()
+        value = random_gtin(rng, rng.choice((12, 12, 13, 14)))
+        if roll < 0.1:
+            value = value[:-1] + str((int(value[-1]) + 1) % 10)
+        elif roll < 0.15:
+            value = f"{value[:1]}-{value[1:6]}-{value[6:]}"
+        elif roll < 0.2:
+            value = f" {value} "
+        elif roll < 0.25:
+            value = f"SKU-{rng.randint(1, 99999)}"
+        values.append(value)
+    return values
+
+
+def scalar(values: list[str]) -> tuple[list, list, list, list]:
+    types, valid, check_digits, gtin14 = [], [], [], []
+    for value in values:
+        types.append(detect_identifier_type(value))
+        valid.append(validate_gtin(value))
+        cleaned = re.sub(r"\D", "", value)
+        if len(cleaned) in {12, 13, 14}:
+            check_digits.append(calculate_check_digit(cleaned[:-1]))
+            gtin14.append(generate_barcode_payload(normalize_gtin(value)))
+        else:
+            check_digits.append(-1)
+            gtin14.append(None)
+    return types, valid, check_digits, gtin14
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    values = identifiers(random.Random(args.seed), args.count)
+
+    started = time.perf_counter()
+    expected = scalar(values)
+    scalar_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch = classify_identifiers(values)
+    batch_seconds = time.perf_counter() - started
+    actual = (batch.types, batch.valid.tolist(), batch.check_digits.tolist(), batch.gtin14)
+
+    print(f"{args.count} identifiers, {sum(expected[1])} valid")
+    print(f"{'scalar':<8} {scalar_seconds:7.3f} s  {args.count / scalar_seconds:12.0f} ids/s")
+    print(
+        f"{'batch':<8} {batch_seconds:7.3f} s  {args.count / batch_seconds:12.0f} ids/s  "
+        f"x{scalar_seconds / batch_seconds:.1f}"
+    )
+    if actual != expected:
+        raise SystemExit("Batch results differ from the scalar functions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare the full-scan ingredient matcher with the inverted token index.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_ingredient_matching --ingredients 10000 --products 2000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from app.services.ingredient_index import IngredientIndex
+from app.services.nutrition import NutritionMatchingService
+
+WORDS = (
+    "chicken beef pork turkey salmon tuna shrimp egg milk butter cheese cream yogurt flour rice oat "
+    "corn wheat bean lentil pea tomato onion garlic carrot celery potato pepper spinach kale lettuce "
+    "apple banana orange lemon lime berry grape peach olive oil vinegar sugar salt honey maple "
+    "raw cooked frozen canned dried fresh whole sliced diced ground boneless skinless lowfat organic"
+).split()
+
+
+def _names(count: int, rng: random.Random) -> list[str]:
+    return [" ".join(rng.sample(WORDS, rng.randint(1, 4))) + f" {index}" for index in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ingredients", type=int, default=10_000)
+    parser.add_argument("--products", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    ingredients = {f"ing-{index}": name for index, name in enumerate(_names(args.ingredients, rng))}
+    queries = [" ".join(rng.sample(WORDS, rng.randint(2, 5))) for _ in range(args.products)]
+    scorer = NutritionMatchingService(db=None)
+
+    started = time.perf_counter()
+    scanned = []
+    for query in queries:
+        matches = []
+        for ingredient_id, name in ingredients.items():
+            confidence = scorer._score(query, name)
+            if confidence > 0.4:
+                matches.append((ingredient_id, confidence))
+        scanned.append(sorted(matches))
+    scan_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    index = IngredientIndex()
+    for ingredient_id, name in ingredients.items():
+        index.add(ingredient_id, name)
+    build_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    indexed = [sorted(index.search(query)) for query in queries]
+    query_seconds = time.perf_counter() - started
+
+    if scanned != indexed:
+        raise SystemExit("Index results differ from the full scan")
+    print(f"ingredients={args.ingredients} products={args.products}")
+    print(f"scan:  {scan_seconds:.3f}s ({args.products / scan_seconds:,.0f} matches/s)")
+    print(
+        f"index: {query_seconds:.3f}s ({args.products / query_seconds:,.0f} matches/s), "
+        f"build {build_seconds:.3f}s"
+    )
+    print(f"speedup: {scan_seconds / query_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
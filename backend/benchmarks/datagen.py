@@ -0,0 +1,306 @@
+"""Seed a database with a synthetic, realistically shaped dataset.
+
+Run from ``backend/`` against the configured ``DATABASE_URL``::
+
+    python -m benchmarks.datagen --scale medium
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import uuid
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import (
+    Ingredient,
+    Order,
+    OrderItem,
+    PriceHistory,
+    Product,
+    ProductIngredientMapping,
+    Recipe,
+    RecipeIngredient,
+    Supplier,
+)
+from app.services.price_book import PriceBook
+from app.services.price_rollups import PriceRollupService
+from app.utils.identifiers import barcode_key, calculate_check_digit
+
+FOODS = (
+    "chicken beef pork turkey salmon tuna shrimp egg milk butter cheese cream yogurt flour rice oat "
+    "corn wheat bean lentil pea tomato onion garlic carrot celery potato pepper spinach kale lettuce "
+    "apple banana orange lemon lime berry grape peach olive oil vinegar sugar salt honey maple"
+).split()
+DESCRIPTORS = "raw cooked frozen canned dried fresh whole sliced diced ground organic lowfat".split()
+UNITS = ("lb", "oz", "kg", "case", "ea", "gal")
+CATEGORIES = ("entree", "side", "dessert", "soup", "salad", "sauce")
+_INSERT_BATCH = 10_000
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    suppliers: int
+    products_per_supplier: int
+    ingredients: int
+    recipes: int
+    min_recipe_ingredients: int = 4
+    max_recipe_ingredients: int = 12
+    mapped_fraction: float = 0.8
+    history_days: int = 730
+    history_interval_days: int = 7
+    orders: int = 200
+    seed: int = 42
+
+
+SCALES = {
+    "small": DatasetSpec(suppliers=2, products_per_supplier=500, ingredients=300, recipes=100, orders=50),
+    "medium": DatasetSpec(suppliers=5, products_per_supplier=2_000, ingredients=1_500, recipes=500),
+    "large": DatasetSpec(
+        suppliers=10, products_per_supplier=10_000, ingredients=5_000, recipes=2_000, orders=1_000
+    ),
+}
+
+
+@dataclass
+class Dataset:
+    """Ids of what was generated, for benchmarks to sample from."""
+
+    spec: DatasetSpec
+    supplier_ids: list[str]
+    ingredient_ids: list[str]
+    product_ids: list[str]
+    unmapped_product_ids: list[str]
+    recipe_ids: list[str]
+    price_history_rows: int = 0
+
+
+def random_gtin(rng: random.Random, length: int = 12) -> str:
+    body = "".join(str(rng.randint(0, 9)) for _ in range(length - 1))
+    return body + str(calculate_check_digit(body))
+
+
+def product_name(rng: random.Random, ingredient_name: str) -> str:
+    descriptors = rng.sample(DESCRIPTORS, rng.randint(0, 2))
+    return " ".join([*descriptors, ingredient_name.rsplit(" ", 1)[0]])
+
+
+def catalog_rows(rng: random.Random, count: int, sku_prefix: str) -> Iterator[dict[str, Any]]:
+    """Supplier catalog rows in the column layout ``CatalogIngestionService`` parses."""
+    for index in range(count):
+        foods = " ".join(rng.sample(FOODS, rng.randint(1, 3)))
+        identifier = random_gtin(rng, 13) if rng.random() < 0.3 else random_gtin(rng)
+        yield {
+            "sku": f"{sku_prefix}-{index}",
+            "name": f"{rng.choice(DESCRIPTORS)} {foods}",
+            "price": f"{rng.uniform(0.5, 120):.2f}",
+            "unit": rng.choice(UNITS),
+            "upc": identifier,
+            "package_size": f"{rng.randint(1, 24)}x{rng.choice((1, 5, 10, 25))}",
+        }
+
+
+def catalog_csv(rng: random.Random, count: int, sku_prefix: str) -> bytes:
+    header = ("sku", "name", "price", "unit", "upc", "package_size")
+    lines = [",".join(header)]
+    for row in catalog_rows(rng, count, sku_prefix):
+        lines.append(",".join(row[column] for column in header))
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def generate(db: AsyncSession, spec: DatasetSpec) -> Dataset:
+    """Insert ``spec``'s dataset, then rebuild price rollups and the price book. Commits."""
+    rng = random.Random(spec.seed)
+    now = datetime.now(timezone.utc)
+
+    supplier_ids = [str(uuid.uuid4()) for _ in range(spec.suppliers)]
+    await _insert(
+        db,
+        Supplier,
+        [{"id": supplier_id, "name": f"Supplier {index}"} for index, supplier_id in enumerate(supplier_ids)],
+    )
+
+    ingredient_rows = []
+    for index in range(spec.ingredients):
+        name = " ".join(rng.sample(FOODS, rng.randint(1, 3))) + f" {index}"
+        ingredient_rows.append(
+            {
+                "id": str(uuid.uuid4()),
+                "name": name,
+                "nutritional_profile": {
+                    "calories": round(rng.uniform(10, 900), 1),
+                    "protein": round(rng.uniform(0, 40), 1),
+                    "fat": round(rng.uniform(0, 60), 1),
+                    "carbohydrates": round(rng.uniform(0, 90), 1),
+                },
+                "allergen_flags": {"gluten": rng.random() < 0.1, "dairy": rng.random() < 0.1},
+            }
+        )
+    await _insert(db, Ingredient, ingredient_rows)
+    ingredient_ids = [row["id"] for row in ingredient_rows]
+
+    product_rows, mapping_rows, history_rows = [], [], []
+    unmapped: list[str] = []
+    points = max(1, spec.history_days // spec.history_interval_days)
+    history_count = 0
+    for supplier_id in supplier_ids:
+        for index in range(spec.products_per_supplier):
+            ingredient = rng.choice(ingredient_rows)
+            product_id = str(uuid.uuid4())
+            price = rng.uniform(0.5, 120)
+            upc = random_gtin(rng)
+            product_rows.append(
+                {
+                    "id": product_id,
+                    "supplier_id": supplier_id,
+                    "sku": f"SKU-{index}",
+                    "upc": upc,
+                    "barcode": barcode_key(upc),
+                    "name": product_name(rng, ingredient["name"]),
+                    "unit": rng.choice(UNITS),
+                    "package_size": f"{rng.randint(1, 24)}ct",
+                    "price": round(price, 4),
+                    "currency": "USD",
+                }
+            )
+            if rng.random() < spec.mapped_fraction:
+                mapping_rows.append(
+                    {
+                        "id": str(uuid.uuid4()),
+                        "product_id": product_id,
+                        "ingredient_id": ingredient["id"],
+                        "confidence_score": round(rng.uniform(0.5, 1.0), 4),
+                    }
+                )
+            else:
+                unmapped.append(product_id)
+            # A random walk backwards from today's price.
+            walk = price
+            for point in range(points):
+                history_rows.append(
+                    {
+                        "id": str(uuid.uuid4()),
+                        "product_id": product_id,
+                        "supplier_id": supplier_id,
+                        "price": round(walk, 4),
+                        "currency": "USD",
+                        "recorded_at": now - timedelta(days=point * spec.history_interval_days),
+                    }
+                )
+                walk = max(0.1, walk * rng.uniform(0.95, 1.05))
+            if len(history_rows) >= _INSERT_BATCH:
+                await _insert(db, Product, product_rows)
+                await _insert(db, PriceHistory, history_rows)
+                history_count += len(history_rows)
+                product_rows, history_rows = [], []
+    await _insert(db, Product, product_rows)
+    await _insert(db, PriceHistory, history_rows)
+    await _insert(db, ProductIngredientMapping, mapping_rows)
+    history_count += len(history_rows)
+    product_ids = [row["product_id"] for row in mapping_rows] + unmapped
+
+    recipe_rows, line_rows = [], []
+    for index in range(spec.recipes):
+        recipe_id = str(uuid.uuid4())
+        recipe_rows.append({"id": recipe_id, "name": f"Recipe {index}", "category": rng.choice(CATEGORIES)})
+        count = rng.randint(spec.min_recipe_ingredients, spec.max_recipe_ingredients)
+        for ingredient_id in rng.sample(ingredient_ids, min(count, len(ingredient_ids))):
+            line_rows.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "recipe_id": recipe_id,
+                    "ingredient_id": ingredient_id,
+                    "quantity": round(rng.uniform(0.1, 5), 2),
+                    "unit": rng.choice(UNITS),
+                }
+            )
+    await _insert(db, Recipe, recipe_rows)
+    await _insert(db, RecipeIngredient, line_rows)
+
+    order_rows, item_rows = [], []
+    for _ in range(spec.orders):
+        order_id = str(uuid.uuid4())
+        order_rows.append({"id": order_id, "supplier_id": rng.choice(supplier_ids), "status": "pending"})
+        for product_id in rng.sample(product_ids, min(rng.randint(1, 15), len(product_ids))):
+            item_rows.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "order_id": order_id,
+                    "product_id": product_id,
+                    "quantity": rng.randint(1, 20),
+                    "unit": "case",
+                }
+            )
+    await _insert(db, Order, order_rows)
+    await _insert(db, OrderItem, item_rows)
+    await db.commit()
+    await PriceRollupService(db).rebuild()
+    await PriceBook(db).rebuild()
+
+    return Dataset(
+        spec=spec,
+        supplier_ids=supplier_ids,
+        ingredient_ids=ingredient_ids,
+        product_ids=product_ids,
+        unmapped_product_ids=unmapped,
+        recipe_ids=[row["id"] for row in recipe_rows],
+        price_history_rows=history_count,
+    )
+
+
+async def _insert(db: AsyncSession, model: type, rows: list[dict[str, Any]]) -> None:
+    for offset in range(0, len(rows), _INSERT_BATCH):
+        await db.execute(insert(model.__table__), rows[offset : offset + _INSERT_BATCH])
+
+
+def spec_from_args(args: argparse.Namespace) -> DatasetSpec:
+    spec = SCALES[args.scale]
+    overrides = {
+        field: getattr(args, field)
+        for field in ("suppliers", "products_per_supplier", "ingredients", "recipes", "history_days", "seed")
+        if getattr(args, field) is not None
+    }
+    return replace(spec, **overrides)
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--suppliers", type=int)
+    parser.add_argument("--products-per-supplier", type=int)
+    parser.add_argument("--ingredients", type=int)
+    parser.add_argument("--recipes", type=int)
+    parser.add_argument("--history-days", type=int)
+    parser.add_argument("--seed", type=int)
+
+
+async def _generate_from_cli(spec: DatasetSpec) -> Dataset:
+    from app.db.init_db import init_models
+    from app.db.session import async_session_factory, engine
+
+    await init_models()
+    async with async_session_factory() as session:
+        dataset = await generate(session, spec)
+    await engine.dispose()
+    return dataset
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_spec_arguments(parser)
+    spec = spec_from_args(parser.parse_args())
+    dataset = asyncio.run(_generate_from_cli(spec))
+    print(asdict(spec))
+    print(
+        f"{len(dataset.supplier_ids)} suppliers, {len(dataset.product_ids)} products "
+        f"({len(dataset.unmapped_product_ids)} unmapped), {len(dataset.ingredient_ids)} ingredients, "
+        f"{len(dataset.recipe_ids)} recipes, {dataset.price_history_rows} price history rows"
+    )
+
+
+if __name__ == "__main__":
+    main()
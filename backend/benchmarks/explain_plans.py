@@ -0,0 +1,242 @@
+"""Check that the hot lookup queries use indexes instead of scanning whole tables.
+
+Migrates an empty database to head, seeds it with ``benchmarks.datagen``, runs the real service
+calls while capturing their SELECT statements, and EXPLAINs each one (SQLite and PostgreSQL).
+Exits non-zero if any plan falls back to a full table scan; ``tests/test_query_plans.py`` runs
+the same check under pytest. Run from ``backend/``::
+
+    python -m benchmarks.explain_plans --scale medium
+    python -m benchmarks.explain_plans --database-url postgresql+psycopg://localhost/food_explain
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from benchmarks.datagen import Dataset, add_spec_arguments, generate, spec_from_args
+
+
+@dataclass
+class PlanCase:
+    name: str
+    run: Callable[[Any, Dataset, random.Random], Awaitable[Any]]
+    # Tables a plan may legitimately read in full (e.g. a tiny lookup table).
+    allowed_scans: frozenset[str] = field(default_factory=frozenset)
+
+
+async def _recipe_costs(db: Any, dataset: Dataset, rng: random.Random) -> None:
+    from app.services.costing import CostingService
+
+    await CostingService(db).recipe_costs(rng.sample(dataset.recipe_ids, 5))
+
+
+async def _trends_for_supplier(db: Any, dataset: Dataset, rng: random.Random) -> None:
+    from app.services.reporting import ReportingService
+
+    await ReportingService(db).price_trends(supplier_id=dataset.supplier_ids[0], window_days=30)
+
+
+async def _trends_for_products(db: Any, dataset: Dataset, rng: random.Random) -> None:
+    from app.services.reporting import ReportingService
+
+    product_ids = rng.sample(dataset.product_ids, 10)
+    await ReportingService(db).price_trends(window_days=365, product_ids=product_ids)
+
+
+async def _aligned_trends_for_supplier(db: Any, dataset: Dataset, rng: random.Random) -> None:
+    from app.services.reporting import ReportingService
+
+    await ReportingService(db).price_trends(
+        supplier_id=dataset.supplier_ids[0], window_days=365, aligned=True
+    )
+
+
+async def _existing_catalog(db: Any, dataset: Dataset, rng: random.Random) -> None:
+    from app.services.catalog_ingestion import CatalogIngestionService
+
+    skus = [f"SKU-{index}" for index in rng.sample(range(dataset.spec.products_per_supplier), 50)]
+    await CatalogIngestionService(db)._load_existing(dataset.supplier_ids[0], skus)
+
+
+async def _affected_recipes(db: Any, dataset: Dataset, rng: random.Random) -> None:
+    from app.services.recipe_cost_cache import RecipeCostCache
+
+    await RecipeCostCache(db).refresh_for_products(rng.sample(dataset.product_ids, 5))
+
+
+async def _recipe_with_lines(db: Any, dataset: Dataset, rng: random.Random) -> None:
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
+
+    from app.models import Recipe
+
+    recipe_ids = rng.sample(dataset.recipe_ids, 5)
+    await db.execute(
+        select(Recipe).where(Recipe.id.in_(recipe_ids)).options(selectinload(Recipe.ingredients))
+    )
+
+
+async def _product_by_upc(db: Any, dataset: Dataset, rng: random.Random) -> None:
+    from sqlalchemy import select
+
+    from app.models import Product
+
+    upc = (await db.execute(select(Product.upc).where(Product.id == dataset.product_ids[0]))).scalar_one()
+    await db.execute(select(Product).where(Product.upc == upc))
+
+
+async def _products_by_barcode(db: Any, dataset: Dataset, rng: random.Random) -> None:
+    from sqlalchemy import select
+
+    from app.api.products import _offerings_by_barcode
+    from app.models import Product
+
+    product_ids = rng.sample(dataset.product_ids, 20)
+    barcodes = (await db.execute(select(Product.barcode).where(Product.id.in_(product_ids)))).scalars()
+    await _offerings_by_barcode(db, sorted(set(barcodes)))
+
+
+async def _price_book_refresh(db: Any, dataset: Dataset, rng: random.Random) -> None:
+    from app.services.price_book import PriceBook
+
+    await PriceBook(db).refresh_for_products(rng.sample(dataset.product_ids, 20))
+
+
+CASES = (
+    PlanCase("CostingService.recipe_costs", _recipe_costs),
+    PlanCase("ReportingService.price_trends[supplier]", _trends_for_supplier),
+    PlanCase("ReportingService.price_trends[products]", _trends_for_products),
+    PlanCase("ReportingService.price_trends[supplier,aligned]", _aligned_trends_for_supplier),
+    PlanCase("CatalogIngestionService._load_existing", _existing_catalog),
+    PlanCase("RecipeCostCache.refresh_for_products", _affected_recipes),
+    PlanCase("recipes with selectinload(ingredients)", _recipe_with_lines),
+    PlanCase("products by upc", _product_by_upc),
+    PlanCase("products by barcode", _products_by_barcode),
+    PlanCase("PriceBook.refresh_for_products", _price_book_refresh),
+)
+
+
+def sqlite_full_scans(plan_rows: list[Any], tables: set[str]) -> list[str]:
+    # EXPLAIN QUERY PLAN rows are (id, parent, notused, detail), e.g. "SCAN price_history".
+    scans = []
+    for row in plan_rows:
+        words = row[-1].split()
+        if len(words) >= 2 and words[0] == "SCAN" and words[1] in tables:
+            scans.append(words[1])
+    return scans
+
+
+def postgres_full_scans(plan: Any, tables: set[str]) -> list[str]:
+    scans = []
+    stack = [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") in tables:
+            scans.append(node["Relation Name"])
+        stack.extend(node.get("Plans", ()))
+    return scans
+
+
+async def check_plans(dataset: Dataset, seed: int) -> list[str]:
+    from sqlalchemy import event
+
+    from app.db.base import Base
+    from app.db.session import async_session_factory, engine
+
+    tables = set(Base.metadata.tables)
+    dialect = engine.dialect.name
+    captured: list[tuple[str, Any]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, parameters))
+
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("ANALYZE")
+        await conn.commit()
+
+    failures = []
+    rng = random.Random(seed)
+    for case in CASES:
+        captured.clear()
+        async with async_session_factory() as session:
+            event.listen(engine.sync_engine, "before_cursor_execute", capture)
+            try:
+                await case.run(session, dataset, rng)
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", capture)
+            statements = list(captured)
+            connection = await session.connection()
+            for statement, parameters in statements:
+                if dialect == "postgresql":
+                    explain = await connection.exec_driver_sql(
+                        f"EXPLAIN (FORMAT JSON) {statement}", parameters
+                    )
+                    plan = explain.scalar_one()
+                    scans = postgres_full_scans(json.loads(plan) if isinstance(plan, str) else plan, tables)
+                else:
+                    explain = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                    scans = sqlite_full_scans(explain.all(), tables)
+                scans = [table for table in scans if table not in case.allowed_scans]
+                status = "FULL SCAN " + ", ".join(sorted(set(scans))) if scans else "ok"
+                print(f"{case.name:<50} {status}")
+                if scans:
+                    failures.append(f"{case.name}: {' '.join(statement.split())[:200]}")
+            await session.rollback()
+    return failures
+
+
+async def _seed_and_check(spec: Any) -> list[str]:
+    from app.db.session import async_session_factory, engine
+
+    async with async_session_factory() as session:
+        dataset = await generate(session, spec)
+    failures = await check_plans(dataset, spec.seed)
+    await engine.dispose()
+    return failures
+
+
+def migrate(database_url: str) -> None:
+    """Upgrade the database at ``database_url`` to the latest migration."""
+    from alembic import command
+    from alembic.config import Config
+
+    # No alembic.ini: its logging config would replace the caller's.
+    config = Config()
+    config.set_main_option("script_location", str(Path(__file__).resolve().parent.parent / "alembic"))
+    config.set_main_option("sqlalchemy.url", database_url.replace("%", "%%"))
+    command.upgrade(config, "head")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_spec_arguments(parser)
+    parser.add_argument(
+        "--database-url", help="Empty database to migrate and seed (default: a temporary SQLite file)"
+    )
+    args = parser.parse_args()
+    database_url = args.database_url
+    if database_url is None:
+        database_url = f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='food-explain-')}/explain.db"
+    # Settings and the engine are read at import time, so the URL must be in place first.
+    os.environ["DATABASE_URL"] = database_url
+    migrate(database_url)
+
+    spec = spec_from_args(args)
+    failures = asyncio.run(_seed_and_check(spec))
+    if failures:
+        print("\nQueries falling back to full table scans:")
+        for failure in failures:
+            print(f"  {failure}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""Time the backend's hot paths against a synthetic dataset and save the results as JSON.
+
+Run from ``backend/``; without ``--database-url`` a throwaway SQLite file is used::
+
+    python -m benchmarks.suite --scale small --output before.json
+    python -m benchmarks.suite --scale small --compare before.json
+
+``--compare`` flags every case whose median got slower than the baseline by more than
+``--tolerance`` and exits non-zero if there is any.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from benchmarks.datagen import Dataset, DatasetSpec, add_spec_arguments, catalog_csv, generate, spec_from_args
+
+RESULTS_DIR = Path(__file__).parent / "results"
+LIST_ENDPOINTS = ("/suppliers/", "/products/", "/ingredients/", "/recipes/", "/orders/")
+
+
+@dataclass
+class CaseResult:
+    name: str
+    iterations: int
+    min_ms: float
+    median_ms: float
+    p95_ms: float
+    mean_ms: float
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def ops_per_second(self) -> float:
+        return 1000 / self.mean_ms if self.mean_ms else 0.0
+
+
+async def measure(
+    name: str, run: Callable[[int], Awaitable[Any]], iterations: int, warmup: int = 1
+) -> CaseResult:
+    """Await ``run(i)`` ``warmup`` times untimed, then ``iterations`` times timed."""
+    for index in range(warmup):
+        await run(-1 - index)
+    samples = []
+    for index in range(iterations):
+        started = time.perf_counter()
+        await run(index)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    result = CaseResult(
+        name=name,
+        iterations=iterations,
+        min_ms=samples[0],
+        median_ms=statistics.median(samples),
+        p95_ms=samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        mean_ms=statistics.fmean(samples),
+    )
+    print(f"{name:<45} median {result.median_ms:9.2f} ms  p95 {result.p95_ms:9.2f} ms  ({iterations}x)")
+    return result
+
+
+async def run_suite(dataset: Dataset, iterations: int, catalog_rows: int) -> list[CaseResult]:
+    import httpx
+    from fastapi import UploadFile
+
+    from app.core.cache import MemoryBackend, TwoTierCache
+    from app.db.session import async_session_factory
+    from app.main import app
+    from app.models import Product
+    from app.services.catalog_ingestion import CatalogIngestionService
+    from app.services.costing import CostingService
+    from app.services.nutrition import NutritionMatchingService
+    from app.services.nutrition_rollup import NutritionRollupService
+    from app.services.ordering import OrderingService
+    from app.services.reporting import ReportingService
+
+    rng = random.Random(dataset.spec.seed)
+    results: list[CaseResult] = []
+    supplier_id = dataset.supplier_ids[0]
+
+    async def upload(index: int) -> None:
+        payload = catalog_csv(rng, catalog_rows, f"BENCH{index}")
+        async with async_session_factory() as session:
+            file = UploadFile(io.BytesIO(payload), filename="catalog.csv")
+            ingested = await CatalogIngestionService(session).handle_upload(supplier_id, file, streaming=True)
+        throughput.append(ingested.rows_per_second)
+
+    throughput: list[float] = []
+    result = await measure("CatalogIngestionService.handle_upload", upload, max(1, iterations // 20))
+    result.extra = {"rows": catalog_rows, "rows_per_second": statistics.median(throughput)}
+    results.append(result)
+
+    async def recipe_cost(index: int) -> None:
+        async with async_session_factory() as session:
+            await CostingService(session).recipe_cost(rng.choice(dataset.recipe_ids))
+
+    results.append(await measure("CostingService.recipe_cost", recipe_cost, iterations))
+
+    # Warm two-tier cache: after the first miss every call is an in-process hit.
+    cache = TwoTierCache(
+        MemoryBackend(), ttl=300, local_ttl=60, local_max_bytes=64 * 1024 * 1024, version_ttl=1, lock_ttl=10
+    )
+
+    async def cached_recipe_cost(index: int) -> None:
+        async with async_session_factory() as session:
+            await CostingService(session, cache).recipe_cost(rng.choice(dataset.recipe_ids))
+
+    results.append(await measure("CostingService.recipe_cost[cached]", cached_recipe_cost, iterations))
+
+    async def menu_nutrition(index: int) -> None:
+        async with async_session_factory() as session:
+            await NutritionRollupService(session, cache).rollup()
+
+    name = "NutritionRollupService.rollup[menu]"
+    results.append(await measure(name, menu_nutrition, max(1, iterations // 10)))
+
+    unmapped = list(dataset.unmapped_product_ids)
+    rng.shuffle(unmapped)
+    if len(unmapped) > 1:
+
+        async def match_product(index: int) -> None:
+            async with async_session_factory() as session:
+                product = await session.get(Product, unmapped.pop())
+                await NutritionMatchingService(session).match_product(product)
+
+        matches = min(iterations, len(unmapped) - 1)
+        results.append(await measure("NutritionMatchingService.match_product", match_product, matches))
+
+    for window_days, aligned in ((30, False), (365, False), (365, True)):
+
+        async def price_trends(index: int, window_days: int = window_days, aligned: bool = aligned) -> None:
+            async with async_session_factory() as session:
+                await ReportingService(session).price_trends(
+                    supplier_id=supplier_id, window_days=window_days, aligned=aligned
+                )
+
+        name = f"ReportingService.price_trends[{window_days}d{',aligned' if aligned else ''}]"
+        results.append(await measure(name, price_trends, max(1, iterations // 10)))
+
+    async def cached_price_trends(index: int) -> None:
+        async with async_session_factory() as session:
+            await ReportingService(session, cache).price_trends(supplier_id=supplier_id, window_days=365)
+
+    name = "ReportingService.price_trends[365d,cached]"
+    results.append(await measure(name, cached_price_trends, iterations))
+
+    # A week of production for several kitchens, each cooking a rotating subset of the recipes.
+    production = week_plan(rng, dataset.recipe_ids)
+
+    async def order_plan(index: int) -> None:
+        async with async_session_factory() as session:
+            await OrderingService(session).plan(production)
+
+    result = await measure("OrderingService.plan[week]", order_plan, max(1, iterations // 10))
+    result.extra = {"plan_lines": len(production)}
+    results.append(result)
+
+    async def draft_orders(index: int) -> None:
+        async with async_session_factory() as session:
+            service = OrderingService(session)
+            await service.create_drafts(await service.plan(production))
+
+    result = await measure("OrderingService.create_drafts[week]", draft_orders, max(1, iterations // 20))
+    result.extra = {"plan_lines": len(production)}
+    results.append(result)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in LIST_ENDPOINTS:
+
+            async def list_endpoint(index: int, path: str = path) -> None:
+                response = await client.get(path, params={"limit": 100})
+                response.raise_for_status()
+
+            results.append(await measure(f"GET {path}?limit=100", list_endpoint, iterations))
+    return results
+
+
+def week_plan(
+    rng: random.Random, recipe_ids: list[str], kitchens: int = 4, recipes_per_day: int = 25
+) -> list[Any]:
+    from app.services.ordering import ProductionLine
+
+    start = datetime.now(timezone.utc).date()
+    return [
+        ProductionLine(recipe_id, rng.randint(10, 200), start + timedelta(days=day), f"kitchen-{kitchen}")
+        for kitchen in range(kitchens)
+        for day in range(7)
+        for recipe_id in rng.sample(recipe_ids, min(recipes_per_day, len(recipe_ids)))
+    ]
+
+
+def compare(results: list[CaseResult], baseline_path: Path, tolerance: float) -> list[str]:
+    baseline = {case["name"]: case for case in json.loads(baseline_path.read_text())["results"]}
+    regressions = []
+    print(f"\nCompared with {baseline_path} (tolerance {tolerance:.0%}):")
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous is None:
+            continue
+        ratio = result.median_ms / previous["median_ms"] if previous["median_ms"] else 1.0
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions.append(result.name)
+        print(
+            f"{result.name:<45} {previous['median_ms']:9.2f} -> {result.median_ms:9.2f} ms "
+            f"({ratio:5.2f}x){flag}"
+        )
+    return regressions
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def _run(
+    spec: DatasetSpec, iterations: int, catalog_rows: int
+) -> tuple[Dataset, float, list[CaseResult]]:
+    from app.db.init_db import init_models
+    from app.db.session import async_session_factory, engine
+
+    await init_models()
+    started = time.perf_counter()
+    async with async_session_factory() as session:
+        dataset = await generate(session, spec)
+    seed_seconds = time.perf_counter() - started
+    print(f"Seeded dataset in {seed_seconds:.1f}s ({dataset.price_history_rows} price history rows)")
+    results = await run_suite(dataset, iterations, catalog_rows)
+    await engine.dispose()
+    return dataset, seed_seconds, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_spec_arguments(parser)
+    parser.add_argument("--database-url", help="Empty database to seed (default: a temporary SQLite file)")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--catalog-rows", type=int, default=5_000)
+    parser.add_argument(
+        "--output", type=Path, help="Results file (default: benchmarks/results/<timestamp>.json)"
+    )
+    parser.add_argument("--compare", type=Path, help="Baseline results file to flag regressions against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    # Settings and the engine are read at import time, so the URL must be in place first.
+    database_url = args.database_url
+    if database_url is None:
+        database_url = f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='food-bench-')}/bench.db"
+    os.environ["DATABASE_URL"] = database_url
+
+    from sqlalchemy.engine import make_url
+
+    spec = spec_from_args(args)
+    dataset, seed_seconds, results = asyncio.run(_run(spec, args.iterations, args.catalog_rows))
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "database": make_url(database_url).render_as_string(hide_password=True),
+        "dataset": {**asdict(spec), "price_history_rows": dataset.price_history_rows},
+        "seed_seconds": seed_seconds,
+        "results": [{**asdict(result), "ops_per_second": result.ops_per_second} for result in results],
+    }
+    output = args.output or RESULTS_DIR / f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nWrote {output}")
+
+    if args.compare and compare(results, args.compare, args.tolerance):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
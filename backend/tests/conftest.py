@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from typing import AsyncIterator
+
+import pytest
+
+# Settings and the engine are read at import time, so the test environment must be in place first.
+_TMP = tempfile.mkdtemp(prefix="food-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_TMP}/test.db"
+os.environ["DATABASE_PROFILE"] = "default"
+os.environ["LOCAL_STORAGE_PATH"] = f"{_TMP}/storage"
+os.environ["CELERY_TASK_ALWAYS_EAGER"] = "true"
+os.environ["ENFORCE_QUERY_BUDGETS"] = "true"
+os.environ["CACHE_BACKEND"] = "memory"
+
+import httpx  # noqa: E402
+
+from app.core.cache import MemoryBackend, TwoTierCache, set_cache  # noqa: E402
+from app.core.response_cache import get_response_cache  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import async_session_factory, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.ingredient_index import reset_ingredient_index  # noqa: E402
+from app.services.nutrition_rollup import reset_nutrient_matrix  # noqa: E402
+
+
+def memory_cache(**overrides: float) -> TwoTierCache:
+    options = {"ttl": 300.0, "local_ttl": 60.0, "local_max_bytes": 1024 * 1024, "version_ttl": 0.0}
+    options.update(overrides)
+    return TwoTierCache(MemoryBackend(), lock_ttl=10.0, **options)
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+async def database(anyio_backend: str) -> AsyncIterator[None]:
+    """An empty schema, cache and set of in-process indexes for every test."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    set_cache(memory_cache())
+    get_response_cache().clear()
+    reset_ingredient_index()
+    reset_nutrient_matrix()
+    yield
+    await engine.dispose()
+
+
+@pytest.fixture
+async def session() -> AsyncIterator:
+    async with async_session_factory() as db:
+        yield db
+
+
+@pytest.fixture
+async def client() -> AsyncIterator[httpx.AsyncClient]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        yield http
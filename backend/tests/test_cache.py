@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+
+import anyio
+import pytest
+
+from app.core.cache import RedisBackend, TwoTierCache, get_cache, invalidate_tables, set_cache
+from app.core.metrics import CACHE_EVENTS
+from tests.conftest import memory_cache
+
+pytestmark = pytest.mark.anyio
+
+
+class Computation:
+    def __init__(self, value: object = "result") -> None:
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self) -> object:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.value
+
+
+async def _get(cache: TwoTierCache, namespace: str, compute: Computation, key: object = "key") -> object:
+    return await cache.get_or_compute(
+        namespace, ("price_book_entries",), key, compute, lambda value: value, lambda value: value
+    )
+
+
+async def test_concurrent_misses_compute_once() -> None:
+    compute = Computation()
+
+    results = await asyncio.gather(*(_get(get_cache(), "test_coalesce", compute) for _ in range(10)))
+
+    assert results == ["result"] * 10
+    assert compute.calls == 1
+
+
+async def test_invalidating_a_table_forces_a_recompute() -> None:
+    compute = Computation()
+    await _get(get_cache(), "test_invalidate", compute)
+    await _get(get_cache(), "test_invalidate", compute)
+    assert compute.calls == 1
+
+    await invalidate_tables("price_book_entries")
+    await _get(get_cache(), "test_invalidate", compute)
+
+    assert compute.calls == 2
+
+
+async def test_local_tier_evicts_least_recently_used_entries_over_its_byte_budget() -> None:
+    cache = memory_cache(local_max_bytes=100)
+    set_cache(cache)
+    evictions = CACHE_EVENTS.value("test_evict", "eviction")
+
+    for key in ("a", "b", "c"):
+        cache._local_put("test_evict", key, key, 40)
+
+    assert list(cache._local) == ["b", "c"]
+    assert cache._local_bytes == 80
+    assert CACHE_EVENTS.value("test_evict", "eviction") == evictions + 1
+
+
+async def test_events_count_local_hits_shared_hits_and_misses() -> None:
+    cache = get_cache()
+    compute = Computation({"total": 1.5})
+    events = ("miss", "local_hit", "shared_hit")
+    before = {event: CACHE_EVENTS.value("test_events", event) for event in events}
+
+    await _get(cache, "test_events", compute)
+    await _get(cache, "test_events", compute)
+    # Another worker has only the shared tier to read from.
+    cache.clear_local()
+    assert await _get(cache, "test_events", compute) == {"total": 1.5}
+
+    counts = {event: CACHE_EVENTS.value("test_events", event) - before[event] for event in before}
+    assert counts == {"miss": 1, "local_hit": 1, "shared_hit": 1}
+    assert compute.calls == 1
+
+
+async def test_redis_backend_keeps_one_client_per_event_loop() -> None:
+    backend = RedisBackend("redis://localhost:6379/0")
+
+    async def clients() -> tuple[object, object]:
+        return backend._redis(), backend._redis()
+
+    first, again = await clients()
+    other, _ = await anyio.to_thread.run_sync(asyncio.run, clients())
+
+    assert first is again
+    assert other is not first
+    await backend.close()
+    reopened = backend._redis()
+    assert reopened is not first
+    await backend.close()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from io import BytesIO
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models import PriceHistory, Product, Supplier
+from app.services.catalog_ingestion import CatalogIngestionService
+
+pytestmark = pytest.mark.anyio
+
+CATALOG = (
+    "sku,name,price,unit\n"
+    "A-1,Yellow Onion,1.25,lb\n"
+    "A-2,Whole Milk,3.99,gal\n"
+    ",,,\n"
+    "A-3,Large Eggs,4.50,ea\n"
+)
+
+
+async def _supplier(client) -> str:  # noqa: ANN001
+    response = await client.post("/suppliers/", json={"name": "Acme Foods"})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+async def test_csv_upload_is_ingested(client) -> None:  # noqa: ANN001
+    supplier_id = await _supplier(client)
+
+    response = await client.post(
+        f"/products/upload?supplier_id={supplier_id}",
+        files={"file": ("catalog.csv", CATALOG.encode(), "text/csv")},
+    )
+
+    assert response.status_code == 202
+    job = (await client.get(f"/ingestion-jobs/{response.json()['job_id']}")).json()
+    assert job["status"] == "completed", job["error"]
+    assert (job["rows_parsed"], job["rows_persisted"]) == (3, 3)
+    products = (await client.get("/products/")).json()
+    assert sorted(product["sku"] for product in products) == ["A-1", "A-2", "A-3"]
+
+
+@pytest.mark.parametrize("filename", ["catalog.pdf", "catalog.foo", "catalog.xls"])
+async def test_unsupported_format_is_rejected(client, filename: str) -> None:  # noqa: ANN001
+    supplier_id = await _supplier(client)
+
+    response = await client.post(
+        f"/products/upload?supplier_id={supplier_id}",
+        files={"file": (filename, b"not a catalog", "application/octet-stream")},
+    )
+
+    assert response.status_code == 400
+    assert (await client.get("/products/")).json() == []
+
+
+async def test_reupload_diffs_each_batch_against_stored_skus(session) -> None:  # noqa: ANN001
+    session.add(Supplier(id="s-1", name="Acme Foods"))
+    await session.commit()
+    service = CatalogIngestionService(session, batch_size=2)
+    await service.ingest_stream("s-1", "catalog.csv", BytesIO(CATALOG.encode()), mode="incremental")
+
+    # A-1 is repriced in the first batch and again, as a repeated SKU, in the second.
+    changed = (
+        "sku,name,price,unit\n"
+        "A-1,Yellow Onion,1.50,lb\n"
+        "A-2,Whole Milk,3.99,gal\n"
+        "A-1,Yellow Onion,1.75,lb\n"
+    )
+    result = await service.ingest_stream("s-1", "catalog.csv", BytesIO(changed.encode()), mode="incremental")
+
+    assert (result.rows_inserted, result.rows_updated, result.rows_unchanged) == (0, 2, 1)
+
+
+async def test_default_mode_inserts_rows_and_refuses_existing_skus(session) -> None:  # noqa: ANN001
+    session.add(Supplier(id="s-1", name="Acme Foods"))
+    await session.commit()
+    service = CatalogIngestionService(session, batch_size=2)
+
+    result = await service.ingest_stream("s-1", "catalog.csv", BytesIO(CATALOG.encode()))
+
+    assert (result.rows_inserted, result.rows_updated, result.rows_unchanged) == (3, 0, 0)
+    assert (await session.execute(select(func.count()).select_from(PriceHistory))).scalar_one() == 3
+    # Upserting a re-upload is opt-in; by default it is refused and the stored catalog kept.
+    with pytest.raises(ValueError, match="snapshot or incremental"):
+        await service.ingest_stream("s-1", "catalog.csv", BytesIO(CATALOG.encode()))
+    await session.rollback()
+    prices = (await session.execute(select(Product.sku, Product.price).order_by(Product.sku))).all()
+    assert [(sku, float(price)) for sku, price in prices] == [("A-1", 1.25), ("A-2", 3.99), ("A-3", 4.5)]
+
+
+async def test_snapshot_mode_records_a_price_for_every_row(session) -> None:  # noqa: ANN001
+    session.add(Supplier(id="s-1", name="Acme Foods"))
+    await session.commit()
+    service = CatalogIngestionService(session)
+    await service.ingest_stream("s-1", "catalog.csv", BytesIO(CATALOG.encode()))
+
+    result = await service.ingest_stream("s-1", "catalog.csv", BytesIO(CATALOG.encode()), mode="snapshot")
+
+    assert (result.rows_inserted, result.rows_updated, result.rows_unchanged) == (0, 0, 3)
+    assert (await session.execute(select(func.count()).select_from(PriceHistory))).scalar_one() == 6
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core.cache import get_cache, invalidate_tables
+from app.models import Ingredient
+from app.services.ingredient_index import get_ingredient_index, index_ingredient
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_index_is_rebuilt_after_ingredients_are_invalidated(session) -> None:  # noqa: ANN001
+    session.add(Ingredient(id="i-1", name="yellow onion"))
+    await session.commit()
+    index = await get_ingredient_index(session)
+    assert await get_ingredient_index(session) is index
+
+    session.add(Ingredient(id="i-2", name="whole milk"))
+    await session.commit()
+    # Another worker's invalidation reaches this one through the shared tier's versions.
+    await get_cache().backend.incr(f"{get_cache().prefix}:version:ingredients")
+
+    rebuilt = await get_ingredient_index(session)
+    assert rebuilt is not index
+    assert [ingredient_id for ingredient_id, _ in rebuilt.search("whole milk", threshold=0.4)] == ["i-2"]
+
+
+async def test_single_ingredient_writes_update_the_index_in_place(session) -> None:  # noqa: ANN001
+    session.add(Ingredient(id="i-1", name="yellow onion"))
+    await session.commit()
+    index = await get_ingredient_index(session)
+
+    session.add(Ingredient(id="i-2", name="whole milk"))
+    await session.commit()
+    await invalidate_tables("ingredients")
+    await index_ingredient("i-2", "whole milk")
+
+    assert await get_ingredient_index(session) is index
+    assert [ingredient_id for ingredient_id, _ in index.search("whole milk")] == ["i-2"]
+
+    # Two writes since the index was built, only one of them indexed: rebuild rather than guess.
+    session.add_all([Ingredient(id="i-3", name="sea salt"), Ingredient(id="i-4", name="black pepper")])
+    await session.commit()
+    await invalidate_tables("ingredients")
+    await invalidate_tables("ingredients")
+    await index_ingredient("i-4", "black pepper")
+
+    rebuilt = await get_ingredient_index(session)
+    assert rebuilt is not index
+    assert [ingredient_id for ingredient_id, _ in rebuilt.search("sea salt")] == ["i-3"]
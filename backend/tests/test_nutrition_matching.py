@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import select
+
+from app.models import Ingredient, Product, ProductIngredientMapping, Supplier
+from app.services.nutrition import NutritionMatchingService
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_match_catalog_scores_in_spawned_workers(session) -> None:  # noqa: ANN001
+    session.add_all(
+        [
+            Supplier(id="s-1", name="Acme Foods"),
+            Ingredient(id="i-1", name="yellow onion"),
+            Ingredient(id="i-2", name="whole milk"),
+            Product(id="p-1", supplier_id="s-1", sku="A-1", name="Yellow Onion", unit="lb", price=1),
+            Product(id="p-2", supplier_id="s-1", sku="A-2", name="Whole Milk", unit="gal", price=4),
+            Product(id="p-3", supplier_id="s-1", sku="A-3", name="Paper Towels", unit="ea", price=9),
+        ]
+    )
+    await session.commit()
+
+    summary = await NutritionMatchingService(session).match_catalog(workers=2)
+
+    assert (summary.matched, summary.unmatched) == (2, 1)
+    mappings = await session.execute(
+        select(ProductIngredientMapping.product_id, ProductIngredientMapping.ingredient_id)
+    )
+    assert sorted(mappings.tuples()) == [("p-1", "i-1"), ("p-2", "i-2")]
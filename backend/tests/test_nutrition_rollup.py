@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import pytest
+
+from app.models import Ingredient, Recipe, RecipeIngredient
+from app.services import nutrition_rollup
+from app.services.nutrition_rollup import NutritionRollupService
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def recipes(session) -> list[str]:  # noqa: ANN001
+    session.add(Ingredient(id="i-1", name="flour", nutritional_profile={"kcal": 1600}))
+    recipe_ids = [f"r-{number:02d}" for number in range(7)]
+    for number, recipe_id in enumerate(recipe_ids):
+        session.add(Recipe(id=recipe_id, name=recipe_id))
+        session.add(
+            RecipeIngredient(
+                id=f"l-{number}", recipe_id=recipe_id, ingredient_id="i-1", quantity=number, unit="lb"
+            )
+        )
+    await session.commit()
+    return recipe_ids
+
+
+async def test_rollup_loads_recipes_in_chunks(session, recipes, monkeypatch) -> None:  # noqa: ANN001
+    monkeypatch.setattr(nutrition_rollup, "_LOOKUP_CHUNK", 3)
+
+    rollups = await NutritionRollupService(session).rollup(list(reversed(recipes)))
+
+    assert list(rollups) == recipes
+    assert [rollup.nutrients["kcal"] for rollup in rollups.values()] == [1600.0 * n for n in range(7)]
+
+
+async def test_nutrition_request_is_capped(client) -> None:  # noqa: ANN001
+    response = await client.post("/recipes/nutrition", json={"recipe_ids": [f"r-{n}" for n in range(501)]})
+
+    assert response.status_code == 422
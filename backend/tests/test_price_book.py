@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import pytest
+
+from app.models import Ingredient, Product, ProductIngredientMapping, Recipe, RecipeIngredient, Supplier
+from app.services.costing import CostingService
+from app.services.price_book import PriceBook
+
+pytestmark = pytest.mark.anyio
+
+# (product id, unit, package size, price): $3.00/lb, $5.00/kg (~$2.27/lb) and $0.40 per egg.
+OFFERS = [
+    ("p-lb", "lb", None, 3.00),
+    ("p-kg", "kg", None, 5.00),
+    ("p-ea", "case", "12ct", 4.80),
+]
+
+
+@pytest.fixture
+async def priced(session) -> None:  # noqa: ANN001
+    session.add_all([Supplier(id="s-1", name="Acme Foods"), Ingredient(id="i-1", name="egg")])
+    for product_id, unit, package_size, price in OFFERS:
+        session.add(
+            Product(
+                id=product_id,
+                supplier_id="s-1",
+                sku=product_id,
+                name=product_id,
+                unit=unit,
+                package_size=package_size,
+                price=price,
+            )
+        )
+        session.add(
+            ProductIngredientMapping(
+                id=f"m-{product_id}", product_id=product_id, ingredient_id="i-1", confidence_score=0.9
+            )
+        )
+    await session.flush()
+    await PriceBook(session).refresh_for_ingredients(["i-1"])
+    await session.commit()
+
+
+async def test_offers_are_ranked_by_unit_price_within_a_base_unit(session, priced) -> None:  # noqa: ANN001
+    offers = await PriceBook(session).offers("i-1")
+
+    assert [(offer.base_unit, offer.rank, offer.product_id) for offer in offers] == [
+        ("ea", 1, "p-ea"),
+        ("lb", 1, "p-kg"),
+        ("lb", 2, "p-lb"),
+    ]
+    best = await PriceBook(session).best_offers(["i-1"])
+    assert {base_unit: offer.product_id for base_unit, offer in best["i-1"].items()} == {
+        "ea": "p-ea",
+        "lb": "p-kg",
+    }
+
+
+async def test_recipe_quantities_are_costed_in_base_units(session, priced) -> None:  # noqa: ANN001
+    session.add_all(
+        [
+            Recipe(id="r-1", name="Custard"),
+            RecipeIngredient(id="l-1", recipe_id="r-1", ingredient_id="i-1", quantity=32, unit="oz"),
+            RecipeIngredient(id="l-2", recipe_id="r-1", ingredient_id="i-1", quantity=3, unit="ea"),
+        ]
+    )
+    await session.commit()
+
+    cost = await CostingService(session).recipe_cost("r-1")
+
+    # Two pounds at the kilogram offer's unit price plus three eggs at $0.40.
+    assert cost.total_cost == pytest.approx(2 * 5.00 / 2.204623 + 3 * 0.40, abs=1e-4)
+
+
+async def test_lines_no_offer_converts_are_reported_unpriced(session, priced) -> None:  # noqa: ANN001
+    session.add_all(
+        [
+            Ingredient(id="i-3", name="saffron"),
+            Recipe(id="r-1", name="Custard"),
+            RecipeIngredient(id="l-1", recipe_id="r-1", ingredient_id="i-1", quantity=3, unit="ea"),
+            RecipeIngredient(id="l-2", recipe_id="r-1", ingredient_id="i-1", quantity=2, unit="case"),
+            RecipeIngredient(id="l-3", recipe_id="r-1", ingredient_id="i-3", quantity=1, unit="g"),
+        ]
+    )
+    await session.commit()
+
+    cost = await CostingService(session).recipe_cost("r-1")
+
+    # A case of unknown size converts to no offer's base unit, so only the eggs are priced.
+    assert cost.total_cost == pytest.approx(3 * 0.40)
+    assert cost.unpriced_ingredients == ["i-1", "i-3"]
+    assert cost.ingredient_costs["i-3"] == 0.0
+
+
+async def test_cheapest_confident_offer_ranks_first(session) -> None:  # noqa: ANN001
+    # (product id, price per lb, mapping confidence)
+    offers = [("p-sure", 3.00, 0.95), ("p-cheap", 2.50, 0.90), ("p-guess", 1.00, 0.45)]
+    session.add_all([Supplier(id="s-1", name="Acme Foods"), Ingredient(id="i-2", name="butter")])
+    for product_id, price, confidence in offers:
+        session.add(
+            Product(id=product_id, supplier_id="s-1", sku=product_id, name=product_id, unit="lb", price=price)
+        )
+        session.add(
+            ProductIngredientMapping(
+                id=f"m-{product_id}", product_id=product_id, ingredient_id="i-2", confidence_score=confidence
+            )
+        )
+    await session.flush()
+    await PriceBook(session).refresh_for_ingredients(["i-2"])
+    await session.commit()
+
+    ranked = await PriceBook(session).offers("i-2")
+
+    # The slightly more confident offer costs more, and the cheapest one is a low-confidence guess.
+    assert [offer.product_id for offer in ranked] == ["p-cheap", "p-sure", "p-guess"]
+
+
+async def test_refresh_rewrites_offers_and_drops_unmapped_ones(session, priced) -> None:  # noqa: ANN001
+    await session.delete(await session.get(ProductIngredientMapping, "m-p-lb"))
+    await session.flush()
+
+    await PriceBook(session).refresh_for_ingredients(["i-1"])
+    await PriceBook(session).refresh_for_ingredients(["i-1"])
+    await session.commit()
+
+    offers = await PriceBook(session).offers("i-1")
+    assert [(offer.base_unit, offer.rank, offer.product_id) for offer in offers] == [
+        ("ea", 1, "p-ea"),
+        ("lb", 1, "p-kg"),
+    ]
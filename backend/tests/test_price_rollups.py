@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.models import PriceRollup, Product, Supplier
+from app.services.price_rollups import PriceRollupService
+
+pytestmark = pytest.mark.anyio
+
+
+def _at(hour: int) -> datetime:
+    return datetime(2024, 3, 6, hour, tzinfo=timezone.utc)
+
+
+async def test_record_merges_batches_into_stored_buckets(session) -> None:  # noqa: ANN001
+    session.add_all(
+        [
+            Supplier(id="s-1", name="Acme Foods"),
+            Product(id="p-1", supplier_id="s-1", sku="p-1", name="flour", unit="lb", price=5),
+        ]
+    )
+    await session.flush()
+    service = PriceRollupService(session)
+
+    await service.record([{"product_id": "p-1", "supplier_id": "s-1", "price": 5, "recorded_at": _at(10)}])
+    # The second batch straddles the stored bucket: one row before its open, one after its close.
+    await service.record(
+        [
+            {"product_id": "p-1", "supplier_id": "s-1", "price": 7, "recorded_at": _at(12)},
+            {"product_id": "p-1", "supplier_id": "s-1", "price": 3, "recorded_at": _at(9)},
+        ]
+    )
+    await session.commit()
+
+    buckets = (await session.execute(select(PriceRollup).order_by(PriceRollup.granularity))).scalars().all()
+    assert [bucket.granularity for bucket in buckets] == ["day", "week"]
+    for bucket in buckets:
+        assert float(bucket.open_price) == 3
+        assert float(bucket.high_price) == 7
+        assert float(bucket.low_price) == 3
+        assert float(bucket.close_price) == 7
+        assert float(bucket.price_sum) == 15
+        assert bucket.observations == 3
+        assert bucket.supplier_id == "s-1"
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+import pytest
+from sqlalchemy import event
+
+from app.db.session import engine
+from app.models import Ingredient, Order, OrderItem, Product, Recipe, RecipeIngredient, Supplier
+
+pytestmark = pytest.mark.anyio
+
+
+class Statements:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+        self.count += 1
+
+
+@pytest.fixture
+def statements() -> Iterator[Statements]:
+    counter = Statements()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(engine.sync_engine, "before_cursor_execute", counter)
+
+
+@pytest.fixture
+async def seeded(session) -> None:  # noqa: ANN001
+    """Several recipes and orders with several lines each, so an N+1 load would show up."""
+    session.add(Supplier(id="s-1", name="Acme Foods"))
+    for number in range(3):
+        session.add(Ingredient(id=f"i-{number}", name=f"ingredient {number}"))
+        session.add(
+            Product(
+                id=f"p-{number}",
+                supplier_id="s-1",
+                sku=f"A-{number}",
+                name=f"item {number}",
+                unit="lb",
+                price=2,
+            )
+        )
+    for number in range(4):
+        session.add(Recipe(id=f"r-{number}", name=f"Recipe {number}"))
+        session.add(Order(id=f"o-{number}", supplier_id="s-1"))
+        for line in range(3):
+            session.add(
+                RecipeIngredient(
+                    id=f"r-{number}-{line}",
+                    recipe_id=f"r-{number}",
+                    ingredient_id=f"i-{line}",
+                    quantity=1,
+                    unit="lb",
+                )
+            )
+            session.add(
+                OrderItem(
+                    id=f"o-{number}-{line}",
+                    order_id=f"o-{number}",
+                    product_id=f"p-{line}",
+                    quantity=2,
+                    unit="lb",
+                )
+            )
+    await session.commit()
+
+
+@pytest.mark.parametrize("path", ["/recipes/", "/recipes/r-1", "/orders/", "/orders/o-1"])
+async def test_reads_run_two_statements(client, seeded, statements, path: str) -> None:  # noqa: ANN001
+    response = await client.get(path)
+
+    assert response.status_code == 200
+    assert statements.count == 2
+
+
+async def test_create_recipe_runs_five_statements(client, seeded, statements) -> None:  # noqa: ANN001
+    lines = [{"ingredient_id": f"i-{line}", "quantity": 0.5, "unit": "lb"} for line in range(3)]
+
+    response = await client.post("/recipes/", json={"name": "Stew", "ingredients": lines})
+
+    assert response.status_code == 201
+    assert len(response.json()["ingredients"]) == 3
+    assert statements.count == 5
+
+
+async def test_create_order_runs_five_statements(client, seeded, statements) -> None:  # noqa: ANN001
+    items = [{"product_id": f"p-{line}", "quantity": 4, "unit": "lb"} for line in range(3)]
+
+    response = await client.post("/orders/", json={"supplier_id": "s-1", "items": items})
+
+    assert response.status_code == 201
+    assert len(response.json()["items"]) == 3
+    assert statements.count == 5
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import anyio
+import pytest
+from sqlalchemy import text
+
+from app.db.base import Base
+from app.db.session import async_session_factory, engine
+from benchmarks.datagen import SCALES, generate
+from benchmarks.explain_plans import check_plans, migrate
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_hot_lookups_do_not_scan_whole_tables() -> None:
+    # Plans depend on the indexes the migrations create, so build the schema from them.
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await anyio.to_thread.run_sync(migrate, engine.url.render_as_string(hide_password=False))
+    try:
+        spec = SCALES["small"]
+        async with async_session_factory() as session:
+            dataset = await generate(session, spec)
+
+        failures = await check_plans(dataset, spec.seed)
+
+        assert failures == []
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event, select
+
+from app.db.session import engine
+from app.models import (
+    Ingredient,
+    Product,
+    ProductIngredientMapping,
+    Recipe,
+    RecipeCost,
+    RecipeIngredient,
+    Supplier,
+)
+from app.services.price_book import PriceBook
+from app.services.recipe_cost_cache import RecipeCostCache
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_refresh_overwrites_an_existing_row(session) -> None:  # noqa: ANN001
+    session.add_all(
+        [
+            Ingredient(id="i-1", name="onion"),
+            Recipe(id="r-1", name="Soup"),
+            RecipeIngredient(id="l-1", recipe_id="r-1", ingredient_id="i-1", quantity=2, unit="lb"),
+        ]
+    )
+    await session.commit()
+    cache = RecipeCostCache(session)
+
+    first = await cache.refresh(["r-1"])
+    await session.commit()
+    second = await cache.refresh(["r-1"])
+    await session.commit()
+
+    rows = (await session.execute(select(RecipeCost.recipe_id, RecipeCost.computed_at))).all()
+    assert [row.recipe_id for row in rows] == ["r-1"]
+    assert second["r-1"].computed_at >= first["r-1"].computed_at
+    assert rows[0].computed_at.replace(tzinfo=None) == second["r-1"].computed_at.replace(tzinfo=None)
+
+
+async def test_refresh_for_products_chunks_large_repricings(session) -> None:  # noqa: ANN001
+    count = 1200
+    session.add(Supplier(id="s-1", name="Acme Foods"))
+    for index in range(count):
+        session.add_all(
+            [
+                Product(
+                    id=f"p-{index}", supplier_id="s-1", sku=f"p-{index}", name="onion", unit="lb", price=2
+                ),
+                Ingredient(id=f"i-{index}", name=f"onion {index}"),
+                ProductIngredientMapping(
+                    id=f"m-{index}", product_id=f"p-{index}", ingredient_id=f"i-{index}", confidence_score=0.9
+                ),
+                Recipe(id=f"r-{index}", name=f"Soup {index}"),
+                RecipeIngredient(
+                    id=f"l-{index}", recipe_id=f"r-{index}", ingredient_id=f"i-{index}", quantity=3, unit="lb"
+                ),
+            ]
+        )
+    await session.flush()
+    await PriceBook(session).refresh_for_ingredients(f"i-{index}" for index in range(count))
+    await session.commit()
+
+    parameter_counts: list[int] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+        if not executemany:
+            parameter_counts.append(len(parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        cache = RecipeCostCache(session)
+        refreshed = await cache.refresh_for_products(f"p-{index}" for index in range(count))
+        await session.commit()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    assert sorted(refreshed) == sorted(f"r-{index}" for index in range(count))
+    assert max(parameter_counts) <= 501
+    costs = (await session.execute(select(RecipeCost.total_cost))).scalars().all()
+    assert len(costs) == count and {float(cost) for cost in costs} == {6.0}
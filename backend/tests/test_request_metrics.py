@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.metrics import end_request_stats, start_request_stats
+from app.db.query_budget import StatementCounter, _counter
+from app.db.session import engine
+from app.tasks.catalog import task_session
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_failed_statement_does_not_leave_a_timer_behind() -> None:
+    stats, token = start_request_stats()
+    try:
+        async with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                await conn.execute(text("SELECT * FROM missing_table"))
+            info = (await conn.get_raw_connection()).info
+            assert "statement_started" not in info
+            await conn.execute(text("SELECT 1"))
+            assert "statement_started" not in info
+    finally:
+        end_request_stats(token)
+
+    assert stats.statements == 1
+
+
+async def test_task_engine_is_instrumented() -> None:
+    stats, token = start_request_stats()
+    counter = StatementCounter()
+    counter_token = _counter.set(counter)
+    try:
+        async with task_session() as db:
+            await db.execute(text("SELECT 1"))
+    finally:
+        _counter.reset(counter_token)
+        end_request_stats(token)
+
+    assert (stats.statements, counter.statements) == (1, 1)
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core.cache import get_cache
+
+pytestmark = pytest.mark.anyio
+
+
+async def _create_supplier(client, name: str = "Acme Foods") -> str:  # noqa: ANN001
+    response = await client.post("/suppliers/", json={"name": name})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+async def test_etag_changes_when_the_table_is_invalidated(client) -> None:  # noqa: ANN001
+    await _create_supplier(client)
+    etag = (await client.get("/suppliers/")).headers["etag"]
+
+    assert (await client.get("/suppliers/", headers={"If-None-Match": etag})).status_code == 304
+
+    await _create_supplier(client, "Bolt Produce")
+    response = await client.get("/suppliers/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert response.headers["etag"] != etag
+
+
+async def test_invalidation_by_another_process_is_seen(client) -> None:  # noqa: ANN001
+    await _create_supplier(client)
+    etag = (await client.get("/suppliers/")).headers["etag"]
+
+    # What a Celery worker's invalidate_tables("suppliers") leaves in the shared tier.
+    cache = get_cache()
+    await cache.backend.incr(f"{cache.prefix}:version:suppliers")
+
+    assert (await client.get("/suppliers/", headers={"If-None-Match": etag})).status_code == 200
+
+
+async def test_wildcard_only_matches_a_cached_response(client) -> None:  # noqa: ANN001
+    supplier_id = await _create_supplier(client)
+    wildcard = {"If-None-Match": "*"}
+
+    assert (await client.get("/suppliers/missing", headers=wildcard)).status_code == 404
+    assert (await client.get(f"/suppliers/{supplier_id}", headers=wildcard)).status_code == 200
+    assert (await client.get(f"/suppliers/{supplier_id}", headers=wildcard)).status_code == 304
+    assert (await client.get("/suppliers/missing", headers=wildcard)).status_code == 404